@@ -0,0 +1,260 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from os import cpu_count
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from numpy import bool_, dtype, floating, ndarray
+from numpy.ma import MaskedArray, getdata, getmaskarray, masked_array
+
+from .corrections import CorrectionMap, normalize_thickness, subtract_background
+from .io.nexus import NexusLayout, NexusPath, read_nexus_detector, read_nexus_frames
+from .sequences import pauw_averaged_background_sequence
+from .sequences.pauw import _average_dispersant, _correct_sample
+from .utils.precision import Precision
+from .utils.shared import SharedArray
+from .utils.typing import Frame, FrameHeight, FrameWidth
+
+
+class _SharedSetup(NamedTuple):
+    """Handles to the read-only arrays shared by every file of a batch."""
+
+    mask: SharedArray
+    correction_factors: SharedArray
+    background: SharedArray
+    background_mask: SharedArray
+    dispersant: SharedArray
+    dispersant_mask: SharedArray
+
+
+#: The shared arrays and parameters of the batch being corrected by a worker process.
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _initialize_worker(
+    setup: _SharedSetup,
+    detector: Dict[str, Any],
+    sample_thickness: Optional[float],
+    layout: NexusLayout,
+    precision: Precision,
+) -> None:
+    attached = {name: handle.attach() for name, handle in setup._asdict().items()}
+    arrays = {name: values for name, (values, _) in attached.items()}
+    _WORKER_STATE.update(
+        memories=[memory for _, memory in attached.values()],
+        mask=arrays["mask"],
+        correction_map=CorrectionMap(arrays["correction_factors"]),
+        background=masked_array(arrays["background"], mask=arrays["background_mask"]),
+        dispersant=arrays["dispersant"],
+        dispersant_mask=arrays["dispersant_mask"],
+        detector=detector,
+        sample_thickness=sample_thickness,
+        layout=layout,
+        precision=precision,
+    )
+
+
+def _correct_file(
+    path: NexusPath,
+) -> MaskedArray[Tuple[int, FrameWidth, FrameHeight], dtype[floating]]:
+    state = _WORKER_STATE
+    scan = read_nexus_frames(path, state["layout"])
+    frames = _correct_sample(
+        scan.frames,
+        background=state["background"],
+        mask=state["mask"],
+        count_times=scan.count_times,
+        incident_flux=scan.incident_flux,
+        transmitted_flux=scan.transmitted_flux,
+        **state["detector"],
+        correction_map=state["correction_map"],
+        precision=state["precision"],
+    )
+    subtract_background(getdata(frames), state["dispersant"], getdata(frames))
+    # The shared correction map and dispersant are not normalized by thickness, such
+    # that the sample and the dispersant subtracted from it are normalized together
+    thickness = state["sample_thickness"]
+    if thickness is None:
+        thickness = read_nexus_detector(path, state["layout"]).sample_thickness
+    normalize_thickness(getdata(frames), thickness, getdata(frames))
+    frames.mask |= state["dispersant_mask"]
+    return frames
+
+
+def batch_pauw_dispersed_sample_sequence(
+    sample_paths: Iterable[NexusPath],
+    dispersant_path: NexusPath,
+    background_path: NexusPath,
+    mask: Frame[FrameWidth, FrameHeight, dtype[bool_]],
+    flatfield: Frame[FrameWidth, FrameHeight, dtype[floating]],
+    minimum_pulse_separation: float,
+    minimum_arrival_separation: float,
+    base_dark_current: float,
+    temporal_dark_current: float,
+    flux_dependant_dark_current: float,
+    beam_center_pixels: tuple[float, float],
+    pixel_sizes: tuple[float, float],
+    sample_detector_separation: float,
+    sensor_absorption_coefficient: float,
+    sample_thickness: Optional[float],
+    sensor_thickness: float,
+    beam_polarization: float,
+    displaced_fraction: float,
+    layout: NexusLayout = NexusLayout(),
+    processes: Optional[int] = None,
+    precision: Precision = None,
+) -> Iterator[MaskedArray[Tuple[int, FrameWidth, FrameHeight], dtype[floating]]]:
+    """Applies the dispersed sample sequence to many NeXus files with a process pool.
+
+    Applies the sequence of corrections of `pauw_dispersed_sample_sequence` to the
+    frames of each sample file, against a single dispersant and background file. The
+    background, dispersant and combined correction map are computed once, then
+    shared with a pool of worker processes through shared memory alongside the mask,
+    such that each task carries only the path of the file to be corrected. Results are
+    yielded in the order in which the sample files are given, with at most one file
+    per process corrected ahead of the file being yielded.
+    Worker processes are spawned, rather than forked, such that they share only the
+    arrays passed to them and not the state of the calling process.
+
+    Args:
+        sample_paths: The paths of the NeXus files containing sample frames.
+        dispersant_path: The path of the NeXus file containing dispersant frames.
+        background_path: The path of the NeXus file containing background frames.
+        mask: The boolean mask to apply to each frame.
+        flatfield: The multiplicative flatfield correction to be applied to detector
+            readings.
+        minimum_pulse_separation: The minimum time difference required between a prior
+            pulse and the current pulse for the current pulse to be recorded correctly.
+        minimum_arrival_separation: The minimum time difference required between the
+            current pulse and a subsequent pulse for the current pulse to be recorded
+            correctly.
+        base_dark_current: The dark current flux, irrespective of time.
+        temporal_dark_current: The dark current flux, as a factor of time.
+        flux_dependant_dark_current: The dark current flux, as a factor of incident
+            flux.
+        beam_center_pixels: The center position of the beam in pixels.
+        pixel_sizes: The real space size of a detector pixel.
+        sample_detector_separation: The distance between the detector and the sample.
+        sensor_absorption_coefficient: The coefficient of absorption for a given
+            detector head material at a given photon energy.
+        sample_thickness: The thickness of the sample material, by which every sample
+            and the dispersant subtracted from it are normalized. If None, the
+            thickness recorded in each sample file is used.
+        sensor_thickness: The thickness of the detector head material.
+        beam_polarization: The fraction of incident radiation polarized in the
+            horizontal plane, where 0.5 signifies an unpolarized source.
+        displaced_fraction: The fraction of solvent displaced by the analyte.
+        layout: The locations of the datasets within each file. Defaults to the layout
+            of the I22 Pilatus 2M WAXS detector.
+        processes: The number of worker processes. If None, the number of processors
+            is used. Defaults to None.
+        precision: The floating point type in which the corrections are evaluated and
+            the corrected frames are returned. If None, the type follows the promotion
+            rules of numpy. Defaults to None.
+
+    Yields:
+        The corrected stack of frames of each sample file.
+    """
+    if processes is not None and processes <= 0:
+        raise ValueError("Process count must be positive.")
+    processes = processes or cpu_count() or 1
+    detector: Dict[str, Any] = dict(
+        minimum_pulse_separation=minimum_pulse_separation,
+        minimum_arrival_separation=minimum_arrival_separation,
+        base_dark_current=base_dark_current,
+        temporal_dark_current=temporal_dark_current,
+        flux_dependant_dark_current=flux_dependant_dark_current,
+        beam_center_pixels=beam_center_pixels,
+        pixel_sizes=pixel_sizes,
+        sample_detector_separation=sample_detector_separation,
+    )
+    correction_map = CorrectionMap.from_parameters(
+        flatfield,
+        beam_center_pixels,
+        pixel_sizes,
+        sample_detector_separation,
+        sensor_absorption_coefficient,
+        sensor_thickness,
+        beam_polarization,
+        1.0,
+        precision,
+    )
+    background_scan = read_nexus_frames(background_path, layout)
+    background = pauw_averaged_background_sequence(
+        background_scan.frames,
+        mask,
+        background_scan.count_times,
+        background_scan.incident_flux,
+        background_scan.transmitted_flux,
+        **detector,
+        precision=precision,
+    )
+    dispersant_scan = read_nexus_frames(dispersant_path, layout)
+    dispersant = _average_dispersant(
+        dispersant_scan.frames,
+        background=background,
+        mask=mask,
+        count_times=dispersant_scan.count_times,
+        incident_flux=dispersant_scan.incident_flux,
+        transmitted_flux=dispersant_scan.transmitted_flux,
+        **detector,
+        correction_map=correction_map,
+        displaced_fraction=displaced_fraction,
+        precision=precision,
+    )
+
+    memories: List[SharedMemory] = []
+
+    def share(values: ndarray) -> SharedArray:
+        handle, memory = SharedArray.create(values)
+        memories.append(memory)
+        return handle
+
+    try:
+        setup = _SharedSetup(
+            share(mask),
+            share(correction_map.factors),
+            share(getdata(background)),
+            share(getmaskarray(background)),
+            share(getdata(dispersant)),
+            share(getmaskarray(dispersant)),
+        )
+        with ProcessPoolExecutor(
+            processes,
+            mp_context=get_context("spawn"),
+            initializer=_initialize_worker,
+            initargs=(
+                setup,
+                detector,
+                sample_thickness,
+                layout,
+                precision,
+            ),
+        ) as executor:
+            paths = iter(sample_paths)
+            pending: Deque[Future] = deque(
+                executor.submit(_correct_file, path)
+                for path in islice(paths, processes)
+            )
+            while pending:
+                result = pending.popleft().result()
+                pending.extend(
+                    executor.submit(_correct_file, path) for path in islice(paths, 1)
+                )
+                yield result
+    finally:
+        for memory in memories:
+            memory.close()
+            memory.unlink()
@@ -1,4 +1,8 @@
+from pathlib import Path
+from typing import Optional, Tuple
+
 import click
+from numpy import load, ones, savez
 
 from . import __version__
 
@@ -9,7 +13,119 @@ from . import __version__
 def main(ctx: click.Context) -> None:
     """Area detector corrections as pure python functions.
 
-    This project is intended to be used as a library, and thus has no CLI.
+    This project is intended to be used as a library, with a CLI provided for batch
+    correction of NeXus files.
     """
     if ctx.invoked_subcommand is None:
         click.echo(main.get_help(ctx))
+
+
+@main.command()
+@click.argument(
+    "samples", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False)
+)
+@click.option(
+    "--dispersant",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="The NeXus file containing dispersant frames.",
+)
+@click.option(
+    "--background",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="The NeXus file containing background frames.",
+)
+@click.option(
+    "--output",
+    required=True,
+    type=click.Path(file_okay=False, path_type=Path),
+    help="The directory into which corrected frames are written.",
+)
+@click.option(
+    "--flatfield",
+    type=click.Path(exists=True, dir_okay=False),
+    help="A .npy file containing the flatfield. Defaults to a uniform flatfield.",
+)
+@click.option("--processes", type=click.IntRange(min=1), help="Worker processes.")
+@click.option("--displaced-fraction", type=float, default=0.0, show_default=True)
+@click.option("--minimum-pulse-separation", type=float, default=2e-6, show_default=True)
+@click.option(
+    "--minimum-arrival-separation", type=float, default=3e-6, show_default=True
+)
+@click.option("--base-dark-current", type=float, default=0.0, show_default=True)
+@click.option("--temporal-dark-current", type=float, default=0.0, show_default=True)
+@click.option(
+    "--flux-dependant-dark-current", type=float, default=0.0, show_default=True
+)
+@click.option(
+    "--sensor-absorption-coefficient", type=float, default=0.85, show_default=True
+)
+@click.option("--sensor-thickness", type=float, default=1e-3, show_default=True)
+@click.option("--beam-polarization", type=float, default=0.5, show_default=True)
+@click.option(
+    "--sample-thickness",
+    type=float,
+    help="The thickness of every sample. Defaults to that recorded in each file.",
+)
+def batch(
+    samples: Tuple[str, ...],
+    dispersant: str,
+    background: str,
+    output: Path,
+    flatfield: Optional[str],
+    processes: Optional[int],
+    displaced_fraction: float,
+    minimum_pulse_separation: float,
+    minimum_arrival_separation: float,
+    base_dark_current: float,
+    temporal_dark_current: float,
+    flux_dependant_dark_current: float,
+    sensor_absorption_coefficient: float,
+    sensor_thickness: float,
+    beam_polarization: float,
+    sample_thickness: Optional[float],
+) -> None:
+    """Corrects dispersed sample NeXus files against a dispersant and background.
+
+    The detector setup is read from the first sample file, and the corrected frames of
+    each sample are written to OUTPUT as a .npz file of the same stem, holding the
+    data and mask of the frames. Samples must have distinct stems.
+    """
+    from .batch import batch_pauw_dispersed_sample_sequence
+    from .io.nexus import read_nexus_detector
+
+    stems = [Path(sample).stem for sample in samples]
+    duplicates = sorted({stem for stem in stems if stems.count(stem) > 1})
+    if duplicates:
+        raise click.BadParameter(
+            f"Output names {', '.join(duplicates)} are shared by several samples.",
+            param_hint="SAMPLES",
+        )
+    detector = read_nexus_detector(samples[0])
+    output.mkdir(parents=True, exist_ok=True)
+    results = batch_pauw_dispersed_sample_sequence(
+        samples,
+        dispersant,
+        background,
+        detector.mask,
+        ones(detector.mask.shape) if flatfield is None else load(flatfield),
+        minimum_pulse_separation,
+        minimum_arrival_separation,
+        base_dark_current,
+        temporal_dark_current,
+        flux_dependant_dark_current,
+        detector.beam_center_pixels,
+        detector.pixel_sizes,
+        detector.sample_detector_separation,
+        sensor_absorption_coefficient,
+        sample_thickness,
+        sensor_thickness,
+        beam_polarization,
+        displaced_fraction,
+        processes=processes,
+    )
+    for stem, frames in zip(stems, results):
+        path = output / f"{stem}.npz"
+        savez(path, data=frames.filled(0), mask=frames.mask)
+        click.echo(path)
@@ -1,20 +1,22 @@
 from .angular_efficiency import correct_angular_efficiency
 from .background_subtraction import subtract_background
+from .correction_map import CorrectionMap
 from .dark_current import correct_dark_current
 from .deadtime import correct_deadtime
 from .displaced_volume import correct_displaced_volume
 from .flatfield import correct_flatfield
-from .frame_average import average_all_frames
+from .frame_average import FrameAccumulator, average_all_frames
 from .frame_time import normalize_frame_time
-from .masking import mask_frames
-from .polarization import correct_polarization
-from .self_absorption import correct_self_absorption
+from .masking import fill_masked_pixels, mask_frames
+from .polarization import PolarizationModel, correct_polarization
+from .self_absorption import SelfAbsorptionTable, correct_self_absorption
 from .solid_angle import correct_solid_angle
 from .thickness import normalize_thickness
 from .transmission import normalize_transmitted_flux
 
 __all__ = [
     "mask_frames",
+    "fill_masked_pixels",
     "correct_deadtime",
     "correct_dark_current",
     "normalize_frame_time",
@@ -28,4 +30,8 @@ __all__ = [
     "correct_polarization",
     "normalize_thickness",
     "correct_displaced_volume",
+    "CorrectionMap",
+    "FrameAccumulator",
+    "SelfAbsorptionTable",
+    "PolarizationModel",
 ]
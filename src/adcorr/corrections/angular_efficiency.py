@@ -1,11 +1,55 @@
-from typing import Tuple, cast
+from typing import Optional, Tuple, cast
 
-from numpy import cos, dtype, exp, number
+from numpy import divide, dtype, exp, floating, ndarray, number
 
-from ..utils.geometry import scattering_angles
+from ..utils.geometry import scattering_secants
+from ..utils.precision import Precision, as_precision
 from ..utils.typing import FrameHeight, Frames, FrameWidth, NumFrames
 
 
+def _check_absorption(absorption_coefficient: float, thickness: float) -> None:
+    if absorption_coefficient <= 0.0:
+        raise ValueError("Absorption Coefficient must be positive.")
+    if thickness <= 0.0:
+        raise ValueError("Thickness must be positive.")
+
+
+def apply_angular_efficiency(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+    secangles: ndarray[Tuple[FrameWidth, FrameHeight], dtype[floating]],
+    absorption_coefficient: float,
+    thickness: float,
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]] = None,
+    precision: Precision = None,
+) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]:
+    """Applies the angular efficiency correction for precomputed pixel secants.
+
+    Args:
+        frames: A stack of frames to be corrected.
+        secangles: The secant of the angle of each pixel from the sample.
+        absorption_coefficient: The coefficient of absorption for a given material at a
+            given photon energy.
+        thickness: The thickness of the detector head material.
+        out: A stack into which the corrected frames are written, which may be the
+            input stack itself to correct in place. If None, a new stack is allocated.
+            Defaults to None.
+        precision: The floating point type in which the correction is evaluated and the
+            corrected frames are returned. If None, the type follows the promotion rules
+            of numpy. Defaults to None.
+
+    Returns:
+        The corrected stack of frames.
+    """
+    _check_absorption(absorption_coefficient, thickness)
+
+    frames = as_precision(frames, precision)
+    absorption_efficiency = 1.0 - exp(-absorption_coefficient * thickness * secangles)
+    absorption_efficiency = as_precision(absorption_efficiency, precision)
+    if out is None:
+        return frames / absorption_efficiency
+    return divide(frames, absorption_efficiency, out=out)
+
+
 def correct_angular_efficiency(
     frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
     beam_center: Tuple[float, float],
@@ -13,6 +57,8 @@ def correct_angular_efficiency(
     distance: float,
     absorption_coefficient: float,
     thickness: float,
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]] = None,
+    precision: Precision = None,
 ) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]:
     """Corrects for loss due to the angular efficiency of the detector head.
 
@@ -28,25 +74,31 @@ def correct_angular_efficiency(
         absorption_coefficient: The coefficient of absorption for a given material at a
             given photon energy.
         thickness: The thickness of the detector head material.
+        out: A stack into which the corrected frames are written, which may be the
+            input stack itself to correct in place. If None, a new stack is allocated.
+            Defaults to None.
+        precision: The floating point type in which the correction is evaluated and the
+            corrected frames are returned. If None, the type follows the promotion rules
+            of numpy. Defaults to None.
 
     Returns:
         The corrected stack of frames.
     """
-    if absorption_coefficient <= 0.0:
-        raise ValueError("Absorption Coefficient must be positive.")
-    if thickness <= 0.0:
-        raise ValueError("Thickness must be positive.")
+    _check_absorption(absorption_coefficient, thickness)
 
-    absorption_efficiency = 1.0 - exp(
-        -absorption_coefficient
-        * thickness
-        / cos(
-            scattering_angles(
-                cast(tuple[int, int], frames.shape[-2:]),
+    return apply_angular_efficiency(
+        frames,
+        cast(
+            ndarray[Tuple[FrameWidth, FrameHeight], dtype[floating]],
+            scattering_secants(
+                cast(Tuple[int, int], frames.shape[-2:]),
                 beam_center,
                 pixel_sizes,
                 distance,
-            )
-        )
+            ),
+        ),
+        absorption_coefficient,
+        thickness,
+        out,
+        precision,
     )
-    return frames / absorption_efficiency
@@ -1,11 +1,16 @@
-from numpy import dtype, number
+from typing import Optional
 
+from numpy import dtype, number, subtract
+
+from ..utils.precision import Precision, as_precision
 from ..utils.typing import Frame, FrameHeight, Frames, FrameWidth, NumFrames
 
 
 def subtract_background(
     foreground_frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
     background_frame: Frame[FrameWidth, FrameHeight, dtype[number]],
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]] = None,
+    precision: Precision = None,
 ) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]:
     """Subtract a background frame from a sequence of foreground frames.
 
@@ -16,8 +21,18 @@ def subtract_background(
     Args:
         foreground_frames: A sequence of foreground frames to be corrected.
         background_frame: The background which is to be corrected for.
+        out: A stack into which the corrected frames are written, which may be the
+            input stack itself to correct in place. If None, a new stack is allocated.
+            Defaults to None.
+        precision: The floating point type in which the correction is evaluated and the
+            corrected frames are returned. If None, the type follows the promotion rules
+            of numpy. Defaults to None.
 
     Returns:
         A sequence of corrected frames.
     """
-    return foreground_frames - background_frame
+    foreground_frames = as_precision(foreground_frames, precision)
+    background_frame = as_precision(background_frame, precision)
+    if out is None:
+        return foreground_frames - background_frame
+    return subtract(foreground_frames, background_frame, out=out)
@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from typing import Any, Literal, Optional, Tuple, cast
+
+from numpy import dtype, floating, multiply, number, ones
+
+from ..utils.geometry import scattering_cosines, scattering_secants
+from ..utils.pixels import ValidPixels
+from ..utils.precision import Precision, as_precision
+from ..utils.typing import Frame, FrameHeight, Frames, FrameWidth, NumFrames
+from .angular_efficiency import apply_angular_efficiency
+from .flatfield import correct_flatfield
+from .polarization import PolarizationModel
+from .solid_angle import apply_solid_angle
+from .thickness import normalize_thickness
+
+
+@dataclass(frozen=True)
+class CorrectionMap:
+    """A per-pixel multiplicative correction which is independent of the frame.
+
+    Combines the flatfield, angular efficiency, solid angle, polarization and thickness
+    corrections into a single map of factors, such that they may be applied to a stack
+    of frames with a single multiplication. A map may be reused for any number of
+    stacks captured with the same instrument setup.
+    """
+
+    #: The combined multiplicative correction factor of each pixel.
+    factors: Frame[Any, Any, dtype[floating]]
+
+    @classmethod
+    def from_parameters(
+        cls,
+        flatfield: Frame[FrameWidth, FrameHeight, dtype[floating]],
+        beam_center: Tuple[float, float],
+        pixel_sizes: Tuple[float, float],
+        distance: float,
+        sensor_absorption_coefficient: float,
+        sensor_thickness: float,
+        beam_polarization: float,
+        sample_thickness: float,
+        precision: Precision = None,
+        valid_pixels: Optional[ValidPixels] = None,
+    ) -> "CorrectionMap":
+        """Constructs a correction map by folding the frame independent corrections.
+
+        Args:
+            flatfield: The multiplicative flatfield correction to be applied.
+            beam_center: The center position of the beam in pixels.
+            pixel_sizes: The real space size of a detector pixel.
+            distance: The distance between the detector and the sample.
+            sensor_absorption_coefficient: The coefficient of absorption for a given
+                detector head material at a given photon energy.
+            sensor_thickness: The thickness of the detector head material.
+            beam_polarization: The fraction of incident radiation polarized in the
+                horizontal plane, where 0.5 signifies an unpolarized source.
+            sample_thickness: The thickness of the sample material.
+            precision: The floating point type in which the combined factors are held,
+                having been computed in double precision. If None, the factors are held
+                in double precision. Defaults to None.
+            valid_pixels: The valid pixels of the detector. If given, the map is built
+                from the geometry of the valid pixels alone, holding a single row of
+                their factors such that it may be applied to compact stacks of frames.
+                Defaults to None.
+
+        Returns:
+            A correction map combining each of the frame independent corrections.
+        """
+        geometry = (beam_center, pixel_sizes, distance)
+        pixel_flatfield: Frame[Any, Any, dtype[floating]] = flatfield
+        if valid_pixels is None:
+            frame_shape = cast(Tuple[int, int], flatfield.shape)
+            secants = scattering_secants(frame_shape, *geometry)
+            cosines = scattering_cosines(frame_shape, *geometry)
+            polarization = PolarizationModel.from_geometry(frame_shape, *geometry)
+        else:
+            pixel_flatfield = valid_pixels.gather_map(flatfield)
+            secants = valid_pixels.scattering_secants(*geometry)
+            cosines = valid_pixels.scattering_cosines(*geometry)
+            polarization = PolarizationModel.from_components(
+                valid_pixels.scattering_sines(*geometry),
+                valid_pixels.azimuthal_cosines(beam_center, pixel_sizes),
+                valid_pixels.azimuthal_sines(beam_center, pixel_sizes),
+            )
+        factors: Frames[Literal[1], Any, Any, dtype[number]] = ones(
+            (1, *pixel_flatfield.shape)
+        )
+        factors = correct_flatfield(factors, pixel_flatfield)
+        factors = apply_angular_efficiency(
+            factors, secants, sensor_absorption_coefficient, sensor_thickness
+        )
+        factors = apply_solid_angle(factors, cosines)
+        factors = polarization.apply(factors, beam_polarization)
+        combined: Frame[Any, Any, dtype[floating]] = as_precision(
+            normalize_thickness(factors, sample_thickness)[0], precision
+        )
+        combined.flags.writeable = False
+        return cls(combined)
+
+    def apply(
+        self,
+        frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+        out: Optional[
+            Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]
+        ] = None,
+        precision: Precision = None,
+    ) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]:
+        """Applies the combined correction to a stack of frames.
+
+        Args:
+            frames: A stack of frames to be corrected.
+            out: A stack into which the corrected frames are written, which may be the
+                input stack itself to correct in place. If None, a new stack is
+                allocated. Defaults to None.
+            precision: The floating point type in which the correction is evaluated
+                and the corrected frames are returned. If None, the type follows the
+                promotion rules of numpy. Defaults to None.
+
+        Returns:
+            The corrected stack of frames.
+        """
+        frames = as_precision(frames, precision)
+        factors = as_precision(self.factors, precision)
+        if out is None:
+            return cast(
+                Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]],
+                frames * factors,
+            )
+        return multiply(frames, factors, out=out)
@@ -1,25 +1,21 @@
-from numpy import atleast_1d, dtype, expand_dims, ndarray, number
+from typing import Optional
 
+from numpy import atleast_1d, dtype, expand_dims, ndarray, number, subtract
+
+from ..utils.precision import Precision, as_precision
 from ..utils.typing import FrameHeight, Frames, FrameWidth, NumFrames, VectorOrSingle
 
 
-def correct_dark_current(
-    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+def total_dark_current(
     count_times: ndarray[VectorOrSingle[NumFrames], dtype[number]],
     transmitted_flux: ndarray[VectorOrSingle[NumFrames], dtype[number]],
     base_dark_current: float,
     temporal_dark_current: float,
     flux_dependant_dark_current: float,
-) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]:
-    """Correct by subtracting base, temporal and flux-dependant dark currents.
-
-    Correct for incident dark current by subtracting a baselike, time dependant and a
-    flux dependant count rate from frames, as detailed in section 3.3.6 of 'Everything
-    SAXS: small-angle scattering pattern collection and correction'
-    [https://doi.org/10.1088/0953-8984/25/38/383201].
+) -> ndarray[VectorOrSingle[NumFrames], dtype[number]]:
+    """Computes the sum of base, temporal and flux-dependant dark currents per frame.
 
     Args:
-        frames: A stack of frames to be corrected.
         count_times: The period over which photons are counted for each frame.
         transmitted_flux: The flux intensity observed downstream of the sample
             for each frame.
@@ -29,7 +25,7 @@ def correct_dark_current(
             flux.
 
     Returns:
-        The corrected stack of frames.
+        The total dark current of each frame.
     """
     if (count_times <= 0).any():
         raise ValueError("Count times must be positive.")
@@ -42,8 +38,60 @@ def correct_dark_current(
     if flux_dependant_dark_current < 0:
         raise ValueError("Flux Dependant Dark Current must be non-negative.")
 
-    temporal = temporal_dark_current * expand_dims(atleast_1d(count_times), (1, 2))
-    flux_dependant = flux_dependant_dark_current * expand_dims(
-        atleast_1d(transmitted_flux), (1, 2)
+    return (
+        base_dark_current
+        + temporal_dark_current * atleast_1d(count_times)
+        + flux_dependant_dark_current * atleast_1d(transmitted_flux)
+    )
+
+
+def correct_dark_current(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+    count_times: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    transmitted_flux: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    base_dark_current: float,
+    temporal_dark_current: float,
+    flux_dependant_dark_current: float,
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]] = None,
+    precision: Precision = None,
+) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]:
+    """Correct by subtracting base, temporal and flux-dependant dark currents.
+
+    Correct for incident dark current by subtracting a baselike, time dependant and a
+    flux dependant count rate from frames, as detailed in section 3.3.6 of 'Everything
+    SAXS: small-angle scattering pattern collection and correction'
+    [https://doi.org/10.1088/0953-8984/25/38/383201].
+
+    Args:
+        frames: A stack of frames to be corrected.
+        count_times: The period over which photons are counted for each frame.
+        transmitted_flux: The flux intensity observed downstream of the sample
+            for each frame.
+        base_dark_current: The dark current flux, irrespective of time.
+        temporal_dark_current: The dark current flux, as a factor of time.
+        flux_dependant_dark_current: The dark current flux, as a factor of incident
+            flux.
+        out: A stack into which the corrected frames are written, which may be the
+            input stack itself to correct in place. If None, a new stack is allocated.
+            Defaults to None.
+        precision: The floating point type in which the correction is evaluated and the
+            corrected frames are returned. If None, the type follows the promotion rules
+            of numpy. Defaults to None.
+
+    Returns:
+        The corrected stack of frames.
+    """
+    frames = as_precision(frames, precision)
+    dark_current = as_precision(
+        total_dark_current(
+            count_times,
+            transmitted_flux,
+            base_dark_current,
+            temporal_dark_current,
+            flux_dependant_dark_current,
+        ),
+        precision,
     )
-    return frames - base_dark_current - temporal - flux_dependant
+    if out is None:
+        return frames - expand_dims(dark_current, (1, 2))
+    return subtract(frames, expand_dims(dark_current, (1, 2)), out=out)
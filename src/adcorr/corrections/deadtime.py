@@ -1,17 +1,98 @@
-from typing import Any, cast
+from math import prod
+from typing import Any, Literal, Optional, Tuple, cast
 
 from numpy import (
+    arange,
     atleast_1d,
+    broadcast_shapes,
+    broadcast_to,
     complexfloating,
+    divide,
     dtype,
+    empty,
     expand_dims,
+    float64,
     floating,
+    integer,
+    multiply,
     ndarray,
     number,
+    unique,
 )
+from numpy.ma import MaskedArray, filled, getdata, getmaskarray, masked_array
 from scipy.special import lambertw
 
-from ..utils.typing import FrameHeight, Frames, FrameWidth, NumFrames, VectorOrSingle
+from ..utils.precision import Precision, as_precision
+from ..utils.special import lambertw_real
+from ..utils.typing import (
+    FrameDType,
+    FrameHeight,
+    Frames,
+    FrameWidth,
+    NumFrames,
+    VectorOrSingle,
+)
+
+#: The largest count for which a deadtime lookup table is constructed
+LOOKUP_TABLE_MAX_COUNT = 2**20
+
+
+def _lookup_eligible(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+    deadtime_proportion: ndarray[Tuple[int, Literal[1], Literal[1]], dtype[floating]],
+) -> bool:
+    if not isinstance(frames, ndarray) or frames.dtype.kind not in "iu":
+        return False
+    if frames.size == 0:
+        return False
+    counts = filled(frames, 0)
+    if counts.min() < 0 or counts.max() > LOOKUP_TABLE_MAX_COUNT:
+        return False
+    table_size = (int(counts.max()) + 1) * unique(deadtime_proportion).size
+    return table_size <= prod(broadcast_shapes(deadtime_proportion.shape, frames.shape))
+
+
+def _correct_deadtime_lookup(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[integer]],
+    deadtime_proportion: ndarray[Tuple[int, Literal[1], Literal[1]], dtype[floating]],
+    precision: Precision,
+) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]:
+    """Corrects integer frames for deadtime by gathering from per-proportion tables.
+
+    Constructs a table of corrected values for every count up to the largest in the
+    stack, once per distinct deadtime proportion, such that frames sharing a count time
+    share a table. The tables are evaluated with the same expression as the direct
+    correction, in double precision, and the gathered values are held in the working
+    precision.
+    """
+    shape = broadcast_shapes(deadtime_proportion.shape, frames.shape)
+    counts = broadcast_to(filled(frames, 0), shape)
+    proportions = broadcast_to(deadtime_proportion, (shape[0], 1, 1))[:, 0, 0]
+    possible_counts = arange(int(counts.max()) + 1)
+    corrected = empty(shape, dtype=float64 if precision is None else precision)
+    for proportion in unique(proportions):
+        table = (-lambertw_real(-proportion * possible_counts) / proportion).astype(
+            corrected.dtype, copy=False
+        )
+        selected = proportions == proportion
+        corrected[selected] = table[counts[selected]]
+    if isinstance(frames, MaskedArray):
+        return masked_array(corrected, mask=broadcast_to(getmaskarray(frames), shape))
+    return corrected
+
+
+def _carry_mask(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+    corrected: Frames[NumFrames, FrameWidth, FrameHeight, FrameDType],
+) -> Frames[NumFrames, FrameWidth, FrameHeight, FrameDType]:
+    """Carries the mask of masked frames to the frames corrected from them."""
+    if not isinstance(frames, MaskedArray):
+        return corrected
+    mask = broadcast_to(getmaskarray(frames), corrected.shape).copy()
+    if isinstance(corrected, MaskedArray):
+        corrected.mask = mask
+        return corrected
+    return masked_array(corrected, mask=mask)
 
 
 def correct_deadtime(
@@ -19,6 +100,8 @@ def correct_deadtime(
     count_times: ndarray[VectorOrSingle[NumFrames], dtype[floating]],
     minimum_pulse_separation: float,
     minimum_arrival_separation: float,
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]] = None,
+    precision: Precision = None,
 ) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]:
     """Correct for detector deadtime by accounting for overlapping events.
 
@@ -26,7 +109,10 @@ def correct_deadtime(
     photons required to produce the observed value in a given time period subject to
     detector characteristics, as detailed in section 3.3.4 of 'Everything SAXS: small-
     angle scattering pattern collection and correction'
-    [https://doi.org/10.1088/0953-8984/25/38/383201].
+    [https://doi.org/10.1088/0953-8984/25/38/383201]. Frames of non-negative integer
+    counts are corrected by lookup in a table of the corrected value of each possible
+    count, constructed once per distinct count time. Floating point frames are
+    corrected in their own precision.
 
     Args:
         frames: A stack of frames to be corrected.
@@ -36,6 +122,12 @@ def correct_deadtime(
         minimum_arrival_separation: The minimum time difference required between the
             current pulse and a subsequent pulse for the current pulse to be recorded
             correctly.
+        out: A stack into which the corrected frames are written, which may be the
+            input stack itself to correct in place. If None, a new stack is allocated.
+            Defaults to None.
+        precision: The floating point type in which the correction is evaluated and the
+            corrected frames are returned. If None, the type follows the promotion rules
+            of numpy. Defaults to None.
 
     Returns:
         The corrected stack of frames.
@@ -48,7 +140,10 @@ def correct_deadtime(
         raise ValueError("Minimum Arrival Separation must be non-negative.")
 
     if minimum_pulse_separation == 0 and minimum_arrival_separation == 0:
-        return frames
+        if out is None:
+            return as_precision(frames, precision)
+        out[...] = frames
+        return _carry_mask(frames, out)
 
     deadtime_proportion = expand_dims(
         atleast_1d(
@@ -56,10 +151,34 @@ def correct_deadtime(
         ),
         (1, 2),
     )
-    return (
-        -cast(
+    if _lookup_eligible(frames, deadtime_proportion):
+        corrected = _correct_deadtime_lookup(
+            cast(Frames[NumFrames, FrameWidth, FrameHeight, dtype[integer]], frames),
+            deadtime_proportion,
+            precision,
+        )
+        if out is None:
+            return corrected
+        out[...] = getdata(corrected)
+        return _carry_mask(frames, out)
+
+    frames = as_precision(frames, precision)
+    if isinstance(frames, ndarray) and frames.dtype.kind == "f":
+        deadtime_proportion = deadtime_proportion.astype(frames.dtype)
+    if not isinstance(frames, ndarray) or frames.dtype.kind not in "iuf":
+        incident = -cast(
             ndarray[Any, dtype[complexfloating]],
             lambertw(-deadtime_proportion * frames),
         ).real
-        / deadtime_proportion
+        if out is None:
+            return incident / deadtime_proportion
+        return _carry_mask(frames, divide(incident, deadtime_proportion, out=out))
+
+    incident = multiply(
+        -deadtime_proportion,
+        getdata(frames),
+        out=None if out is None else getdata(out),
     )
+    lambertw_real(incident, out=incident)
+    divide(incident, -deadtime_proportion, out=incident)
+    return _carry_mask(frames, incident if out is None else out)
@@ -1,11 +1,16 @@
-from numpy import dtype, number
+from typing import Optional
 
+from numpy import dtype, multiply, number
+
+from ..utils.precision import Precision, as_precision
 from ..utils.typing import FrameHeight, Frames, FrameWidth, NumFrames
 
 
 def correct_displaced_volume(
     frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
     displaced_fraction: float,
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]] = None,
+    precision: Precision = None,
 ) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]:
     """Corrects for the volume of solvent displaced by the solute.
 
@@ -17,6 +22,12 @@ def correct_displaced_volume(
     Args:
         frames:  A stack of frames to be corrected.
         displaced_fraction: The fraction of solvent displaced by the analyte.
+        out: A stack into which the corrected frames are written, which may be the
+            input stack itself to correct in place. If None, a new stack is allocated.
+            Defaults to None.
+        precision: The floating point type in which the correction is evaluated and the
+            corrected frames are returned. If None, the type follows the promotion rules
+            of numpy. Defaults to None.
 
     Returns:
         The corrected stack of frames.
@@ -24,4 +35,7 @@ def correct_displaced_volume(
     if displaced_fraction < 0.0 or displaced_fraction > 1.0:
         raise ValueError("Displaced Fraction must be in interval [0, 1].")
 
-    return frames * (1.0 - displaced_fraction)
+    frames = as_precision(frames, precision)
+    if out is None:
+        return frames * (1.0 - displaced_fraction)
+    return multiply(frames, 1.0 - displaced_fraction, out=out)
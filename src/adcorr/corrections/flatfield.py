@@ -1,11 +1,16 @@
-from numpy import dtype, floating, number
+from typing import Optional
 
+from numpy import dtype, floating, multiply, number
+
+from ..utils.precision import Precision, as_precision
 from ..utils.typing import Frame, FrameHeight, Frames, FrameWidth, NumFrames
 
 
 def correct_flatfield(
     frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
     flatfield: Frame[FrameWidth, FrameHeight, dtype[floating]],
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]] = None,
+    precision: Precision = None,
 ) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]:
     """Corrects for inter-pixel sensitivity with a multiplicative flatfield.
 
@@ -16,8 +21,18 @@ def correct_flatfield(
     Args:
         frames: A stack of frames to be corrected.
         flatfield: The multiplicative flatfield correction to be applied.
+        out: A stack into which the corrected frames are written, which may be the
+            input stack itself to correct in place. If None, a new stack is allocated.
+            Defaults to None.
+        precision: The floating point type in which the correction is evaluated and the
+            corrected frames are returned. If None, the type follows the promotion rules
+            of numpy. Defaults to None.
 
     Returns:
         The corrected stack of frames.
     """
-    return frames * flatfield
+    frames = as_precision(frames, precision)
+    flatfield = as_precision(flatfield, precision)
+    if out is None:
+        return frames * flatfield
+    return multiply(frames, flatfield, out=out)
@@ -1,21 +1,161 @@
-from math import prod
+from typing import Optional, Tuple, cast
 
-from numpy import dtype, number
+from numpy import (
+    divide,
+    dtype,
+    float64,
+    floating,
+    int_,
+    ndarray,
+    number,
+    where,
+    zeros,
+)
+from numpy.ma import MaskedArray, getdata, getmaskarray, masked_where
 
+from ..utils.precision import Precision, as_precision
 from ..utils.typing import Frame, FrameHeight, Frames, FrameWidth, NumFrames
 
+#: The number of frames in which each pixel of a frame is valid
+PixelCounts = ndarray[Tuple[int, int], dtype[int_]]
+#: A floating point statistic of each pixel of a frame
+PixelValues = ndarray[Tuple[int, int], dtype[floating]]
+
 
 def average_all_frames(
-    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+    out: Optional[Frame[FrameWidth, FrameHeight, dtype[number]]] = None,
+    precision: Precision = None,
 ) -> Frame[FrameWidth, FrameHeight, dtype[number]]:
-    """Average all frames over the leading axis.
+    """Average all frames over the leading axes.
+
+    Frames are averaged over every leading axis at once, rather than being reshaped
+    into a single stack, such that a stack which cannot be viewed as a single stack,
+    for instance a strided view of a memory mapped file, is not copied into memory.
 
     Args:
         frames: A stack of frames to be averaged.
+        out: A frame into which the average is written. If None, a new frame is
+            allocated. Defaults to None.
+        precision: The floating point type in which the average is returned, with the
+            sum accumulated in double precision. If None, the type follows the
+            promotion rules of numpy. Defaults to None.
 
     Returns:
         A frame containing the average pixel values of all frames in the stack.
     """
-    return frames.reshape(
-        [frames.size // prod(frames.shape[-2:]), *frames.shape[-2:]]
-    ).mean(0)
+    axes = tuple(range(frames.ndim - 2))
+    if precision is None:
+        return frames.mean(axes, out=out)
+    return as_precision(frames.mean(axes, dtype=float64, out=out), precision)
+
+
+class FrameAccumulator:
+    """A mergeable single pass accumulator of the per-pixel mean and variance.
+
+    Frames are added in chunks of any size, with the running mean and sum of squared
+    deviations of each pixel updated by the pairwise method of Chan et al., such that a
+    stack of frames may be averaged without ever being held in memory at once.
+    Accumulators populated from disjoint sets of frames, for example by separate
+    workers, may be merged to obtain the statistics of the combined set. Masked pixels
+    are excluded, with each pixel tracking the number of frames in which it is valid.
+    """
+
+    def __init__(self, frame_shape: Tuple[int, int]) -> None:
+        """Constructs an accumulator which has observed no frames.
+
+        Args:
+            frame_shape: The shape of the frames to be accumulated.
+        """
+        self.count: PixelCounts = zeros(frame_shape, dtype=int_)
+        self._mean: PixelValues = zeros(frame_shape)
+        self._squared_deviations: PixelValues = zeros(frame_shape)
+
+    @classmethod
+    def from_frames(
+        cls, frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]
+    ) -> "FrameAccumulator":
+        """Constructs an accumulator which has observed a stack of frames.
+
+        Args:
+            frames: A stack of frames, or a single frame, to be accumulated.
+
+        Returns:
+            An accumulator holding the statistics of the frames.
+        """
+        accumulator = cls(cast(Tuple[int, int], frames.shape[-2:]))
+        accumulator.update(frames)
+        return accumulator
+
+    def update(
+        self, frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]
+    ) -> None:
+        """Adds a stack of frames to the accumulated statistics.
+
+        Args:
+            frames: A stack of frames, or a single frame, to be accumulated.
+        """
+        if frames.shape[-2:] != self.count.shape:
+            raise ValueError(
+                f"Frames of shape {frames.shape[-2:]} cannot be accumulated with "
+                f"frames of shape {self.count.shape}."
+            )
+        frames = frames.reshape(-1, *frames.shape[-2:])
+        valid = ~getmaskarray(frames)
+        values = getdata(frames).astype(float64)
+        count = valid.sum(0)
+        mean = divide(
+            where(valid, values, 0.0).sum(0),
+            count,
+            out=zeros(count.shape),
+            where=count != 0,
+        )
+        squared_deviations = (where(valid, values - mean, 0.0) ** 2).sum(0)
+        self._combine(count, mean, squared_deviations)
+
+    def merge(self, other: "FrameAccumulator") -> None:
+        """Adds the statistics held by another accumulator to this accumulator.
+
+        Args:
+            other: An accumulator which observed a disjoint set of frames.
+        """
+        if other.count.shape != self.count.shape:
+            raise ValueError(
+                f"Frames of shape {other.count.shape} cannot be accumulated with "
+                f"frames of shape {self.count.shape}."
+            )
+        self._combine(other.count, other._mean, other._squared_deviations)
+
+    def _combine(
+        self,
+        count: PixelCounts,
+        mean: PixelValues,
+        squared_deviations: PixelValues,
+    ) -> None:
+        total = self.count + count
+        delta = mean - self._mean
+        weight = divide(count, total, out=zeros(total.shape), where=total != 0)
+        self._mean += delta * weight
+        self._squared_deviations += squared_deviations + delta**2 * self.count * weight
+        self.count = total
+
+    @property
+    def mean(self) -> MaskedArray[Tuple[int, int], dtype[floating]]:
+        """The mean of each pixel, masked where the pixel was never valid."""
+        return masked_where(self.count == 0, self._mean.copy())
+
+    def variance(self, ddof: int = 0) -> MaskedArray[Tuple[int, int], dtype[floating]]:
+        """Computes the variance of each pixel.
+
+        Args:
+            ddof: The delta degrees of freedom, such that the sum of squared deviations
+                is divided by the count less ddof. Defaults to 0.
+
+        Returns:
+            The variance of each pixel, masked where the count does not exceed ddof.
+        """
+        dof = self.count - ddof
+        return masked_where(
+            dof <= 0,
+            divide(self._squared_deviations, dof, out=zeros(dof.shape), where=dof > 0),
+        )
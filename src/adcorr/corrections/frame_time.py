@@ -1,11 +1,16 @@
-from numpy import atleast_1d, dtype, expand_dims, floating, ndarray, number
+from typing import Optional
 
+from numpy import atleast_1d, divide, dtype, expand_dims, floating, ndarray, number
+
+from ..utils.precision import Precision, as_precision
 from ..utils.typing import FrameHeight, Frames, FrameWidth, NumFrames, VectorOrSingle
 
 
 def normalize_frame_time(
     frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
     count_times: ndarray[VectorOrSingle[NumFrames], dtype[floating]],
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]] = None,
+    precision: Precision = None,
 ) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]:
     """Normalize for detector frame rate by scaling with respect to to count time.
 
@@ -16,6 +21,12 @@ def normalize_frame_time(
     Args:
         frames: A stack of frames to be normalized.
         count_times: The period over which photons are counted for each frame.
+        out: A stack into which the normalized frames are written, which may be the
+            input stack itself to normalize in place. If None, a new stack is allocated.
+            Defaults to None.
+        precision: The floating point type in which the normalization is evaluated
+            and the normalized frames are returned. If None, the type follows the
+            promotion rules of numpy. Defaults to None.
 
     Returns:
         The normalized stack of frames.
@@ -23,5 +34,8 @@ def normalize_frame_time(
     if (count_times <= 0).any():
         raise ValueError("Count times must be positive.")
 
-    times = expand_dims(atleast_1d(count_times), (1, 2))
-    return frames / times
+    frames = as_precision(frames, precision)
+    times = expand_dims(atleast_1d(as_precision(count_times, precision)), (1, 2))
+    if out is None:
+        return frames / times
+    return divide(frames, times, out=out)
@@ -1,5 +1,7 @@
-from numpy import bool_, broadcast_to, dtype
-from numpy.ma import MaskedArray, masked_where
+from typing import Any, Optional, Tuple
+
+from numpy import bool_, broadcast_to, copyto, dtype, memmap, ndarray
+from numpy.ma import MaskedArray, getdata, getmaskarray, masked_where
 
 from ..utils.typing import Frame, FrameDType, FrameHeight, Frames, FrameWidth, NumFrames
 
@@ -7,6 +9,7 @@ from ..utils.typing import Frame, FrameDType, FrameHeight, Frames, FrameWidth, N
 def mask_frames(
     frames: Frames[NumFrames, FrameWidth, FrameHeight, FrameDType],
     mask: Frame[FrameWidth, FrameHeight, dtype[bool_]],
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, FrameDType]] = None,
 ) -> MaskedArray[tuple[NumFrames, FrameWidth, FrameHeight], FrameDType]:
     """Constructs a numpy masked array from a stack of frames and a mask.
 
@@ -17,8 +20,59 @@ def mask_frames(
     Args:
         frames: A stack of frames to be masked.
         mask: The boolean mask to apply to each frame.
+        out: A stack into which the frames are copied prior to masking, allowing the
+            frames to be converted to the data type of a buffer which is reused by
+            subsequent in place corrections, which may be the frames themselves to mask
+            without copying. If None, the frames are copied to a new masked array.
+            Defaults to None.
 
     Returns:
         A stack of frames where pixels.
     """
-    return masked_where(broadcast_to(mask, frames.shape), frames)
+    if out is None:
+        # Memory mapped frames are copied to memory as a plain array
+        if isinstance(frames, memmap):
+            frames = frames.view(ndarray)
+        return masked_where(broadcast_to(mask, frames.shape), frames)
+    if out is not frames:
+        copyto(getdata(out), frames)
+    out = out if isinstance(out, MaskedArray) else out.view(MaskedArray)
+    out.mask = broadcast_to(mask, frames.shape)
+    return out
+
+
+def fill_masked_pixels(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, FrameDType],
+    mask: Frame[FrameWidth, FrameHeight, dtype[bool_]],
+    fill_value: Any = 0,
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, FrameDType]] = None,
+) -> ndarray[Tuple[NumFrames, FrameWidth, FrameHeight], FrameDType]:
+    """Copies a stack of frames to a plain array with masked pixels set to a value.
+
+    Provides deferred masking, in which a single frame mask is shared by every frame
+    and corrections are applied to plain arrays, avoiding the overhead of masked array
+    operations. Masked pixels are set to a benign value such that corrections do not
+    produce spurious errors, with the mask to be applied by mask_frames once the
+    corrections are complete. Pixels masked in a masked array of frames are filled
+    alongside those of the mask.
+
+    Args:
+        frames: A stack of frames to be copied.
+        mask: The boolean mask shared by each frame.
+        fill_value: The value assigned to masked pixels. Defaults to 0.
+        out: A stack into which the frames are copied, which may be the frames
+            themselves to fill in place. If None, the frames are copied to a new array.
+            Defaults to None.
+
+    Returns:
+        A plain stack of frames in which masked pixels are set to the fill value.
+    """
+    if out is None:
+        out = getdata(frames, subok=False).copy()
+    elif out is not frames:
+        copyto(out, getdata(frames))
+    out = getdata(out)
+    copyto(out, fill_value, where=broadcast_to(mask, out.shape))
+    if isinstance(frames, MaskedArray):
+        copyto(out, fill_value, where=getmaskarray(frames))
+    return out
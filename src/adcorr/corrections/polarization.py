@@ -1,9 +1,154 @@
-from typing import Tuple, cast
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple, cast
 
-from numpy import cos, dtype, floating, number, sin, square
+from numpy import dtype, floating, multiply, ndarray, number, square
 
-from ..utils.geometry import azimuthal_angles, scattering_angles
-from ..utils.typing import FrameHeight, Frames, FrameWidth, NumFrames
+from ..utils.geometry import (
+    GEOMETRY_CACHE,
+    azimuthal_cosines,
+    azimuthal_sines,
+    scattering_sines,
+)
+from ..utils.precision import Precision, as_precision
+from ..utils.typing import Frame, FrameHeight, Frames, FrameWidth, NumFrames
+
+
+def _check_polarization(horizontal_poarization: float) -> None:
+    if horizontal_poarization < 0.0 or horizontal_poarization > 1.0:
+        raise ValueError("Horizontal Polarization must be within the interval [0, 1].")
+
+
+@dataclass(frozen=True)
+class PolarizationModel:
+    """The polarization correction of a detector geometry, as a pair of basis maps.
+
+    The polarization correction factor of each pixel is linear in the fraction of
+    incident radiation polarized in the horizontal plane, being the vertical factor
+    (1 - cos^2(azimuth) sin^2(scattering)) plus the fraction multiplied by the
+    difference of the horizontal and vertical factors. Holding both maps allows the
+    correction for any polarization fraction to be found with a single multiply-add.
+    """
+
+    #: The correction factor of each pixel for a vertically polarized source.
+    vertical: Frame[Any, Any, dtype[floating]]
+    #: The change in correction factor of each pixel between a vertically and a
+    #: horizontally polarized source.
+    horizontal_difference: Frame[Any, Any, dtype[floating]]
+
+    @classmethod
+    def from_components(
+        cls,
+        scattering_sines: Frame[FrameWidth, FrameHeight, dtype[floating]],
+        azimuthal_cosines: Frame[FrameWidth, FrameHeight, dtype[floating]],
+        azimuthal_sines: Frame[FrameWidth, FrameHeight, dtype[floating]],
+    ) -> "PolarizationModel":
+        """Constructs the basis maps from the trigonometric components of each pixel.
+
+        Args:
+            scattering_sines: The sine of the angle of each pixel from the sample.
+            azimuthal_cosines: The cosine of the azimuthal angle of each pixel from the
+                beam center.
+            azimuthal_sines: The sine of the azimuthal angle of each pixel from the
+                beam center.
+
+        Returns:
+            The polarization model of the pixels.
+        """
+        scattering_sine_squared = square(scattering_sines)
+        vertical = 1.0 - square(azimuthal_cosines) * scattering_sine_squared
+        horizontal = 1.0 - square(azimuthal_sines) * scattering_sine_squared
+        return cls(vertical, horizontal - vertical)
+
+    @classmethod
+    def from_geometry(
+        cls,
+        frame_shape: Tuple[int, int],
+        beam_center: Tuple[float, float],
+        pixel_sizes: Tuple[float, float],
+        distance: float,
+    ) -> "PolarizationModel":
+        """Constructs the basis maps for a detector geometry.
+
+        The basis maps are held in the geometry cache, such that repeated construction
+        for the same geometry is free.
+
+        Args:
+            frame_shape: The shape of a frame.
+            beam_center: The center position of the beam in pixels.
+            pixel_sizes: The real space size of a detector pixel.
+            distance: The distance between the detector and the sample.
+
+        Returns:
+            The polarization model of the detector geometry.
+        """
+
+        def compute() -> Tuple[ndarray, ndarray]:
+            model = cls.from_components(
+                scattering_sines(frame_shape, beam_center, pixel_sizes, distance),
+                azimuthal_cosines(frame_shape, beam_center, pixel_sizes),
+                azimuthal_sines(frame_shape, beam_center, pixel_sizes),
+            )
+            return model.vertical, model.horizontal_difference
+
+        return cls(
+            *GEOMETRY_CACHE.get(
+                ("polarization_basis", frame_shape, beam_center, pixel_sizes, distance),
+                compute,
+            )
+        )
+
+    def factors(
+        self, horizontal_poarization: float = 0.5
+    ) -> Frame[Any, Any, dtype[floating]]:
+        """Computes the correction factor of each pixel for a polarization fraction.
+
+        Args:
+            horizontal_poarization: The fraction of incident radiation polarized in
+                the horizontal plane, where 0.5 signifies an unpolarized source.
+                Defaults to 0.5.
+
+        Returns:
+            The multiplicative correction factor of each pixel.
+        """
+        _check_polarization(horizontal_poarization)
+        return self.vertical + horizontal_poarization * self.horizontal_difference
+
+    def apply(
+        self,
+        frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+        horizontal_poarization: float = 0.5,
+        out: Optional[
+            Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]
+        ] = None,
+        precision: Precision = None,
+    ) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]:
+        """Applies the polarization correction to a stack of frames.
+
+        Args:
+            frames: A stack of frames to be corrected.
+            horizontal_poarization: The fraction of incident radiation polarized in
+                the horizontal plane, where 0.5 signifies an unpolarized source.
+                Defaults to 0.5.
+            out: A stack into which the corrected frames are written, which may be the
+                input stack itself to correct in place. If None, a new stack is
+                allocated. Defaults to None.
+            precision: The floating point type in which the correction is evaluated
+                and the corrected frames are returned. If None, the type follows the
+                promotion rules of numpy. Defaults to None.
+
+        Returns:
+            The corrected stack of frames.
+        """
+        frames = as_precision(frames, precision)
+        correction_factors = as_precision(
+            self.factors(horizontal_poarization), precision
+        )
+        if out is None:
+            return cast(
+                Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]],
+                frames * correction_factors,
+            )
+        return multiply(frames, correction_factors, out=out)
 
 
 def correct_polarization(
@@ -12,12 +157,15 @@ def correct_polarization(
     pixel_sizes: Tuple[float, float],
     distance: float,
     horizontal_poarization: float = 0.5,
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]] = None,
+    precision: Precision = None,
 ) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]:
     """Corrects for the effect of polarization of the incident beam.
 
     Corrects for the effect of polarization of the incident beam, as detailed in
     section 3.4.1 of 'Everything SAXS: small-angle scattering pattern collection and
-    correction' [https://doi.org/10.1088/0953-8984/25/38/383201].
+    correction' [https://doi.org/10.1088/0953-8984/25/38/383201]. The basis maps of
+    the geometry are cached, as described in PolarizationModel.from_geometry.
 
     Args:
         frames: A stack of frames to be corrected.
@@ -27,20 +175,17 @@ def correct_polarization(
         horizontal_poarization: The fraction of incident radiation polarized in the
             horizontal plane, where 0.5 signifies an unpolarized source. Defaults to
             0.5.
+        out: A stack into which the corrected frames are written, which may be the
+            input stack itself to correct in place. If None, a new stack is allocated.
+            Defaults to None.
+        precision: The floating point type in which the correction is evaluated and the
+            corrected frames are returned. If None, the type follows the promotion rules
+            of numpy. Defaults to None.
 
     Returns:
         The corrected stack of frames.
     """
-    if horizontal_poarization < 0.0 or horizontal_poarization > 1.0:
-        raise ValueError("Horizontal Polarization must be within the interval [0, 1].")
-
-    scattering = scattering_angles(
-        cast(tuple[int, int], frames.shape[-2:]), beam_center, pixel_sizes, distance
-    )
-    azimuths = azimuthal_angles(
-        cast(tuple[int, int], frames.shape[-2:]), beam_center, pixel_sizes
-    )
-    correction_factors = horizontal_poarization * (
-        1.0 - square(sin(azimuths) * sin(scattering))
-    ) + (1.0 - horizontal_poarization) * (1.0 - square(cos(azimuths) * sin(scattering)))
-    return frames * correction_factors
+    _check_polarization(horizontal_poarization)
+    return PolarizationModel.from_geometry(
+        cast(Tuple[int, int], frames.shape[-2:]), beam_center, pixel_sizes, distance
+    ).apply(frames, horizontal_poarization, out, precision)
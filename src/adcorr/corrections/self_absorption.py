@@ -1,23 +1,386 @@
-from typing import Tuple, cast
+from dataclasses import dataclass, field
+from functools import partial
+from threading import Lock
+from typing import Callable, Optional, OrderedDict, Tuple, cast
 
 from numpy import (
-    broadcast_to,
-    cos,
+    abs,
+    argsort,
+    asarray,
+    broadcast_shapes,
+    clip,
+    concatenate,
+    diff,
     divide,
     dtype,
+    empty,
     expand_dims,
+    flatnonzero,
     floating,
+    interp,
+    intp,
+    linspace,
     log,
     logical_and,
+    minimum,
+    multiply,
     ndarray,
     number,
-    ones_like,
+    ones,
     power,
+    result_type,
+    rint,
+    unique,
 )
+from numpy.ma import MaskedArray, getdata, getmaskarray, masked_array
 
-from ..utils.geometry import scattering_angles
+from ..utils.geometry import scattering_secants
+from ..utils.precision import Precision, as_precision
 from ..utils.typing import FrameHeight, Frames, FrameWidth, NumFrames, VectorOrSingle
 
+#: The largest number of points along either axis of a SelfAbsorptionTable
+SELF_ABSORPTION_TABLE_MAX_POINTS = 2**12
+#: The number of interpolated factor maps retained by a SelfAbsorptionTable
+SELF_ABSORPTION_TABLE_CACHED_MAPS = 2
+
+
+def _secant_factors(transmissibility: ndarray, secangles: ndarray) -> ndarray:
+    return divide(
+        1 - power(transmissibility, secangles - 1),
+        log(transmissibility) * (1 - secangles),
+        out=ones(broadcast_shapes(transmissibility.shape, secangles.shape)),
+        where=logical_and(secangles != 1.0, transmissibility != 1.0),
+    )
+
+
+def _transmissibility_factors(
+    secangles: ndarray[Tuple[FrameWidth, FrameHeight], dtype[floating]],
+    transmissibility: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+) -> ndarray[Tuple[NumFrames, FrameWidth, FrameHeight], dtype[floating]]:
+    transmissibility = (
+        transmissibility
+        if transmissibility.shape == (1,)
+        else expand_dims(transmissibility, (1, 2))
+    )
+    return _secant_factors(transmissibility, secangles)
+
+
+def self_absorption_factors(
+    secangles: ndarray[Tuple[FrameWidth, FrameHeight], dtype[floating]],
+    incident_flux: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    transmitted_flux: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+) -> ndarray[Tuple[NumFrames, FrameWidth, FrameHeight], dtype[floating]]:
+    """Computes the self absorption correction factor of each pixel.
+
+    Args:
+        secangles: The secant of the angle of each pixel from the sample.
+        incident_flux: The flux intensity observed upstream of the sample.
+        transmitted_flux: The flux intensity observed downstream of the sample.
+
+    Returns:
+        The multiplicative correction factor of each pixel, for each frame.
+    """
+    return _transmissibility_factors(secangles, transmitted_flux / incident_flux)
+
+
+def _refine(coarse: ndarray) -> ndarray:
+    refined = empty((2 * coarse.shape[0] - 1, 2 * coarse.shape[1] - 1))
+    refined[::2, ::2] = coarse
+    refined[1::2, ::2] = (coarse[:-1] + coarse[1:]) / 2
+    refined[::2, 1::2] = (coarse[:, :-1] + coarse[:, 1:]) / 2
+    refined[1::2, 1::2] = (
+        coarse[:-1, :-1] + coarse[1:, :-1] + coarse[:-1, 1:] + coarse[1:, 1:]
+    ) / 4
+    return refined
+
+
+def _grid_positions(values: ndarray, grid: ndarray) -> Tuple[ndarray, ndarray]:
+    positions = (values - grid[0]) / (grid[1] - grid[0])
+    if (positions < -1e-9).any() or (positions > grid.size - 1 + 1e-9).any():
+        raise ValueError(
+            f"Values must lie within the table range [{grid[0]}, {grid[-1]}]."
+        )
+    positions = clip(positions, 0, grid.size - 1)
+    indices = minimum(positions.astype(intp), grid.size - 2)
+    return indices, positions - indices
+
+
+@dataclass(frozen=True)
+class SelfAbsorptionTable:
+    """A table of self absorption correction factors for a detector geometry.
+
+    Tabulates the self absorption correction factor over a uniform grid of
+    transmissibility and secant of the scattering angle, such that the factor map of a
+    frame may be found by interpolation rather than by evaluating a power and a
+    logarithm for each pixel. The map of each tabulated transmissibility is
+    interpolated over the pixels on first use and the most recently used maps are
+    retained, such that frames of similar transmissibility require only a weighted sum
+    of two maps. A table may be reused for any number of stacks captured with the same
+    detector geometry, provided their transmissibilities lie within the tabulated
+    range.
+    """
+
+    #: The uniformly spaced transmissibilities at which factors are tabulated.
+    transmissibilities: ndarray[Tuple[int], dtype[floating]]
+    #: The uniformly spaced secants of the scattering angle at which factors are
+    #: tabulated.
+    secangles: ndarray[Tuple[int], dtype[floating]]
+    #: The correction factor at each transmissibility (rows) and secant (columns).
+    factors: ndarray[Tuple[int, int], dtype[floating]]
+    #: The secant of the scattering angle of each pixel of the detector.
+    pixel_secangles: ndarray[Tuple[int, int], dtype[floating]]
+    _pixel_maps: OrderedDict[int, ndarray[Tuple[int, int], dtype[floating]]] = field(
+        default_factory=OrderedDict, init=False, repr=False, compare=False
+    )
+    _pixel_maps_lock: Lock = field(
+        default_factory=Lock, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def from_geometry(
+        cls,
+        frame_shape: Tuple[int, int],
+        beam_center: Tuple[float, float],
+        pixel_sizes: Tuple[float, float],
+        distance: float,
+        min_transmissibility: float,
+        max_transmissibility: float = 1.0,
+        error_bound: float = 1e-6,
+    ) -> "SelfAbsorptionTable":
+        """Constructs a table of correction factors for a detector geometry.
+
+        The grid is refined by doubling the number of intervals along both axes until
+        the interpolation error, estimated at the midpoints of the grid, falls within
+        the error bound.
+
+        Args:
+            frame_shape: The shape of a frame captured by the detector.
+            beam_center: The center position of the beam in pixels.
+            pixel_sizes: The real space size of a detector pixel.
+            distance: The distance between the detector and the sample.
+            min_transmissibility: The smallest transmissibility to be tabulated, which
+                must be positive.
+            max_transmissibility: The largest transmissibility to be tabulated.
+                Defaults to 1.0.
+            error_bound: The largest permitted absolute error of an interpolated
+                factor. Defaults to 1e-6.
+
+        Returns:
+            A table of correction factors covering the pixels of the detector.
+
+        Raises:
+            ValueError: If the transmissibility range is invalid, the error bound is not
+                positive or the error bound cannot be met within
+                SELF_ABSORPTION_TABLE_MAX_POINTS points per axis.
+        """
+        if not 0 < min_transmissibility <= max_transmissibility:
+            raise ValueError(
+                "Transmissibility range must be positive and ordered, got "
+                f"[{min_transmissibility}, {max_transmissibility}]."
+            )
+        if error_bound <= 0:
+            raise ValueError(f"Error bound must be positive, got {error_bound}.")
+        pixel_secangles = scattering_secants(
+            frame_shape, beam_center, pixel_sizes, distance
+        )
+        min_secangle, max_secangle = pixel_secangles.min(), pixel_secangles.max()
+        if max_transmissibility == min_transmissibility:
+            max_transmissibility = min_transmissibility + 1.0
+        if max_secangle == min_secangle:
+            max_secangle = min_secangle + 1.0
+
+        def tabulate(points: int) -> Tuple[ndarray, ndarray, ndarray]:
+            transmissibilities = linspace(
+                min_transmissibility, max_transmissibility, points
+            )
+            secangles = linspace(min_secangle, max_secangle, points)
+            return (
+                transmissibilities,
+                secangles,
+                _secant_factors(transmissibilities[:, None], secangles[None, :]),
+            )
+
+        points = 17
+        transmissibilities, secangles, factors = tabulate(points)
+        while True:
+            if 2 * points - 1 > SELF_ABSORPTION_TABLE_MAX_POINTS:
+                raise ValueError(
+                    f"Error bound of {error_bound} could not be met within "
+                    f"{SELF_ABSORPTION_TABLE_MAX_POINTS} points per axis."
+                )
+            points = 2 * points - 1
+            refined = tabulate(points)
+            error = abs(refined[2] - _refine(factors)).max()
+            transmissibilities, secangles, factors = refined
+            if error <= error_bound:
+                break
+
+        for array in (transmissibilities, secangles, factors, pixel_secangles):
+            array.flags.writeable = False
+        return cls(transmissibilities, secangles, factors, pixel_secangles)
+
+    @property
+    def frame_shape(self) -> Tuple[int, int]:
+        """The shape of a frame captured by the detector."""
+        return cast(Tuple[int, int], self.pixel_secangles.shape)
+
+    def _pixel_map(self, index: int) -> ndarray[Tuple[int, int], dtype[floating]]:
+        with self._pixel_maps_lock:
+            pixel_map = self._pixel_maps.get(index)
+            if pixel_map is not None:
+                self._pixel_maps.move_to_end(index)
+                return pixel_map
+        # Maps are interpolated without holding the lock, such that threads which find
+        # their map retained are not blocked by the interpolation of another
+        pixel_map = interp(self.pixel_secangles, self.secangles, self.factors[index])
+        with self._pixel_maps_lock:
+            pixel_map = self._pixel_maps.setdefault(index, pixel_map)
+            self._pixel_maps.move_to_end(index)
+            while len(self._pixel_maps) > SELF_ABSORPTION_TABLE_CACHED_MAPS:
+                self._pixel_maps.popitem(last=False)
+        return pixel_map
+
+    def factor_maps(
+        self, transmissibility: ndarray[VectorOrSingle[NumFrames], dtype[number]]
+    ) -> ndarray[Tuple[NumFrames, FrameWidth, FrameHeight], dtype[floating]]:
+        """Interpolates the correction factor of each pixel, for each frame.
+
+        Args:
+            transmissibility: The transmissibility of each frame, or a single
+                transmissibility which applies to all frames.
+
+        Returns:
+            The multiplicative correction factor of each pixel, for each frame.
+
+        Raises:
+            ValueError: If a transmissibility lies outside of the tabulated range.
+        """
+        transmissibility = asarray(transmissibility)
+        indices, weights = _grid_positions(
+            transmissibility.reshape(-1), self.transmissibilities
+        )
+        maps = empty((indices.size, *self.frame_shape))
+        for frame in argsort(indices, kind="stable"):
+            multiply(
+                self._pixel_map(indices[frame]), 1 - weights[frame], out=maps[frame]
+            )
+            maps[frame] += self._pixel_map(indices[frame] + 1) * weights[frame]
+        return maps[0] if transmissibility.shape == (1,) else maps
+
+
+def _groupable(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+    transmissibility: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+) -> bool:
+    return (
+        isinstance(frames, ndarray)
+        and type(transmissibility) is ndarray
+        and frames.dtype.kind in "biuf"
+        and transmissibility.dtype.kind in "biuf"
+        and frames.ndim == 3
+        and transmissibility.shape == frames.shape[:1]
+        and frames.shape[0] > 1
+    )
+
+
+def _apply_factor_maps(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+    transmissibility: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    factor_maps: Callable[
+        [ndarray[VectorOrSingle[NumFrames], dtype[number]]],
+        ndarray[Tuple[NumFrames, FrameWidth, FrameHeight], dtype[floating]],
+    ],
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]],
+    transmissibility_tolerance: float,
+    precision: Precision,
+) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]:
+    if transmissibility_tolerance < 0:
+        raise ValueError(
+            "Transmissibility tolerance must be non-negative, got "
+            f"{transmissibility_tolerance}."
+        )
+    frames = as_precision(frames, precision)
+    if not _groupable(frames, transmissibility):
+        factors = as_precision(factor_maps(transmissibility), precision)
+        if out is None:
+            return frames * factors
+        return multiply(frames, factors, out=out)
+
+    if transmissibility_tolerance > 0:
+        transmissibility = (
+            rint(transmissibility / transmissibility_tolerance)
+            * transmissibility_tolerance
+        )
+    distinct, groups = unique(transmissibility, return_inverse=True)
+    boundaries = flatnonzero(diff(groups)) + 1
+    starts = concatenate(([0], boundaries))
+    stops = concatenate((boundaries, [groups.size]))
+    runs = sorted(zip(groups[starts], starts, stops))
+
+    data = getdata(frames)
+    working_type = result_type(data, float) if precision is None else precision
+    result = empty(frames.shape, dtype=working_type) if out is None else out
+    result_data = getdata(result)
+    group = -1
+    for run_group, start, stop in runs:
+        if run_group != group:
+            group = run_group
+            factors = as_precision(
+                factor_maps(distinct[group : group + 1]).reshape(frames.shape[-2:]),
+                precision,
+            )
+        multiply(data[start:stop], factors, out=result_data[start:stop])
+    if isinstance(frames, MaskedArray):
+        if out is None:
+            return masked_array(result, mask=getmaskarray(frames).copy())
+        if isinstance(out, MaskedArray) and out is not frames:
+            out.mask = getmaskarray(frames).copy()
+    return result
+
+
+def apply_self_absorption(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+    secangles: ndarray[Tuple[FrameWidth, FrameHeight], dtype[floating]],
+    incident_flux: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    transmitted_flux: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]] = None,
+    transmissibility_tolerance: float = 0.0,
+    precision: Precision = None,
+) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]:
+    """Applies the self absorption correction for precomputed pixel secants.
+
+    Frames are grouped by transmissibility, such that the correction factors are
+    computed once per distinct transmissibility and applied to each run of consecutive
+    frames which share it. Where a tolerance is given, transmissibilities are rounded
+    to the nearest multiple of the tolerance before grouping and the factors of each
+    group are computed from the rounded value.
+
+    Args:
+        frames: A stack of frames to be corrected.
+        secangles: The secant of the angle of each pixel from the sample.
+        incident_flux: The flux intensity observed upstream of the sample.
+        transmitted_flux: The flux intensity observed downstream of the sample.
+        out: A stack into which the corrected frames are written, which may be the
+            input stack itself to correct in place. If None, a new stack is allocated.
+            Defaults to None.
+        transmissibility_tolerance: The width of the bins into which transmissibilities
+            are quantised, or zero to group only identical values. Defaults to 0.0.
+        precision: The floating point type in which the correction is evaluated and the
+            corrected frames are returned. If None, the type follows the promotion rules
+            of numpy. Defaults to None.
+
+    Returns:
+        The corrected stack of frames.
+    """
+    return _apply_factor_maps(
+        frames,
+        transmitted_flux / incident_flux,
+        partial(_transmissibility_factors, secangles),
+        out,
+        transmissibility_tolerance,
+        precision,
+    )
+
 
 def correct_self_absorption(
     frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
@@ -26,12 +389,18 @@ def correct_self_absorption(
     beam_center: Tuple[float, float],
     pixel_sizes: Tuple[float, float],
     distance: float,
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]] = None,
+    transmissibility_tolerance: float = 0.0,
+    table: Optional[SelfAbsorptionTable] = None,
+    precision: Precision = None,
 ) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]:
     """Correct for transmission loss due to differences in observation angle.
 
     Correct for transmission loss due to differences in observation angle, as detailed
     in section 3.4.7 of 'Everything SAXS: small-angle scattering pattern collection and
-    correction' [https://doi.org/10.1088/0953-8984/25/38/383201].
+    correction' [https://doi.org/10.1088/0953-8984/25/38/383201]. The correction
+    factors are computed once per distinct transmissibility, as described in
+    apply_self_absorption, or interpolated from a table where one is given.
 
     Args:
         frames: A stack of frames to be corrected.
@@ -40,28 +409,49 @@ def correct_self_absorption(
         beam_center: The center position of the beam in pixels.
         pixel_sizes: The real space size of a detector pixel.
         distance: The distance between the detector and the sample.
+        out: A stack into which the corrected frames are written, which may be the
+            input stack itself to correct in place. If None, a new stack is allocated.
+            Defaults to None.
+        transmissibility_tolerance: The width of the bins into which transmissibilities
+            are quantised, or zero to group only identical values. Defaults to 0.0.
+        table: A table of correction factors for the detector geometry, from which
+            the factors are interpolated. If None, the factors are computed exactly.
+            Defaults to None.
+        precision: The floating point type in which the correction is evaluated and the
+            corrected frames are returned. If None, the type follows the promotion rules
+            of numpy. Defaults to None.
 
     Returns:
         The corrected stack of frames.
     """
-    angles = scattering_angles(
-        cast(Tuple[int, int], frames.shape[-2:]), beam_center, pixel_sizes, distance
-    )
-    transmissibility = transmitted_flux / incident_flux
-    transmissibility = (
-        transmissibility
-        if transmissibility.shape == (1,)
-        else expand_dims(transmissibility, (1, 2))
-    )
-
-    secangles: ndarray[Tuple[int, int], dtype[floating]] = broadcast_to(
-        1 / cos(angles), frames.shape
+    if table is not None:
+        if table.frame_shape != frames.shape[-2:]:
+            raise ValueError(
+                f"Frames of shape {frames.shape[-2:]} do not match the table of shape "
+                f"{table.frame_shape}."
+            )
+        return _apply_factor_maps(
+            frames,
+            transmitted_flux / incident_flux,
+            table.factor_maps,
+            out,
+            transmissibility_tolerance,
+            precision,
+        )
+    return apply_self_absorption(
+        frames,
+        cast(
+            ndarray[Tuple[FrameWidth, FrameHeight], dtype[floating]],
+            scattering_secants(
+                cast(Tuple[int, int], frames.shape[-2:]),
+                beam_center,
+                pixel_sizes,
+                distance,
+            ),
+        ),
+        incident_flux,
+        transmitted_flux,
+        out,
+        transmissibility_tolerance,
+        precision,
     )
-    correction_factors: ndarray[Tuple[int, int, int], dtype[floating]] = divide(
-        1 - power(transmissibility, secangles - 1),
-        log(transmissibility) * (1 - secangles),
-        out=ones_like(secangles),
-        where=logical_and(secangles != 1.0, transmissibility != 1.0),
-    )
-
-    return frames * correction_factors
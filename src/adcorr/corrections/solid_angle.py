@@ -1,16 +1,48 @@
-from typing import Tuple, cast
+from typing import Optional, Tuple, cast
 
-from numpy import cos, dtype, floating, number, power
+from numpy import divide, dtype, floating, ndarray, number, power
 
-from ..utils.geometry import scattering_angles
+from ..utils.geometry import scattering_cosines
+from ..utils.precision import Precision, as_precision
 from ..utils.typing import FrameHeight, Frames, FrameWidth, NumFrames
 
 
+def apply_solid_angle(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+    cosangles: ndarray[Tuple[FrameWidth, FrameHeight], dtype[floating]],
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]] = None,
+    precision: Precision = None,
+) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]:
+    """Applies the solid angle correction for precomputed pixel cosines.
+
+    Args:
+        frames: A stack of frames to be corrected.
+        cosangles: The cosine of the angle of each pixel from the sample.
+        out: A stack into which the corrected frames are written, which may be the
+            input stack itself to correct in place. If None, a new stack is allocated.
+            Defaults to None.
+        precision: The floating point type in which the correction is evaluated and the
+            corrected frames are returned. If None, the type follows the promotion rules
+            of numpy. Defaults to None.
+
+    Returns:
+        The corrected stack of frames.
+    """
+    correction = power(cosangles, 3)
+    frames = as_precision(frames, precision)
+    correction = as_precision(correction, precision)
+    if out is None:
+        return frames / correction
+    return divide(frames, correction, out=out)
+
+
 def correct_solid_angle(
     frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
     beam_center: Tuple[float, float],
     pixel_sizes: Tuple[float, float],
     distance: float,
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]] = None,
+    precision: Precision = None,
 ) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]:
     """Corrects for the solid angle by scaling by the inverse of subtended area.
 
@@ -23,19 +55,27 @@ def correct_solid_angle(
         beam_center: The center position of the beam in pixels.
         pixel_sizes: The real space size of a detector pixel.
         distance: The distance between the detector and the sample head.
+        out: A stack into which the corrected frames are written, which may be the
+            input stack itself to correct in place. If None, a new stack is allocated.
+            Defaults to None.
+        precision: The floating point type in which the correction is evaluated and the
+            corrected frames are returned. If None, the type follows the promotion rules
+            of numpy. Defaults to None.
 
     Returns:
         The corrected stack of frames.
     """
-    correction = power(
-        cos(
-            scattering_angles(
+    return apply_solid_angle(
+        frames,
+        cast(
+            ndarray[Tuple[FrameWidth, FrameHeight], dtype[floating]],
+            scattering_cosines(
                 cast(Tuple[int, int], frames.shape[-2:]),
                 beam_center,
                 pixel_sizes,
                 distance,
-            )
+            ),
         ),
-        3,
+        out,
+        precision,
     )
-    return frames / correction
@@ -1,11 +1,16 @@
-from numpy import dtype, number
+from typing import Optional
 
+from numpy import divide, dtype, number
+
+from ..utils.precision import Precision, as_precision
 from ..utils.typing import FrameHeight, Frames, FrameWidth, NumFrames
 
 
 def normalize_thickness(
     frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
     sample_thickness: float,
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]] = None,
+    precision: Precision = None,
 ) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]:
     """Normailizes pixel intensities by dividing by the sample thickness.
 
@@ -16,6 +21,12 @@ def normalize_thickness(
     Args:
         frames: A stack of frames to be corrected.
         sample_thickness: The thickness of the exposed sample.
+        out: A stack into which the normalized frames are written, which may be the
+            input stack itself to normalize in place. If None, a new stack is allocated.
+            Defaults to None.
+        precision: The floating point type in which the normalization is evaluated
+            and the normalized frames are returned. If None, the type follows the
+            promotion rules of numpy. Defaults to None.
 
     Returns:
         The normalized stack of frames.
@@ -23,4 +34,7 @@ def normalize_thickness(
     if sample_thickness <= 0:
         raise ValueError("Sample Thickness must be positive.")
 
-    return frames / sample_thickness
+    frames = as_precision(frames, precision)
+    if out is None:
+        return frames / sample_thickness
+    return divide(frames, sample_thickness, out=out)
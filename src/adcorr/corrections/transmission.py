@@ -1,11 +1,16 @@
-from numpy import dtype, expand_dims, ndarray, number
+from typing import Optional
 
+from numpy import divide, dtype, expand_dims, ndarray, number
+
+from ..utils.precision import Precision, as_precision
 from ..utils.typing import FrameHeight, Frames, FrameWidth, NumFrames, VectorOrSingle
 
 
 def normalize_transmitted_flux(
     frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
     transmitted_flux: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]] = None,
+    precision: Precision = None,
 ) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]:
     """Normalize for incident flux and transmissibility by scaling photon counts.
 
@@ -17,8 +22,18 @@ def normalize_transmitted_flux(
     Args:
         frames: A stack of frames to be normalized.
         transmitted_flux: The flux intensity observed downstream of the sample.
+        out: A stack into which the normalized frames are written, which may be the
+            input stack itself to normalize in place. If None, a new stack is allocated.
+            Defaults to None.
+        precision: The floating point type in which the normalization is evaluated
+            and the normalized frames are returned. If None, the type follows the
+            promotion rules of numpy. Defaults to None.
 
     Returns:
         The normalized stack of frames.
     """
-    return frames / expand_dims(transmitted_flux, (-2, -1))
+    frames = as_precision(frames, precision)
+    transmitted_flux = as_precision(transmitted_flux, precision)
+    if out is None:
+        return frames / expand_dims(transmitted_flux, (-2, -1))
+    return divide(frames, expand_dims(transmitted_flux, (-2, -1)), out=out)
@@ -0,0 +1,542 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from itertools import product
+from math import ceil, prod
+from os import PathLike
+from types import TracebackType
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
+from zlib import compress
+
+from h5py import Dataset, File
+from numpy import (
+    asarray,
+    ascontiguousarray,
+    bool_,
+    concatenate,
+    dtype,
+    ndarray,
+    ndindex,
+    number,
+    uint8,
+    zeros,
+)
+from numpy.ma import filled, getmaskarray
+
+from ..sequences.streaming import FrameChunk
+from ..utils.typing import Frame, FrameHeight, Frames, FrameWidth
+
+#: A path to a NeXus file on disk
+NexusPath = Union[str, PathLike]
+
+
+@dataclass(frozen=True)
+class NexusLayout:
+    """The locations of the datasets required for correction within a NeXus file.
+
+    Defaults to the layout of files written by the Pilatus 2M WAXS detector of the
+    Diamond Light Source I22 beamline, in which the incident flux is recorded in
+    milli-counts, the transmitted flux in micro-counts and the sample thickness in
+    milli-metres.
+    """
+
+    #: The detector frames, of any number of leading scan dimensions.
+    frames: str = "entry1/Pilatus2M_WAXS/data"
+    #: The period over which photons are counted for each frame.
+    count_times: str = "entry1/instrument/Pilatus2M_WAXS/count_time"
+    #: The flux intensity observed upstream of the sample for each frame.
+    incident_flux: str = "entry1/I0/data"
+    #: The flux intensity observed downstream of the sample for each frame.
+    transmitted_flux: str = "entry1/It/data"
+    #: The boolean mask of the detector, which is True for each masked pixel.
+    mask: str = "entry1/Pilatus2M_WAXS/pixel_mask"
+    #: The position of the beam center along the detector columns, in pixels.
+    beam_center_x: str = "entry1/instrument/Pilatus2M_WAXS/beam_center_x"
+    #: The position of the beam center along the detector rows, in pixels.
+    beam_center_y: str = "entry1/instrument/Pilatus2M_WAXS/beam_center_y"
+    #: The real space size of a detector pixel along the columns.
+    x_pixel_size: str = "entry1/instrument/Pilatus2M_WAXS/x_pixel_size"
+    #: The real space size of a detector pixel along the rows.
+    y_pixel_size: str = "entry1/instrument/Pilatus2M_WAXS/y_pixel_size"
+    #: The distance between the detector and the sample.
+    distance: str = "entry1/instrument/Pilatus2M_WAXS/distance"
+    #: The thickness of the sample material.
+    sample_thickness: str = "entry1/sample/thickness"
+    #: The factor by which the recorded incident flux is scaled to counts.
+    incident_flux_scale: float = 1e-3
+    #: The factor by which the recorded transmitted flux is scaled to counts.
+    transmitted_flux_scale: float = 1e-6
+    #: The factor by which the recorded sample thickness is scaled to metres.
+    sample_thickness_scale: float = 1e-3
+
+
+class NexusDetector(NamedTuple):
+    """The detector setup recorded in a NeXus file."""
+
+    #: The boolean mask of the detector, which is True for each masked pixel.
+    mask: Frame[Any, Any, dtype[bool_]]
+    #: The center position of the beam in pixels.
+    beam_center_pixels: Tuple[float, float]
+    #: The real space size of a detector pixel.
+    pixel_sizes: Tuple[float, float]
+    #: The distance between the detector and the sample.
+    sample_detector_separation: float
+    #: The thickness of the sample material.
+    sample_thickness: float
+
+
+def _read_measurement(dataset: Dataset, num_frames: int, scale: float = 1.0) -> ndarray:
+    values = asarray(dataset).reshape(-1) * scale
+    if values.size not in (1, num_frames):
+        raise ValueError(
+            f"Measurement {dataset.name} of size {values.size} does not match "
+            f"{num_frames} frames."
+        )
+    return values
+
+
+def read_nexus_frames(
+    path: NexusPath, layout: NexusLayout = NexusLayout()
+) -> FrameChunk:
+    """Reads the frames of a NeXus file, alongside their per-frame measurements.
+
+    Frames of any number of leading scan dimensions are flattened into a single stack,
+    with the count times, incident flux and transmitted flux flattened to match and
+    the flux scaled to counts.
+
+    Args:
+        path: The path of the NeXus file.
+        layout: The locations of the datasets within the file. Defaults to the layout
+            of the I22 Pilatus 2M WAXS detector.
+
+    Returns:
+        The stack of frames, alongside their count times, incident flux and
+        transmitted flux.
+    """
+    with File(path, "r") as file:
+        frames = asarray(file[layout.frames])
+        num_frames = prod(frames.shape[:-2])
+        return FrameChunk(
+            frames.reshape(num_frames, *frames.shape[-2:]),
+            _read_measurement(file[layout.count_times], num_frames),
+            _read_measurement(
+                file[layout.incident_flux], num_frames, layout.incident_flux_scale
+            ),
+            _read_measurement(
+                file[layout.transmitted_flux],
+                num_frames,
+                layout.transmitted_flux_scale,
+            ),
+        )
+
+
+def read_nexus_detector(
+    path: NexusPath, layout: NexusLayout = NexusLayout()
+) -> NexusDetector:
+    """Reads the detector setup recorded in a NeXus file.
+
+    Args:
+        path: The path of the NeXus file.
+        layout: The locations of the datasets within the file. Defaults to the layout
+            of the I22 Pilatus 2M WAXS detector.
+
+    Returns:
+        The mask, beam center, pixel sizes and distance of the detector, alongside the
+        thickness of the sample.
+    """
+    with File(path, "r") as file:
+        return NexusDetector(
+            asarray(file[layout.mask]).astype(bool_),
+            (
+                asarray(file[layout.beam_center_y]).item(),
+                asarray(file[layout.beam_center_x]).item(),
+            ),
+            (
+                asarray(file[layout.x_pixel_size]).item(),
+                asarray(file[layout.y_pixel_size]).item(),
+            ),
+            asarray(file[layout.distance]).item(),
+            asarray(file[layout.sample_thickness]).item()
+            * layout.sample_thickness_scale,
+        )
+
+
+#: The size of the chunk cache used by HDF5 unless otherwise specified.
+DEFAULT_CACHE_BYTES = 1024**2
+
+
+def _next_prime(value: int) -> int:
+    candidate = max(value, 2)
+    while any(
+        candidate % divisor == 0 for divisor in range(2, int(candidate**0.5) + 1)
+    ):
+        candidate += 1
+    return candidate
+
+
+def _slice_measurement(values: ndarray, start: int, stop: int) -> ndarray:
+    return values if values.size == 1 else values[start:stop]
+
+
+@dataclass(frozen=True)
+class NexusFrameSource:
+    """A stack of frames in a NeXus file, read lazily in chunks of consecutive frames.
+
+    Frames are read in chunks aligned to the chunk layout of the dataset, such that
+    each chunk of the dataset is read and decompressed once, and are yielded
+    alongside the count times, incident flux and transmitted flux of those frames.
+    Frames of any number of leading scan dimensions are yielded in row-major order,
+    matching the order of read_nexus_frames, such that a source may be passed to the
+    streaming sequences in place of a list of chunks. The file is opened anew for
+    each iteration, so a source may be iterated any number of times.
+    """
+
+    #: The path of the NeXus file.
+    path: NexusPath
+    #: The locations of the datasets within the file.
+    layout: NexusLayout = NexusLayout()
+    #: The minimum number of frames in each chunk, rounded up to a whole number of
+    #: dataset chunks along the last scan dimension. If None, each chunk spans a single
+    #: dataset chunk.
+    frames_per_chunk: Optional[int] = None
+    #: The size of the HDF5 chunk cache in bytes. If None, the cache is sized to hold
+    #: every dataset chunk touched by a single chunk of frames, or every dataset chunk
+    #: along the last scan dimension where dataset chunks span several earlier scan
+    #: indices, such that such dataset chunks are not read again.
+    cache_bytes: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        """Validates the chunking and cache size of the source."""
+        if self.frames_per_chunk is not None and self.frames_per_chunk <= 0:
+            raise ValueError("Frames per chunk must be positive.")
+        if self.cache_bytes is not None and self.cache_bytes < 0:
+            raise ValueError("Cache size must not be negative.")
+
+    def _dataset_properties(
+        self,
+    ) -> Tuple[Tuple[int, ...], Optional[Tuple[int, ...]], int]:
+        with File(self.path, "r") as file:
+            dataset = file[self.layout.frames]
+            return dataset.shape, dataset.chunks, dataset.dtype.itemsize
+
+    @property
+    def num_frames(self) -> int:
+        """The number of frames in the source, across all scan dimensions."""
+        return prod(self._dataset_properties()[0][:-2])
+
+    @property
+    def frame_shape(self) -> Tuple[int, int]:
+        """The shape of a single frame."""
+        height, width = self._dataset_properties()[0][-2:]
+        return height, width
+
+    def __iter__(self) -> Iterator[FrameChunk]:
+        """Reads the frames of the source in chunks of consecutive frames.
+
+        Yields:
+            Consecutive chunks of frames, alongside their count times, incident flux
+            and transmitted flux.
+        """
+        shape, chunks, itemsize = self._dataset_properties()
+        scan_shape, frame_shape = shape[:-2] or (1,), shape[-2:]
+        num_frames = prod(scan_shape)
+        scan_chunk = chunks[len(scan_shape) - 1] if chunks and shape[:-2] else 1
+        step = ceil((self.frames_per_chunk or 1) / scan_chunk) * scan_chunk
+        cached_chunks = 1
+        if chunks is not None:
+            frame_chunks = prod(
+                ceil(extent / chunk) for extent, chunk in zip(frame_shape, chunks[-2:])
+            )
+            spans_scan_indices = any(
+                chunk > 1 for chunk in chunks[: max(len(shape) - 3, 0)]
+            )
+            cached_chunks = frame_chunks * (
+                ceil(scan_shape[-1] / scan_chunk)
+                if spans_scan_indices
+                else step // scan_chunk
+            )
+        cache_bytes = (
+            max(DEFAULT_CACHE_BYTES, cached_chunks * prod(chunks or ()) * itemsize)
+            if self.cache_bytes is None
+            else self.cache_bytes
+        )
+        with File(
+            self.path,
+            "r",
+            rdcc_nbytes=cache_bytes,
+            rdcc_nslots=_next_prime(100 * cached_chunks),
+            rdcc_w0=1.0,
+        ) as file:
+            frames = file[self.layout.frames]
+            count_times = _read_measurement(file[self.layout.count_times], num_frames)
+            incident_flux = _read_measurement(
+                file[self.layout.incident_flux],
+                num_frames,
+                self.layout.incident_flux_scale,
+            )
+            transmitted_flux = _read_measurement(
+                file[self.layout.transmitted_flux],
+                num_frames,
+                self.layout.transmitted_flux_scale,
+            )
+            offset = 0
+            for outer in ndindex(*scan_shape[:-1]):
+                for start in range(0, scan_shape[-1], step):
+                    stop = min(start + step, scan_shape[-1])
+                    chunk = frames[(*outer, slice(start, stop)) if shape[:-2] else ()]
+                    count = stop - start
+                    yield FrameChunk(
+                        chunk.reshape(count, *frame_shape),
+                        _slice_measurement(count_times, offset, offset + count),
+                        _slice_measurement(incident_flux, offset, offset + count),
+                        _slice_measurement(transmitted_flux, offset, offset + count),
+                    )
+                    offset += count
+
+
+def _compress_chunk(chunk: ndarray, level: int, shuffle: bool) -> bytes:
+    # Matches the HDF5 shuffle and deflate filters, such that the compressed chunk may
+    # be written directly and decoded by any reader
+    if shuffle:
+        chunk = chunk.view(uint8).reshape(-1, chunk.itemsize).T
+    return compress(ascontiguousarray(chunk).data, level)
+
+
+class _ChunkedDataset:
+    """A resizable dataset to which frames are appended, in chunks if compressed."""
+
+    def __init__(
+        self,
+        dataset: Dataset,
+        compress_chunk: Optional[Callable[[ndarray], bytes]],
+        executor: Optional[ThreadPoolExecutor],
+    ) -> None:
+        self.dataset = dataset
+        self.compress_chunk = compress_chunk
+        self.executor = executor
+        self.pending: Optional[ndarray] = None
+        self.num_written = 0
+
+    def append(self, frames: ndarray) -> None:
+        if self.compress_chunk is None:
+            self.dataset.resize(self.num_written + len(frames), axis=0)
+            self.dataset[self.num_written :] = frames
+            self.num_written += len(frames)
+            return
+        if self.pending is not None:
+            frames = concatenate([self.pending, frames])
+        complete = len(frames) // self.dataset.chunks[0] * self.dataset.chunks[0]
+        self.pending = frames[complete:] if complete < len(frames) else None
+        self._write_chunks(frames[:complete])
+
+    def flush(self) -> None:
+        if self.pending is not None:
+            self._write_chunks(self.pending)
+            self.pending = None
+        self.dataset.flush()
+
+    def _write_chunks(self, frames: ndarray) -> None:
+        if len(frames) == 0 or self.compress_chunk is None:
+            return
+        chunk_shape = self.dataset.chunks
+        offsets = list(
+            product(
+                *(
+                    range(0, extent, size)
+                    for extent, size in zip(frames.shape, chunk_shape)
+                )
+            )
+        )
+        chunks = []
+        for offset in offsets:
+            # Chunks are stored whole, with the parts beyond the dataset extent ignored
+            block = frames[
+                tuple(
+                    slice(start, start + size)
+                    for start, size in zip(offset, chunk_shape)
+                )
+            ]
+            chunk = zeros(chunk_shape, dtype=self.dataset.dtype)
+            chunk[tuple(slice(0, size) for size in block.shape)] = block
+            chunks.append(chunk)
+        compressed = (
+            map(self.compress_chunk, chunks)
+            if self.executor is None
+            else self.executor.map(self.compress_chunk, chunks)
+        )
+        self.dataset.resize(self.num_written + len(frames), axis=0)
+        for (frame, row, column), data in zip(offsets, compressed):
+            self.dataset.id.write_direct_chunk(
+                (self.num_written + frame, row, column), data
+            )
+        self.num_written += len(frames)
+
+
+class NexusFrameSink:
+    """Writes stacks of frames incrementally to a chunked dataset of a NeXus file.
+
+    Frames are appended to a dataset which grows along its first dimension as each
+    stack is written, alongside the mask of each frame, such that corrected frames may
+    be written as they are yielded by the streaming sequences, for instance by passing
+    the write method of a sink to adcorr.utils.pipeline.write_behind. Where compressed,
+    frames are gathered into whole chunks which are compressed by a pool of threads
+    and written directly, bypassing the single threaded filter pipeline of HDF5 whilst
+    remaining readable by any reader supporting the deflate and shuffle filters. The
+    frames of the final partial chunk are written once the sink is closed.
+
+    Where written in single writer multiple reader (SWMR) mode, the datasets are
+    flushed after each write, and readers opening the file in SWMR mode see each
+    frame once it has been written in full.
+    """
+
+    def __init__(
+        self,
+        path: NexusPath,
+        data: str = "entry/data/data",
+        mask: Optional[str] = "entry/data/mask",
+        chunks: Optional[Tuple[int, int, int]] = None,
+        compression_level: Optional[int] = None,
+        shuffle: bool = True,
+        compression_threads: int = 1,
+        swmr: bool = False,
+        fill_value: float = 0.0,
+    ) -> None:
+        """Creates a NeXus file to which frames are written.
+
+        Args:
+            path: The path of the file, which is replaced if it exists.
+            data: The location of the dataset of frames within the file. Defaults to
+                "entry/data/data".
+            mask: The location of the dataset of frame masks within the file. If None,
+                masks are not written. Defaults to "entry/data/mask".
+            chunks: The shape of each chunk of the datasets, in frames, rows and
+                columns. If None, each chunk holds a single whole frame. Defaults to
+                None.
+            compression_level: The level of deflate compression, from 0 to 9. If
+                None, frames are written uncompressed. Defaults to None.
+            shuffle: Whether the bytes of each chunk are shuffled prior to compression,
+                which typically improves the compression of floating point frames.
+                Defaults to True.
+            compression_threads: The number of threads which compress chunks
+                concurrently. Defaults to 1.
+            swmr: Whether the file is written in SWMR mode, such that it may be read
+                whilst frames are being written. Defaults to False.
+            fill_value: The value written in place of masked pixels. Defaults to 0.
+        """
+        if chunks is not None and (len(chunks) != 3 or min(chunks) <= 0):
+            raise ValueError("Chunks must have three positive dimensions.")
+        if compression_level is not None and not 0 <= compression_level <= 9:
+            raise ValueError("Compression level must be within the interval [0, 9].")
+        if compression_threads <= 0:
+            raise ValueError("Compression threads must be positive.")
+        self.data_path = data
+        self.mask_path = mask
+        self.chunks = chunks
+        self.compression_level = compression_level
+        self.shuffle = shuffle
+        self.swmr = swmr
+        self.fill_value = fill_value
+        self._executor = (
+            ThreadPoolExecutor(compression_threads)
+            if compression_level is not None and compression_threads > 1
+            else None
+        )
+        self._file = File(path, "w", libver="latest" if swmr else None)
+        self._datasets: List[_ChunkedDataset] = []
+
+    @property
+    def num_frames(self) -> int:
+        """The number of frames written to the file."""
+        return self._datasets[0].num_written if self._datasets else 0
+
+    def _create_datasets(self, frame_shape: Tuple[int, int], data_dtype: dtype) -> None:
+        chunks = self.chunks or (1, *frame_shape)
+        paths = [(self.data_path, data_dtype)]
+        if self.mask_path is not None:
+            paths.append((self.mask_path, dtype(bool_)))
+        for path, path_dtype in paths:
+            dataset = self._file.create_dataset(
+                path,
+                shape=(0, *frame_shape),
+                maxshape=(None, *frame_shape),
+                chunks=chunks,
+                dtype=path_dtype,
+                compression=None if self.compression_level is None else "gzip",
+                compression_opts=self.compression_level,
+                shuffle=self.shuffle and self.compression_level is not None,
+            )
+            self._datasets.append(
+                _ChunkedDataset(
+                    dataset,
+                    (
+                        None
+                        if self.compression_level is None
+                        else partial(
+                            _compress_chunk,
+                            level=self.compression_level,
+                            shuffle=self.shuffle,
+                        )
+                    ),
+                    self._executor,
+                )
+            )
+        if self.swmr:
+            self._file.swmr_mode = True
+
+    def write(
+        self, frames: Frames[int, FrameWidth, FrameHeight, dtype[number]]
+    ) -> None:
+        """Appends a stack of frames, and their masks, to the file.
+
+        Args:
+            frames: A stack of frames, which may be masked.
+        """
+        if frames.ndim != 3:
+            raise ValueError("Frames must be written as a stack of frames.")
+        if not self._datasets:
+            self._create_datasets(cast(Tuple[int, int], frames.shape[1:]), frames.dtype)
+        elif frames.shape[1:] != self._datasets[0].dataset.shape[1:]:
+            raise ValueError(
+                f"Frames of shape {frames.shape[1:]} do not match the dataset of frame "
+                f"shape {self._datasets[0].dataset.shape[1:]}."
+            )
+        self._datasets[0].append(filled(frames, self.fill_value))
+        if self.mask_path is not None:
+            self._datasets[1].append(getmaskarray(frames))
+        if self.swmr:
+            for dataset in self._datasets:
+                dataset.dataset.flush()
+
+    def close(self) -> None:
+        """Writes any frames of a partial chunk, then closes the file."""
+        try:
+            for dataset in self._datasets:
+                dataset.flush()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+            self._file.close()
+
+    def __enter__(self) -> "NexusFrameSink":
+        """Returns the sink, which is closed on leaving the context."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Closes the sink, writing any frames of a partial chunk."""
+        self.close()
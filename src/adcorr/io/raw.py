@@ -0,0 +1,71 @@
+from os import PathLike
+from os.path import getsize
+from typing import Optional, Tuple, Union, cast
+
+from numpy import dtype, load, memmap
+from numpy.typing import DTypeLike
+
+#: A path to a frame file on disk
+FramePath = Union[str, PathLike]
+
+
+def open_npy_frames(path: FramePath) -> memmap:
+    """Opens the stack of frames held in a .npy file as a read-only memory map.
+
+    Args:
+        path: The path of the .npy file.
+
+    Returns:
+        A memory mapped stack of frames, or a single frame, which is read from disk as
+        it is accessed.
+    """
+    frames = load(path, mmap_mode="r")
+    if frames.ndim < 2:
+        raise ValueError(f"Array of shape {frames.shape} does not hold frames.")
+    return frames
+
+
+def open_raw_frames(
+    path: FramePath,
+    frame_shape: Tuple[int, int],
+    frame_dtype: DTypeLike,
+    header_bytes: int = 0,
+    frame_header_bytes: int = 0,
+    num_frames: Optional[int] = None,
+) -> memmap:
+    """Opens the stack of frames held in a raw binary file as a read-only memory map.
+
+    Frames are taken to be stored consecutively in row-major order, following a header
+    at the start of the file, with each frame optionally preceded by a header of its
+    own. Where frames have headers, the memory map is a strided view of the frames
+    alone.
+
+    Args:
+        path: The path of the raw binary file.
+        frame_shape: The shape of a single frame.
+        frame_dtype: The type of each pixel, including its byte order.
+        header_bytes: The number of bytes preceding the first frame. Defaults to 0.
+        frame_header_bytes: The number of bytes preceding each frame. Defaults to 0.
+        num_frames: The number of frames in the file. If None, the number of frames is
+            inferred from the size of the file, which must hold a whole number of
+            frames. Defaults to None.
+
+    Returns:
+        A memory mapped stack of frames, which is read from disk as it is accessed.
+    """
+    if header_bytes < 0 or frame_header_bytes < 0:
+        raise ValueError("Header sizes must not be negative.")
+    record = dtype(
+        [("header", f"V{frame_header_bytes}"), ("frame", frame_dtype, frame_shape)]
+        if frame_header_bytes
+        else [("frame", frame_dtype, frame_shape)]
+    )
+    if num_frames is None:
+        num_frames, remainder = divmod(getsize(path) - header_bytes, record.itemsize)
+        if remainder != 0 or num_frames < 0:
+            raise ValueError(
+                f"File of {getsize(path)} bytes does not hold a whole number of frames "
+                f"of {record.itemsize} bytes after a header of {header_bytes} bytes."
+            )
+    records = memmap(path, record, "r", header_bytes, (num_frames,))
+    return cast(memmap, records["frame"])
@@ -1,11 +1,27 @@
 from .pauw import (
+    pauw_averaged_background_sequence,
+    pauw_background_subtracted_sample_sequence,
     pauw_dispersed_sample_sequence,
     pauw_instrumental_background_sequence,
     pauw_simple_sample_sequence,
 )
+from .streaming import (
+    FrameChunk,
+    chunk_frames,
+    stream_pauw_dispersed_sample_sequence,
+    stream_pauw_instrumental_background_sequence,
+    stream_pauw_simple_sample_sequence,
+)
 
 __all__ = [
     "pauw_instrumental_background_sequence",
+    "pauw_averaged_background_sequence",
+    "pauw_background_subtracted_sample_sequence",
     "pauw_simple_sample_sequence",
     "pauw_dispersed_sample_sequence",
+    "FrameChunk",
+    "chunk_frames",
+    "stream_pauw_instrumental_background_sequence",
+    "stream_pauw_simple_sample_sequence",
+    "stream_pauw_dispersed_sample_sequence",
 ]
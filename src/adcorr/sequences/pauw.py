@@ -1,23 +1,42 @@
-from typing import TypeVar
+from typing import Any, Optional, Tuple, TypeVar, cast
 
-from numpy import bool_, dtype, floating, ndarray, number
+from numpy import (
+    atleast_1d,
+    bool_,
+    broadcast_to,
+    divide,
+    dtype,
+    empty,
+    expand_dims,
+    float64,
+    floating,
+    int_,
+    ndarray,
+    newaxis,
+    number,
+    ones_like,
+    stack,
+    subtract,
+    unique,
+    zeros,
+    zeros_like,
+)
+from numpy.ma import MaskedArray, getdata, getmaskarray, masked_where
 
 from ..corrections import (
-    average_all_frames,
-    correct_angular_efficiency,
-    correct_dark_current,
+    CorrectionMap,
     correct_deadtime,
     correct_displaced_volume,
-    correct_flatfield,
-    correct_polarization,
     correct_self_absorption,
-    correct_solid_angle,
+    fill_masked_pixels,
     mask_frames,
-    normalize_frame_time,
-    normalize_thickness,
-    normalize_transmitted_flux,
     subtract_background,
 )
+from ..corrections.dark_current import total_dark_current
+from ..corrections.self_absorption import apply_self_absorption
+from ..utils.pixels import ValidPixels
+from ..utils.precision import Precision, as_precision
+from ..utils.tiling import apply_tiled, map_tiles, slice_frame_vector
 from ..utils.typing import (
     Frame,
     FrameHeight,
@@ -28,6 +47,194 @@ from ..utils.typing import (
 )
 
 
+def _subtract_and_scale(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+    offsets: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    scales: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]] = None,
+    precision: Precision = None,
+) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]:
+    """Subtracts a per-frame offset and then multiplies by a per-frame scale.
+
+    Folds the dark current correction and the frame time and transmitted flux
+    normalizations into a single allocation, with the scaling applied in place.
+
+    Args:
+        frames: A stack of frames to be corrected.
+        offsets: The value to be subtracted from each frame.
+        scales: The factor by which each frame is multiplied.
+        out: A stack into which the corrected frames are written. If None, a new stack
+            is allocated. Defaults to None.
+        precision: The floating point type in which the offsets and scales are
+            applied. If None, the type follows the promotion rules of numpy. Defaults
+            to None.
+
+    Returns:
+        The corrected stack of frames.
+    """
+    corrected: Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]] = subtract(
+        as_precision(frames, precision),
+        expand_dims(as_precision(offsets, precision), (1, 2)),
+        out=out,
+    )
+    corrected *= expand_dims(as_precision(scales, precision), (1, 2))
+    return corrected
+
+
+def _fill_masked_pixels(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+    mask: Frame[FrameWidth, FrameHeight, dtype[bool_]],
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]],
+    precision: Precision,
+) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]:
+    """Fills masked pixels, copying floating point frames into the working precision.
+
+    Integer frames are copied in their own type, such that the deadtime correction may
+    gather from its lookup table into the working precision.
+    """
+    if out is None and precision is not None and frames.dtype.kind == "f":
+        out = empty(frames.shape, dtype=precision)
+    return fill_masked_pixels(frames, mask, out=out)
+
+
+def _in_place(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+) -> Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]]:
+    """Selects frames as the output of a correction where they are floating point.
+
+    Integer frames, which may pass through the deadtime correction unchanged, cannot
+    hold corrected values, such that a floating point output is allocated for them.
+    """
+    if frames.dtype.kind != "f":
+        return None
+    return cast(Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]], frames)
+
+
+def _output_mask(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+    mask: Frame[FrameWidth, FrameHeight, dtype[bool_]],
+) -> Frame[FrameWidth, FrameHeight, dtype[bool_]]:
+    if isinstance(frames, MaskedArray):
+        return mask | getmaskarray(frames)
+    return mask
+
+
+def _compact_mask(
+    mask: Frame[FrameWidth, FrameHeight, dtype[bool_]],
+    valid_pixels: Optional[ValidPixels],
+) -> Frame[FrameWidth, FrameHeight, dtype[bool_]]:
+    if valid_pixels is None:
+        return mask
+    return zeros((1, valid_pixels.num_valid), dtype=bool_)
+
+
+def _compact_correction_map(
+    correction_map: CorrectionMap, valid_pixels: Optional[ValidPixels]
+) -> CorrectionMap:
+    if valid_pixels is None or correction_map.factors.shape != valid_pixels.frame_shape:
+        return correction_map
+    return CorrectionMap(valid_pixels.gather_map(correction_map.factors))
+
+
+def _correct_self_absorption(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+    incident_flux: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    transmitted_flux: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    beam_center_pixels: tuple[float, float],
+    pixel_sizes: tuple[float, float],
+    sample_detector_separation: float,
+    valid_pixels: Optional[ValidPixels],
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]] = None,
+    precision: Precision = None,
+) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]:
+    if valid_pixels is None:
+        corrected = correct_self_absorption(
+            frames,
+            incident_flux,
+            transmitted_flux,
+            beam_center_pixels,
+            pixel_sizes,
+            sample_detector_separation,
+            out,
+            precision=precision,
+        )
+    else:
+        corrected = apply_self_absorption(
+            frames,
+            cast(
+                Frame[FrameWidth, FrameHeight, dtype[floating]],
+                valid_pixels.scattering_secants(
+                    beam_center_pixels, pixel_sizes, sample_detector_separation
+                ),
+            ),
+            incident_flux,
+            transmitted_flux,
+            out,
+            precision=precision,
+        )
+    # The correction divides by the transmission, such that the result is floating
+    return cast(Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]], corrected)
+
+
+def _instrumental_background(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+    mask: Frame[FrameWidth, FrameHeight, dtype[bool_]],
+    count_times: ndarray[VectorOrSingle[NumFrames], dtype[floating]],
+    incident_flux: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    transmitted_flux: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    minimum_pulse_separation: float,
+    minimum_arrival_separation: float,
+    base_dark_current: float,
+    temporal_dark_current: float,
+    flux_dependant_dark_current: float,
+    beam_center_pixels: tuple[float, float],
+    pixel_sizes: tuple[float, float],
+    sample_detector_separation: float,
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]],
+    valid_pixels: Optional[ValidPixels],
+    precision: Precision,
+) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]:
+    """Applies the instrumental background corrections with deferred masking.
+
+    Masked pixels are filled with zeros in a copy of the frames, such that each
+    correction is applied in place to a plain array, leaving the mask to be applied
+    once all corrections are complete.
+    """
+    frames = _fill_masked_pixels(frames, mask, out, precision)
+    frames = correct_deadtime(
+        frames,
+        count_times,
+        minimum_pulse_separation,
+        minimum_arrival_separation,
+        _in_place(frames),
+        precision,
+    )
+    frames = _subtract_and_scale(
+        frames,
+        total_dark_current(
+            count_times,
+            transmitted_flux,
+            base_dark_current,
+            temporal_dark_current,
+            flux_dependant_dark_current,
+        ),
+        1.0 / (atleast_1d(count_times) * atleast_1d(transmitted_flux)),
+        _in_place(frames),
+        precision,
+    )
+    return _correct_self_absorption(
+        frames,
+        incident_flux,
+        transmitted_flux,
+        beam_center_pixels,
+        pixel_sizes,
+        sample_detector_separation,
+        valid_pixels,
+        frames,
+        precision,
+    )
+
+
 def pauw_instrumental_background_sequence(
     frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
     mask: Frame[FrameWidth, FrameHeight, dtype[bool_]],
@@ -42,6 +249,11 @@ def pauw_instrumental_background_sequence(
     beam_center_pixels: tuple[float, float],
     pixel_sizes: tuple[float, float],
     sample_detector_separation: float,
+    tile_size: Optional[int] = None,
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]] = None,
+    valid_pixels: Optional[ValidPixels] = None,
+    precision: Precision = None,
+    workers: Optional[int] = None,
 ) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]:
     """Applies a sequence of corrections to correct for instrumental background.
 
@@ -68,37 +280,472 @@ def pauw_instrumental_background_sequence(
             flux.
         beam_center_pixels: The center position of the beam in pixels.
         pixel_sizes: The real space size of a detector pixel.
+        sample_detector_separation: The distance between the detector and the sample.
+        tile_size: The maximum number of frames to which the sequence is applied at
+            once. If given, the whole sequence is evaluated for each tile of frames in
+            turn, with results written into a single output stack, such that
+            intermediate allocations are bounded by the tile size. If None, each
+            correction is applied to the whole stack. Defaults to None.
+        out: A stack into which the corrected frames are written, which may be the
+            frames themselves to correct in place. If None, a new stack is allocated.
+            Defaults to None.
+        valid_pixels: The valid pixels of the detector. If given, each stack of frames
+            must be a compact stack produced by its gather method, the corrections are
+            applied to the valid pixels alone and the result is returned as a compact
+            stack, to be scattered into full frames on request. The mask is taken to be
+            that of the valid pixels. If None, frames are corrected in full. Defaults
+            to None.
+        precision: The floating point type in which the corrections are evaluated and
+            the corrected frames are returned, with reductions accumulated in double
+            precision. If None, the type follows the promotion rules of numpy. Defaults
+            to None.
+        workers: The number of threads by which tiles of frames are corrected
+            concurrently, with results identical to those of serial correction. If
+            None, tiles are corrected serially. Has no effect unless a tile size is
+            given. Defaults to None.
 
     Returns:
         The corrected stack of frames.
     """
-    frames = mask_frames(frames, mask)
-    frames = correct_deadtime(
-        frames, count_times, minimum_pulse_separation, minimum_arrival_separation
+
+    def correct(
+        frames: Frames[Any, FrameWidth, FrameHeight, dtype[number]],
+        tile: slice,
+        out: Optional[Frames[Any, FrameWidth, FrameHeight, dtype[floating]]] = None,
+    ) -> Frames[Any, FrameWidth, FrameHeight, dtype[floating]]:
+        return _instrumental_background(
+            frames,
+            mask,
+            slice_frame_vector(count_times, tile),
+            slice_frame_vector(incident_flux, tile),
+            slice_frame_vector(transmitted_flux, tile),
+            minimum_pulse_separation,
+            minimum_arrival_separation,
+            base_dark_current,
+            temporal_dark_current,
+            flux_dependant_dark_current,
+            beam_center_pixels,
+            pixel_sizes,
+            sample_detector_separation,
+            out,
+            valid_pixels,
+            precision,
+        )
+
+    mask = _compact_mask(mask, valid_pixels)
+    corrected = (
+        apply_tiled(correct, frames, tile_size, out, workers)
+        if tile_size is not None
+        else correct(frames, slice(None), out)
     )
-    frames = correct_dark_current(
-        frames,
-        count_times,
-        transmitted_flux,
+    return mask_frames(corrected, _output_mask(frames, mask), corrected)
+
+
+def _correct_sample(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+    *,
+    background: Frame[FrameWidth, FrameHeight, dtype[number]],
+    mask: Frame[FrameWidth, FrameHeight, dtype[bool_]],
+    count_times: ndarray[VectorOrSingle[NumFrames], dtype[floating]],
+    incident_flux: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    transmitted_flux: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    minimum_pulse_separation: float,
+    minimum_arrival_separation: float,
+    base_dark_current: float,
+    temporal_dark_current: float,
+    flux_dependant_dark_current: float,
+    beam_center_pixels: tuple[float, float],
+    pixel_sizes: tuple[float, float],
+    sample_detector_separation: float,
+    correction_map: CorrectionMap,
+    tile_size: Optional[int] = None,
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]] = None,
+    valid_pixels: Optional[ValidPixels] = None,
+    precision: Precision = None,
+    workers: Optional[int] = None,
+) -> MaskedArray[Tuple[NumFrames, FrameWidth, FrameHeight], dtype[floating]]:
+    """Corrects sample frames, before any dispersant is subtracted."""
+
+    def correct(
+        frames: Frames[Any, FrameWidth, FrameHeight, dtype[number]],
+        tile: slice,
+        out: Optional[Frames[Any, FrameWidth, FrameHeight, dtype[floating]]] = None,
+    ) -> Frames[Any, FrameWidth, FrameHeight, dtype[floating]]:
+        corrected = _instrumental_background(
+            frames,
+            mask,
+            slice_frame_vector(count_times, tile),
+            slice_frame_vector(incident_flux, tile),
+            slice_frame_vector(transmitted_flux, tile),
+            minimum_pulse_separation,
+            minimum_arrival_separation,
+            base_dark_current,
+            temporal_dark_current,
+            flux_dependant_dark_current,
+            beam_center_pixels,
+            pixel_sizes,
+            sample_detector_separation,
+            out,
+            valid_pixels,
+            precision,
+        )
+        subtract_background(corrected, getdata(background), corrected, precision)
+        return correction_map.apply(corrected, corrected, precision)
+
+    corrected = (
+        apply_tiled(correct, frames, tile_size, out, workers)
+        if tile_size is not None
+        else correct(frames, slice(None), out)
+    )
+    return mask_frames(
+        corrected,
+        _output_mask(frames, mask) | getmaskarray(background),
+        corrected,
+    )
+
+
+#: The number of background frames in a stack of frames
+NumBackgrounds = TypeVar("NumBackgrounds", bound=int)
+
+
+def _average_instrumental_background(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+    mask: Frame[FrameWidth, FrameHeight, dtype[bool_]],
+    count_times: ndarray[VectorOrSingle[NumFrames], dtype[floating]],
+    incident_flux: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    transmitted_flux: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    minimum_pulse_separation: float,
+    minimum_arrival_separation: float,
+    base_dark_current: float,
+    temporal_dark_current: float,
+    flux_dependant_dark_current: float,
+    beam_center_pixels: tuple[float, float],
+    pixel_sizes: tuple[float, float],
+    sample_detector_separation: float,
+    tile_size: Optional[int],
+    valid_pixels: Optional[ValidPixels],
+    precision: Precision,
+    workers: Optional[int],
+) -> Frame[FrameWidth, FrameHeight, dtype[floating]]:
+    """Averages the instrumental background sequence, reducing prior to correction.
+
+    Every correction following deadtime is affine in each frame, with coefficients
+    which are scalar per frame, bar the self absorption correction which depends only
+    upon the transmissibility of the frame. As such, the frames of each tile are
+    reduced to a weighted sum for each distinct transmissibility within the tile
+    directly after deadtime correction, such that the self absorption correction is
+    applied once per distinct transmissibility of each tile rather than once per frame,
+    and the corrected sums of each tile are accumulated into a single frame. Memory
+    usage is thus bounded by the tile size, however many distinct transmissibilities
+    the stack holds. Pixels masked in a frame do not contribute to the
+    average of that pixel. Frames are corrected in the working precision, whilst the
+    sums are accumulated in double precision.
+    """
+    frames = frames.reshape(-1, *frames.shape[-2:])
+    num_frames = frames.shape[0]
+    count_times = atleast_1d(count_times)
+    per_frame = (num_frames,)
+    offsets = broadcast_to(
+        total_dark_current(
+            count_times,
+            transmitted_flux,
+            base_dark_current,
+            temporal_dark_current,
+            flux_dependant_dark_current,
+        ),
+        per_frame,
+    )
+    scales = broadcast_to(1.0 / (count_times * atleast_1d(transmitted_flux)), per_frame)
+    transmissibilities, groups = unique(
+        broadcast_to(atleast_1d(transmitted_flux / incident_flux), per_frame),
+        return_inverse=True,
+    )
+
+    total = zeros(frames.shape[-2:])
+    counts = zeros(frames.shape[-2:], dtype=int_)
+
+    def reduce(
+        tile: slice,
+    ) -> Tuple[
+        Frame[FrameWidth, FrameHeight, dtype[floating]],
+        Frame[FrameWidth, FrameHeight, dtype[int_]],
+    ]:
+        corrected = _fill_masked_pixels(frames[tile], mask, None, precision)
+        corrected = correct_deadtime(
+            corrected,
+            slice_frame_vector(count_times, tile),
+            minimum_pulse_separation,
+            minimum_arrival_separation,
+            _in_place(corrected),
+            precision,
+        )
+        weighted = _subtract_and_scale(
+            corrected, offsets[tile], scales[tile], _in_place(corrected), precision
+        )
+        valid = ~_output_mask(frames[tile], mask)
+        weighted *= valid
+        tile_groups = unique(groups[tile])
+        sums = stack(
+            [
+                weighted[groups[tile] == group].sum(0, dtype=float64)
+                for group in tile_groups
+            ]
+        )
+        return (
+            _correct_self_absorption(
+                sums,
+                ones_like(tile_groups, dtype=float64),
+                transmissibilities[tile_groups],
+                beam_center_pixels,
+                pixel_sizes,
+                sample_detector_separation,
+                valid_pixels,
+                sums,
+            ).sum(0),
+            valid.sum(0) if valid.ndim == 3 else valid * weighted.shape[0],
+        )
+
+    # Partial sums are accumulated in tile order, such that the average does not
+    # depend upon the order in which concurrent tiles complete
+    for partial_sum, valid_counts in map_tiles(
+        reduce, num_frames, tile_size or max(num_frames, 1), workers
+    ):
+        total += partial_sum
+        counts += valid_counts
+
+    return masked_where(
+        counts == 0,
+        as_precision(
+            divide(total, counts, out=zeros_like(total), where=counts != 0), precision
+        ),
+    )
+
+
+def pauw_averaged_background_sequence(
+    backgrounds: Frames[NumBackgrounds, FrameWidth, FrameHeight, dtype[number]],
+    mask: Frame[FrameWidth, FrameHeight, dtype[bool_]],
+    backgrounds_count_times: ndarray[VectorOrSingle[NumBackgrounds], dtype[floating]],
+    background_incident_flux: ndarray[VectorOrSingle[NumBackgrounds], dtype[number]],
+    background_transmitted_flux: ndarray[VectorOrSingle[NumBackgrounds], dtype[number]],
+    minimum_pulse_separation: float,
+    minimum_arrival_separation: float,
+    base_dark_current: float,
+    temporal_dark_current: float,
+    flux_dependant_dark_current: float,
+    beam_center_pixels: tuple[float, float],
+    pixel_sizes: tuple[float, float],
+    sample_detector_separation: float,
+    tile_size: Optional[int] = None,
+    valid_pixels: Optional[ValidPixels] = None,
+    precision: Precision = None,
+    workers: Optional[int] = None,
+) -> Frame[FrameWidth, FrameHeight, dtype[number]]:
+    """Corrects a stack of background frames for instrumental background and averages.
+
+    Produces the background frame which is subtracted from samples in the simple and
+    dispersed sample sequences, such that it may be computed once and shared between
+    any number of sample stacks captured against the same background.
+    Frames are reduced to their average directly after deadtime correction, with the
+    remaining corrections applied to a single frame per distinct transmissibility
+    within each tile.
+
+    Args:
+        backgrounds: A sequence of background frames, on which the instrumental
+            background corrections should be applied.
+        mask: The boolean mask to apply to each frame.
+        backgrounds_count_times: The period over which photons are counted for each
+            frame in the backgrounds sequence, or a single value which is applied to
+            all frames in the sequence.
+        background_incident_flux: The flux intensity observed upstream of the sample for
+            each frame in the backgrounds sequence.
+        background_transmitted_flux: The flux intensity observed downstream of the
+            sample for each frame in the backgrounds sequence.
+        minimum_pulse_separation: The minimum time difference required between a prior
+            pulse and the current pulse for the current pulse to be recorded correctly.
+        minimum_arrival_separation: The minimum time difference required between the
+            current pulse and a subsequent pulse for the current pulse to be recorded
+            correctly.
+        base_dark_current: The dark current flux, irrespective of time.
+        temporal_dark_current: The dark current flux, as a factor of time.
+        flux_dependant_dark_current: The dark current flux, as a factor of incident
+            flux.
+        beam_center_pixels: The center position of the beam in pixels.
+        pixel_sizes: The real space size of a detector pixel.
+        sample_detector_separation: The distance between the detector and the sample.
+        tile_size: The maximum number of frames to which the corrections are applied
+            at once. If given, each tile of corrected frames is accumulated into the
+            average in turn, such that the corrected stack is never held in memory. If
+            None, the corrections are applied to the whole stack. Defaults to None.
+        valid_pixels: The valid pixels of the detector. If given, each stack of frames
+            must be a compact stack produced by its gather method, the corrections are
+            applied to the valid pixels alone and the result is returned as a compact
+            stack, to be scattered into full frames on request. The mask is taken to be
+            that of the valid pixels. If None, frames are corrected in full. Defaults
+            to None.
+        precision: The floating point type in which the corrections are evaluated and
+            the corrected frames are returned, with reductions accumulated in double
+            precision. If None, the type follows the promotion rules of numpy. Defaults
+            to None.
+        workers: The number of threads by which tiles of frames are corrected
+            concurrently, with results identical to those of serial correction. If
+            None, tiles are corrected serially. Has no effect unless a tile size is
+            given. Defaults to None.
+
+    Returns:
+        The average of the corrected background frames.
+    """
+    return _average_instrumental_background(
+        backgrounds,
+        _compact_mask(mask, valid_pixels),
+        backgrounds_count_times,
+        background_incident_flux,
+        background_transmitted_flux,
+        minimum_pulse_separation,
+        minimum_arrival_separation,
         base_dark_current,
         temporal_dark_current,
         flux_dependant_dark_current,
-    )
-    frames = normalize_frame_time(frames, count_times)
-    frames = normalize_transmitted_flux(frames, transmitted_flux)
-    frames = correct_self_absorption(
-        frames,
-        incident_flux,
-        transmitted_flux,
         beam_center_pixels,
         pixel_sizes,
         sample_detector_separation,
+        tile_size,
+        valid_pixels,
+        precision,
+        workers,
     )
-    return frames
 
 
-#: The number of background frames in a stack of frames
-NumBackgrounds = TypeVar("NumBackgrounds", bound=int)
+def pauw_background_subtracted_sample_sequence(
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+    background: Frame[FrameWidth, FrameHeight, dtype[number]],
+    mask: Frame[FrameWidth, FrameHeight, dtype[bool_]],
+    flatfield: Frame[FrameWidth, FrameHeight, dtype[floating]],
+    frames_count_times: ndarray[VectorOrSingle[NumFrames], dtype[floating]],
+    frames_incident_flux: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    frames_transmitted_flux: ndarray[VectorOrSingle[NumFrames], dtype[number]],
+    minimum_pulse_separation: float,
+    minimum_arrival_separation: float,
+    base_dark_current: float,
+    temporal_dark_current: float,
+    flux_dependant_dark_current: float,
+    beam_center_pixels: tuple[float, float],
+    pixel_sizes: tuple[float, float],
+    sample_detector_separation: float,
+    sensor_absorption_coefficient: float,
+    sample_thickness: float,
+    sensor_thickness: float,
+    beam_polarization: float,
+    tile_size: Optional[int] = None,
+    correction_map: Optional[CorrectionMap] = None,
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]] = None,
+    valid_pixels: Optional[ValidPixels] = None,
+    precision: Precision = None,
+    workers: Optional[int] = None,
+) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]:
+    """Applies the simple sample sequence against a pre-corrected background frame.
+
+    Applies the simple sample sequence, as detailed as Process B in section 2 of 'The
+    modular small-angle X-ray scattering data correction sequence
+    [https://doi.org/10.1107/S1600576717015096], with the background taken to be a
+    frame produced by pauw_averaged_background_sequence.
+
+    Args:
+        frames: A sequence of frames, on which the series of corrections should be
+            applied.
+        background: The averaged and corrected background frame, which should be
+            subtracted from the foreground frames post correction.
+        mask: The boolean mask to apply to each frame.
+        flatfield: The multiplicative flatfield correction to be applied to detector
+            readings.
+        frames_count_times: The period over which photons are counted for each frame in
+            the frames sequence, or a single value which is applied to all frames in
+            the sequence.
+        frames_incident_flux: The flux intensity observed upstream of the sample for
+            each frame in the frames sequence.
+        frames_transmitted_flux: The flux intensity observed downstream of the sample
+            for each frame in the frames sequence.
+        minimum_pulse_separation: The minimum time difference required between a prior
+            pulse and the current pulse for the current pulse to be recorded correctly.
+        minimum_arrival_separation: The minimum time difference required between the
+            current pulse and a subsequent pulse for the current pulse to be recorded
+            correctly.
+        base_dark_current: The dark current flux, irrespective of time.
+        temporal_dark_current: The dark current flux, as a factor of time.
+        flux_dependant_dark_current: The dark current flux, as a factor of incident
+            flux.
+        beam_center_pixels: The center position of the beam in pixels.
+        pixel_sizes: The real space size of a detector pixel.
+        sample_detector_separation: The distance between the detector and the sample.
+        sensor_absorption_coefficient: The coefficient of absorption for a given
+            detector head material at a given photon energy.
+        sample_thickness: The thickness of the sample material.
+        sensor_thickness: The thickness of the detector head material.
+        beam_polarization: The fraction of incident radiation polarized in the
+            horizontal plane, where 0.5 signifies an unpolarized source.
+        tile_size: The maximum number of frames to which the sequence is applied at
+            once. If given, the whole sequence is evaluated for each tile of frames in
+            turn, with results written into a single output stack. If None, each
+            correction is applied to the whole stack. Defaults to None.
+        correction_map: The combined flatfield, angular efficiency, solid angle,
+            polarization and thickness correction, which may be reused between calls
+            with the same instrument setup. If None, it is computed from the
+            corresponding parameters. Defaults to None.
+        out: A stack into which the corrected frames are written, which may be the
+            frames themselves to correct in place. If None, a new stack is allocated.
+            Defaults to None.
+        valid_pixels: The valid pixels of the detector. If given, each stack of frames
+            must be a compact stack produced by its gather method, the corrections are
+            applied to the valid pixels alone and the result is returned as a compact
+            stack, to be scattered into full frames on request. The mask is taken to be
+            that of the valid pixels. If None, frames are corrected in full. Defaults
+            to None.
+        precision: The floating point type in which the corrections are evaluated and
+            the corrected frames are returned, with reductions accumulated in double
+            precision. If None, the type follows the promotion rules of numpy. Defaults
+            to None.
+        workers: The number of threads by which tiles of frames are corrected
+            concurrently, with results identical to those of serial correction. If
+            None, tiles are corrected serially. Has no effect unless a tile size is
+            given. Defaults to None.
+
+    Returns:
+        The corrected stack of frames.
+    """
+    if correction_map is None:
+        correction_map = CorrectionMap.from_parameters(
+            flatfield,
+            beam_center_pixels,
+            pixel_sizes,
+            sample_detector_separation,
+            sensor_absorption_coefficient,
+            sensor_thickness,
+            beam_polarization,
+            sample_thickness,
+            precision,
+            valid_pixels,
+        )
+    return _correct_sample(
+        frames,
+        background=background,
+        mask=_compact_mask(mask, valid_pixels),
+        count_times=frames_count_times,
+        incident_flux=frames_incident_flux,
+        transmitted_flux=frames_transmitted_flux,
+        minimum_pulse_separation=minimum_pulse_separation,
+        minimum_arrival_separation=minimum_arrival_separation,
+        base_dark_current=base_dark_current,
+        temporal_dark_current=temporal_dark_current,
+        flux_dependant_dark_current=flux_dependant_dark_current,
+        beam_center_pixels=beam_center_pixels,
+        pixel_sizes=pixel_sizes,
+        sample_detector_separation=sample_detector_separation,
+        correction_map=_compact_correction_map(correction_map, valid_pixels),
+        tile_size=tile_size,
+        out=out,
+        valid_pixels=valid_pixels,
+        precision=precision,
+        workers=workers,
+    )
 
 
 def pauw_simple_sample_sequence(
@@ -124,6 +771,12 @@ def pauw_simple_sample_sequence(
     sample_thickness: float,
     sensor_thickness: float,
     beam_polarization: float,
+    tile_size: Optional[int] = None,
+    correction_map: Optional[CorrectionMap] = None,
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]] = None,
+    valid_pixels: Optional[ValidPixels] = None,
+    precision: Precision = None,
+    workers: Optional[int] = None,
 ) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]:
     """Applies an ordered sequence of corrections to frames containing a simple sample.
 
@@ -173,16 +826,43 @@ def pauw_simple_sample_sequence(
         sensor_thickness: The thickness of the detector head material.
         beam_polarization: The fraction of incident radiation polarized in the
             horizontal plane, where 0.5 signifies an unpolarized source.
+        tile_size: The maximum number of frames to which the sequence is applied at
+            once. If given, the whole sequence is evaluated for each tile of frames in
+            turn, with results written into a single output stack and backgrounds
+            accumulated into their average, such that intermediate allocations are
+            bounded by the tile size. If None, each correction is applied to the whole
+            stack. Defaults to None.
+        correction_map: The combined flatfield, angular efficiency, solid angle,
+            polarization and thickness correction, which may be reused between calls
+            with the same instrument setup. If None, it is computed from the
+            corresponding parameters. Defaults to None.
+        out: A stack into which the corrected frames are written, which may be the
+            frames themselves to correct in place. If None, a new stack is allocated.
+            Defaults to None.
+        valid_pixels: The valid pixels of the detector. If given, each stack of frames
+            must be a compact stack produced by its gather method, the corrections are
+            applied to the valid pixels alone and the result is returned as a compact
+            stack, to be scattered into full frames on request. The mask is taken to be
+            that of the valid pixels. If None, frames are corrected in full. Defaults
+            to None.
+        precision: The floating point type in which the corrections are evaluated and
+            the corrected frames are returned, with reductions accumulated in double
+            precision. If None, the type follows the promotion rules of numpy. Defaults
+            to None.
+        workers: The number of threads by which tiles of frames are corrected
+            concurrently, with results identical to those of serial correction. If
+            None, tiles are corrected serially. Has no effect unless a tile size is
+            given. Defaults to None.
 
     Returns:
         The corrected stack of frames.
     """
-    frames = pauw_instrumental_background_sequence(
-        frames,
+    background = pauw_averaged_background_sequence(
+        backgrounds,
         mask,
-        frames_count_times,
-        frames_incident_flux,
-        frames_transmitted_flux,
+        backgrounds_count_times,
+        background_incident_flux,
+        background_transmitted_flux,
         minimum_pulse_separation,
         minimum_arrival_separation,
         base_dark_current,
@@ -191,13 +871,19 @@ def pauw_simple_sample_sequence(
         beam_center_pixels,
         pixel_sizes,
         sample_detector_separation,
+        tile_size,
+        valid_pixels,
+        precision,
+        workers,
     )
-    backgrounds = pauw_instrumental_background_sequence(
-        backgrounds,
+    return pauw_background_subtracted_sample_sequence(
+        frames,
+        background,
         mask,
-        backgrounds_count_times,
-        background_incident_flux,
-        background_transmitted_flux,
+        flatfield,
+        frames_count_times,
+        frames_incident_flux,
+        frames_transmitted_flux,
         minimum_pulse_separation,
         minimum_arrival_separation,
         base_dark_current,
@@ -206,36 +892,76 @@ def pauw_simple_sample_sequence(
         beam_center_pixels,
         pixel_sizes,
         sample_detector_separation,
-    )
-    background = average_all_frames(backgrounds)
-    frames = subtract_background(frames, background)
-    frames = correct_flatfield(frames, flatfield)
-    frames = correct_angular_efficiency(
-        frames,
-        beam_center_pixels,
-        pixel_sizes,
-        sample_detector_separation,
         sensor_absorption_coefficient,
+        sample_thickness,
         sensor_thickness,
-    )
-    frames = correct_solid_angle(
-        frames, beam_center_pixels, pixel_sizes, sample_detector_separation
-    )
-    frames = correct_polarization(
-        frames,
-        beam_center_pixels,
-        pixel_sizes,
-        sample_detector_separation,
         beam_polarization,
+        tile_size,
+        correction_map,
+        out,
+        valid_pixels,
+        precision,
+        workers,
     )
-    frames = normalize_thickness(frames, sample_thickness)
-    return frames
 
 
 #: The number of dispersant frames in a stack of frames
 NumDispersants = TypeVar("NumDispersants", bound=int)
 
 
+def _average_dispersant(
+    dispersants: Frames[NumDispersants, FrameWidth, FrameHeight, dtype[number]],
+    *,
+    background: Frame[FrameWidth, FrameHeight, dtype[number]],
+    mask: Frame[FrameWidth, FrameHeight, dtype[bool_]],
+    count_times: ndarray[VectorOrSingle[NumDispersants], dtype[floating]],
+    incident_flux: ndarray[VectorOrSingle[NumDispersants], dtype[number]],
+    transmitted_flux: ndarray[VectorOrSingle[NumDispersants], dtype[number]],
+    minimum_pulse_separation: float,
+    minimum_arrival_separation: float,
+    base_dark_current: float,
+    temporal_dark_current: float,
+    flux_dependant_dark_current: float,
+    beam_center_pixels: tuple[float, float],
+    pixel_sizes: tuple[float, float],
+    sample_detector_separation: float,
+    correction_map: CorrectionMap,
+    displaced_fraction: float,
+    tile_size: Optional[int] = None,
+    valid_pixels: Optional[ValidPixels] = None,
+    precision: Precision = None,
+    workers: Optional[int] = None,
+) -> MaskedArray[Tuple[FrameWidth, FrameHeight], dtype[floating]]:
+    """Averages and corrects dispersant frames, to be subtracted from sample frames."""
+    dispersant = _average_instrumental_background(
+        dispersants,
+        mask,
+        count_times,
+        incident_flux,
+        transmitted_flux,
+        minimum_pulse_separation,
+        minimum_arrival_separation,
+        base_dark_current,
+        temporal_dark_current,
+        flux_dependant_dark_current,
+        beam_center_pixels,
+        pixel_sizes,
+        sample_detector_separation,
+        tile_size,
+        valid_pixels,
+        precision,
+        workers,
+    )
+    # The average is corrected as a stack of one frame, as the corrections expect
+    corrected = correction_map.apply(
+        subtract_background(dispersant[newaxis], background, precision=precision),
+        precision=precision,
+    )
+    return correct_displaced_volume(corrected, displaced_fraction, precision=precision)[
+        0
+    ]
+
+
 def pauw_dispersed_sample_sequence(
     frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
     dispersants: Frames[NumDispersants, FrameWidth, FrameHeight, dtype[number]],
@@ -264,6 +990,12 @@ def pauw_dispersed_sample_sequence(
     sensor_thickness: float,
     beam_polarization: float,
     displaced_fraction: float,
+    tile_size: Optional[int] = None,
+    correction_map: Optional[CorrectionMap] = None,
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, dtype[floating]]] = None,
+    valid_pixels: Optional[ValidPixels] = None,
+    precision: Precision = None,
+    workers: Optional[int] = None,
 ) -> Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]]:
     """Applies a sequence of corrections to frames containing a dispersed sample.
 
@@ -323,19 +1055,55 @@ def pauw_dispersed_sample_sequence(
         beam_polarization: The fraction of incident radiation polarized in the
             horizontal plane, where 0.5 signifies an unpolarized source.
         displaced_fraction: The fraction of solvent displaced by the analyte.
+        tile_size: The maximum number of frames to which the sequence is applied at
+            once. If given, the whole sequence is evaluated for each tile of frames in
+            turn, with results written into a single output stack and backgrounds
+            accumulated into their average, such that intermediate allocations are
+            bounded by the tile size. If None, each correction is applied to the whole
+            stack. Defaults to None.
+        correction_map: The combined flatfield, angular efficiency, solid angle,
+            polarization and thickness correction, which may be reused between calls
+            with the same instrument setup. If None, it is computed from the
+            corresponding parameters. Defaults to None.
+        out: A stack into which the corrected frames are written, which may be the
+            frames themselves to correct in place. If None, a new stack is allocated.
+            Defaults to None.
+        valid_pixels: The valid pixels of the detector. If given, each stack of frames
+            must be a compact stack produced by its gather method, the corrections are
+            applied to the valid pixels alone and the result is returned as a compact
+            stack, to be scattered into full frames on request. The mask is taken to be
+            that of the valid pixels. If None, frames are corrected in full. Defaults
+            to None.
+        precision: The floating point type in which the corrections are evaluated and
+            the corrected frames are returned, with reductions accumulated in double
+            precision. If None, the type follows the promotion rules of numpy. Defaults
+            to None.
+        workers: The number of threads by which tiles of frames are corrected
+            concurrently, with results identical to those of serial correction. If
+            None, tiles are corrected serially. Has no effect unless a tile size is
+            given. Defaults to None.
 
     Returns:
         The corrected stack of frames.
     """
-    frames = pauw_simple_sample_sequence(
-        frames,
+    if correction_map is None:
+        correction_map = CorrectionMap.from_parameters(
+            flatfield,
+            beam_center_pixels,
+            pixel_sizes,
+            sample_detector_separation,
+            sensor_absorption_coefficient,
+            sensor_thickness,
+            beam_polarization,
+            sample_thickness,
+            precision,
+            valid_pixels,
+        )
+    correction_map = _compact_correction_map(correction_map, valid_pixels)
+    background = pauw_averaged_background_sequence(
         backgrounds,
         mask,
-        flatfield,
-        frame_count_times,
         background_count_times,
-        frames_incident_flux,
-        frames_transmitted_flux,
         background_incident_flux,
         background_transmitted_flux,
         minimum_pulse_separation,
@@ -346,36 +1114,56 @@ def pauw_dispersed_sample_sequence(
         beam_center_pixels,
         pixel_sizes,
         sample_detector_separation,
-        sensor_absorption_coefficient,
-        sample_thickness,
-        sensor_thickness,
-        beam_polarization,
+        tile_size,
+        valid_pixels,
+        precision,
+        workers,
     )
-    dispersants = pauw_simple_sample_sequence(
+    mask = _compact_mask(mask, valid_pixels)
+    frames = _correct_sample(
+        frames,
+        background=background,
+        mask=mask,
+        count_times=frame_count_times,
+        incident_flux=frames_incident_flux,
+        transmitted_flux=frames_transmitted_flux,
+        minimum_pulse_separation=minimum_pulse_separation,
+        minimum_arrival_separation=minimum_arrival_separation,
+        base_dark_current=base_dark_current,
+        temporal_dark_current=temporal_dark_current,
+        flux_dependant_dark_current=flux_dependant_dark_current,
+        beam_center_pixels=beam_center_pixels,
+        pixel_sizes=pixel_sizes,
+        sample_detector_separation=sample_detector_separation,
+        correction_map=correction_map,
+        tile_size=tile_size,
+        out=out,
+        valid_pixels=valid_pixels,
+        precision=precision,
+        workers=workers,
+    )
+    dispersant = _average_dispersant(
         dispersants,
-        backgrounds,
-        mask,
-        flatfield,
-        dispersant_count_times,
-        background_count_times,
-        dispersant_incident_flux,
-        dispersant_transmitted_flux,
-        background_incident_flux,
-        background_transmitted_flux,
-        minimum_pulse_separation,
-        minimum_arrival_separation,
-        base_dark_current,
-        temporal_dark_current,
-        flux_dependant_dark_current,
-        beam_center_pixels,
-        pixel_sizes,
-        sample_detector_separation,
-        sensor_absorption_coefficient,
-        sample_thickness,
-        sensor_thickness,
-        beam_polarization,
+        background=background,
+        mask=mask,
+        count_times=dispersant_count_times,
+        incident_flux=dispersant_incident_flux,
+        transmitted_flux=dispersant_transmitted_flux,
+        minimum_pulse_separation=minimum_pulse_separation,
+        minimum_arrival_separation=minimum_arrival_separation,
+        base_dark_current=base_dark_current,
+        temporal_dark_current=temporal_dark_current,
+        flux_dependant_dark_current=flux_dependant_dark_current,
+        beam_center_pixels=beam_center_pixels,
+        pixel_sizes=pixel_sizes,
+        sample_detector_separation=sample_detector_separation,
+        correction_map=correction_map,
+        displaced_fraction=displaced_fraction,
+        tile_size=tile_size,
+        valid_pixels=valid_pixels,
+        precision=precision,
+        workers=workers,
     )
-    dispersants = correct_displaced_volume(dispersants, displaced_fraction)
-    dispersant = average_all_frames(dispersants)
-    frames = subtract_background(frames, dispersant)
+    subtract_background(getdata(frames), getdata(dispersant), getdata(frames))
+    frames.mask |= getmaskarray(dispersant)
     return frames
@@ -0,0 +1,424 @@
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple, cast
+
+from numpy import bool_, dtype, floating, ndarray, ndindex, number
+
+from ..corrections import (
+    CorrectionMap,
+    FrameAccumulator,
+    correct_displaced_volume,
+    subtract_background,
+)
+from ..utils.pipeline import prefetch
+from ..utils.precision import Precision
+from ..utils.tiling import frame_tiles, slice_frame_vector
+from ..utils.typing import (
+    Frame,
+    FrameHeight,
+    Frames,
+    FrameWidth,
+)
+from .pauw import _correct_sample, pauw_instrumental_background_sequence
+
+
+class FrameChunk(NamedTuple):
+    """A chunk of consecutive frames, alongside their per-frame measurements."""
+
+    #: A stack of consecutive frames.
+    frames: Frames
+    #: The period over which photons are counted for each frame in the chunk, or a
+    #: single value which applies to all frames in the chunk.
+    count_times: ndarray
+    #: The flux intensity observed upstream of the sample for each frame in the chunk.
+    incident_flux: ndarray
+    #: The flux intensity observed downstream of the sample for each frame in the chunk.
+    transmitted_flux: ndarray
+
+
+def chunk_frames(
+    frames: Frames[int, FrameWidth, FrameHeight, dtype[number]],
+    count_times: ndarray,
+    incident_flux: ndarray,
+    transmitted_flux: ndarray,
+    chunk_size: int,
+) -> Iterator[FrameChunk]:
+    """Partitions a stack of frames into chunks of consecutive frames.
+
+    Each chunk holds a view of the frames, such that the frames of a memory mapped
+    stack are read from disk only as each chunk is corrected. Frames of any number of
+    leading scan dimensions are yielded in row-major order without being reshaped into
+    a single stack, which would copy a stack with incompatible strides, with chunks
+    taken along the last scan dimension. The count times, incident flux and transmitted
+    flux are sliced alongside the frames, where given for each frame.
+
+    Args:
+        frames: A stack of frames, or a single frame.
+        count_times: The period over which photons are counted for each frame, or a
+            single value which applies to all frames.
+        incident_flux: The flux intensity observed upstream of the sample for each
+            frame, or a single value which applies to all frames.
+        transmitted_flux: The flux intensity observed downstream of the sample for each
+            frame, or a single value which applies to all frames.
+        chunk_size: The maximum number of frames in each chunk.
+
+    Yields:
+        Consecutive chunks of frames, alongside their count times, incident flux and
+        transmitted flux.
+    """
+    stacks = frames[None] if frames.ndim == 2 else frames
+    offset = 0
+    for outer in ndindex(*stacks.shape[:-3]):
+        stack = stacks[outer]
+        for tile in frame_tiles(stack.shape[0], chunk_size):
+            frame_slice = slice(offset + tile.start, offset + tile.stop)
+            yield FrameChunk(
+                stack[tile],
+                slice_frame_vector(count_times, frame_slice),
+                slice_frame_vector(incident_flux, frame_slice),
+                slice_frame_vector(transmitted_flux, frame_slice),
+            )
+        offset += stack.shape[0]
+
+
+def _prefetched(chunks: Iterable[FrameChunk], depth: int) -> Iterable[FrameChunk]:
+    return chunks if depth == 0 else prefetch(chunks, depth)
+
+
+def _average_chunks(
+    stacks: Iterable[Frames[int, FrameWidth, FrameHeight, dtype[number]]],
+) -> Frame[FrameWidth, FrameHeight, dtype[floating]]:
+    accumulator: Optional[FrameAccumulator] = None
+    for frames in stacks:
+        if accumulator is None:
+            accumulator = FrameAccumulator(cast(Tuple[int, int], frames.shape[-2:]))
+        accumulator.update(frames)
+    if accumulator is None:
+        raise ValueError("At least one frame must be supplied.")
+    return cast(Frame[FrameWidth, FrameHeight, dtype[floating]], accumulator.mean)
+
+
+def stream_pauw_instrumental_background_sequence(
+    chunks: Iterable[FrameChunk],
+    mask: Frame[FrameWidth, FrameHeight, dtype[bool_]],
+    minimum_pulse_separation: float,
+    minimum_arrival_separation: float,
+    base_dark_current: float,
+    temporal_dark_current: float,
+    flux_dependant_dark_current: float,
+    beam_center_pixels: tuple[float, float],
+    pixel_sizes: tuple[float, float],
+    sample_detector_separation: float,
+    precision: Precision = None,
+    prefetch_depth: int = 0,
+) -> Iterator[Frames[int, FrameWidth, FrameHeight, dtype[number]]]:
+    """Applies the instrumental background sequence to a stream of frame chunks.
+
+    Applies the sequence of corrections of `pauw_instrumental_background_sequence` to
+    each chunk in turn, such that peak memory usage is proportional to the chunk size
+    rather than the length of the scan.
+
+    Args:
+        chunks: An iterable of consecutive chunks of frames, alongside their per-frame
+            count times, incident flux and transmitted flux.
+        mask: The boolean mask to apply to each frame.
+        minimum_pulse_separation: The minimum time difference required between a prior
+            pulse and the current pulse for the current pulse to be recorded correctly.
+        minimum_arrival_separation: The minimum time difference required between the
+            current pulse and a subsequent pulse for the current pulse to be recorded
+            correctly.
+        base_dark_current: The dark current flux, irrespective of time.
+        temporal_dark_current: The dark current flux, as a factor of time.
+        flux_dependant_dark_current: The dark current flux, as a factor of incident
+            flux.
+        beam_center_pixels: The center position of the beam in pixels.
+        pixel_sizes: The real space size of a detector pixel.
+        sample_detector_separation: The distance between the detector and the sample.
+        precision: The floating point type in which the corrections are evaluated and
+            the corrected frames are yielded. If None, the type follows the promotion
+            rules of numpy. Defaults to None.
+        prefetch_depth: The number of chunks read ahead of the chunk being corrected
+            on a background thread, as described in adcorr.utils.pipeline.prefetch. If
+            0, chunks are read as they are corrected. Defaults to 0.
+
+    Yields:
+        The corrected stack of frames of each chunk.
+    """
+    if prefetch_depth < 0:
+        raise ValueError("Prefetch depth must not be negative.")
+    for chunk in _prefetched(chunks, prefetch_depth):
+        yield pauw_instrumental_background_sequence(
+            chunk.frames,
+            mask,
+            chunk.count_times,
+            chunk.incident_flux,
+            chunk.transmitted_flux,
+            minimum_pulse_separation,
+            minimum_arrival_separation,
+            base_dark_current,
+            temporal_dark_current,
+            flux_dependant_dark_current,
+            beam_center_pixels,
+            pixel_sizes,
+            sample_detector_separation,
+            precision=precision,
+        )
+
+
+def _stream_samples(
+    chunks: Iterable[FrameChunk],
+    background: Frame[FrameWidth, FrameHeight, dtype[number]],
+    mask: Frame[FrameWidth, FrameHeight, dtype[bool_]],
+    minimum_pulse_separation: float,
+    minimum_arrival_separation: float,
+    base_dark_current: float,
+    temporal_dark_current: float,
+    flux_dependant_dark_current: float,
+    beam_center_pixels: tuple[float, float],
+    pixel_sizes: tuple[float, float],
+    sample_detector_separation: float,
+    correction_map: CorrectionMap,
+    precision: Precision,
+) -> Iterator[Frames[int, FrameWidth, FrameHeight, dtype[number]]]:
+    for chunk in chunks:
+        yield _correct_sample(
+            chunk.frames,
+            background=background,
+            mask=mask,
+            count_times=chunk.count_times,
+            incident_flux=chunk.incident_flux,
+            transmitted_flux=chunk.transmitted_flux,
+            minimum_pulse_separation=minimum_pulse_separation,
+            minimum_arrival_separation=minimum_arrival_separation,
+            base_dark_current=base_dark_current,
+            temporal_dark_current=temporal_dark_current,
+            flux_dependant_dark_current=flux_dependant_dark_current,
+            beam_center_pixels=beam_center_pixels,
+            pixel_sizes=pixel_sizes,
+            sample_detector_separation=sample_detector_separation,
+            correction_map=correction_map,
+            precision=precision,
+        )
+
+
+def stream_pauw_simple_sample_sequence(
+    chunks: Iterable[FrameChunk],
+    backgrounds: Iterable[FrameChunk],
+    mask: Frame[FrameWidth, FrameHeight, dtype[bool_]],
+    flatfield: Frame[FrameWidth, FrameHeight, dtype[floating]],
+    minimum_pulse_separation: float,
+    minimum_arrival_separation: float,
+    base_dark_current: float,
+    temporal_dark_current: float,
+    flux_dependant_dark_current: float,
+    beam_center_pixels: tuple[float, float],
+    pixel_sizes: tuple[float, float],
+    sample_detector_separation: float,
+    sensor_absorption_coefficient: float,
+    sample_thickness: float,
+    sensor_thickness: float,
+    beam_polarization: float,
+    correction_map: Optional[CorrectionMap] = None,
+    precision: Precision = None,
+    prefetch_depth: int = 0,
+) -> Iterator[Frames[int, FrameWidth, FrameHeight, dtype[number]]]:
+    """Applies the simple sample sequence to a stream of frame chunks.
+
+    Applies the sequence of corrections of `pauw_simple_sample_sequence` to each chunk
+    in turn. The background chunks are corrected and averaged on a running basis
+    before the first chunk of frames is yielded, such that peak memory usage is
+    proportional to the chunk size rather than the length of either scan.
+
+    Args:
+        chunks: An iterable of consecutive chunks of frames, alongside their per-frame
+            count times, incident flux and transmitted flux.
+        backgrounds: An iterable of consecutive chunks of background frames, alongside
+            their per-frame count times, incident flux and transmitted flux.
+        mask: The boolean mask to apply to each frame.
+        flatfield: The multiplicative flatfield correction to be applied to detector
+            readings.
+        minimum_pulse_separation: The minimum time difference required between a prior
+            pulse and the current pulse for the current pulse to be recorded correctly.
+        minimum_arrival_separation: The minimum time difference required between the
+            current pulse and a subsequent pulse for the current pulse to be recorded
+            correctly.
+        base_dark_current: The dark current flux, irrespective of time.
+        temporal_dark_current: The dark current flux, as a factor of time.
+        flux_dependant_dark_current: The dark current flux, as a factor of incident
+            flux.
+        beam_center_pixels: The center position of the beam in pixels.
+        pixel_sizes: The real space size of a detector pixel.
+        sample_detector_separation: The distance between the detector and the sample.
+        sensor_absorption_coefficient: The coefficient of absorption for a given
+            detector head material at a given photon energy.
+        sample_thickness: The thickness of the sample material.
+        sensor_thickness: The thickness of the detector head material.
+        beam_polarization: The fraction of incident radiation polarized in the
+            horizontal plane, where 0.5 signifies an unpolarized source.
+        correction_map: The combined flatfield, angular efficiency, solid angle,
+            polarization and thickness correction. If None, it is computed from the
+            corresponding parameters. Defaults to None.
+        precision: The floating point type in which the corrections are evaluated and
+            the corrected frames are yielded. If None, the type follows the promotion
+            rules of numpy. Defaults to None.
+        prefetch_depth: The number of chunks read ahead of the chunk being corrected
+            on a background thread, as described in adcorr.utils.pipeline.prefetch. If
+            0, chunks are read as they are corrected. Defaults to 0.
+
+    Yields:
+        The corrected stack of frames of each chunk.
+    """
+    detector = (
+        minimum_pulse_separation,
+        minimum_arrival_separation,
+        base_dark_current,
+        temporal_dark_current,
+        flux_dependant_dark_current,
+        beam_center_pixels,
+        pixel_sizes,
+        sample_detector_separation,
+    )
+    if correction_map is None:
+        correction_map = CorrectionMap.from_parameters(
+            flatfield,
+            beam_center_pixels,
+            pixel_sizes,
+            sample_detector_separation,
+            sensor_absorption_coefficient,
+            sensor_thickness,
+            beam_polarization,
+            sample_thickness,
+            precision,
+        )
+    background = _average_chunks(
+        stream_pauw_instrumental_background_sequence(
+            backgrounds, mask, *detector, precision, prefetch_depth
+        )
+    )
+    yield from _stream_samples(
+        _prefetched(chunks, prefetch_depth),
+        background,
+        mask,
+        *detector,
+        correction_map,
+        precision,
+    )
+
+
+def stream_pauw_dispersed_sample_sequence(
+    chunks: Iterable[FrameChunk],
+    dispersants: Iterable[FrameChunk],
+    backgrounds: Iterable[FrameChunk],
+    mask: Frame[FrameWidth, FrameHeight, dtype[bool_]],
+    flatfield: Frame[FrameWidth, FrameHeight, dtype[floating]],
+    minimum_pulse_separation: float,
+    minimum_arrival_separation: float,
+    base_dark_current: float,
+    temporal_dark_current: float,
+    flux_dependant_dark_current: float,
+    beam_center_pixels: tuple[float, float],
+    pixel_sizes: tuple[float, float],
+    sample_detector_separation: float,
+    sensor_absorption_coefficient: float,
+    sample_thickness: float,
+    sensor_thickness: float,
+    beam_polarization: float,
+    displaced_fraction: float,
+    correction_map: Optional[CorrectionMap] = None,
+    precision: Precision = None,
+    prefetch_depth: int = 0,
+) -> Iterator[Frames[int, FrameWidth, FrameHeight, dtype[number]]]:
+    """Applies the dispersed sample sequence to a stream of frame chunks.
+
+    Applies the sequence of corrections of `pauw_dispersed_sample_sequence` to each
+    chunk in turn. The background and dispersant chunks are corrected and averaged on
+    a running basis before the first chunk of frames is yielded, such that peak memory
+    usage is proportional to the chunk size rather than the length of any scan.
+
+    Args:
+        chunks: An iterable of consecutive chunks of frames, alongside their per-frame
+            count times, incident flux and transmitted flux.
+        dispersants: An iterable of consecutive chunks of dispersant frames, alongside
+            their per-frame count times, incident flux and transmitted flux.
+        backgrounds: An iterable of consecutive chunks of background frames, alongside
+            their per-frame count times, incident flux and transmitted flux.
+        mask: The boolean mask to apply to each frame.
+        flatfield: The multiplicative flatfield correction to be applied to detector
+            readings.
+        minimum_pulse_separation: The minimum time difference required between a prior
+            pulse and the current pulse for the current pulse to be recorded correctly.
+        minimum_arrival_separation: The minimum time difference required between the
+            current pulse and a subsequent pulse for the current pulse to be recorded
+            correctly.
+        base_dark_current: The dark current flux, irrespective of time.
+        temporal_dark_current: The dark current flux, as a factor of time.
+        flux_dependant_dark_current: The dark current flux, as a factor of incident
+            flux.
+        beam_center_pixels: The center position of the beam in pixels.
+        pixel_sizes: The real space size of a detector pixel.
+        sample_detector_separation: The distance between the detector and the sample.
+        sensor_absorption_coefficient: The coefficient of absorption for a given
+            detector head material at a given photon energy.
+        sample_thickness: The thickness of the sample material.
+        sensor_thickness: The thickness of the detector head material.
+        beam_polarization: The fraction of incident radiation polarized in the
+            horizontal plane, where 0.5 signifies an unpolarized source.
+        displaced_fraction: The fraction of solvent displaced by the analyte.
+        correction_map: The combined flatfield, angular efficiency, solid angle,
+            polarization and thickness correction. If None, it is computed from the
+            corresponding parameters. Defaults to None.
+        precision: The floating point type in which the corrections are evaluated and
+            the corrected frames are yielded. If None, the type follows the promotion
+            rules of numpy. Defaults to None.
+        prefetch_depth: The number of chunks read ahead of the chunk being corrected
+            on a background thread, as described in adcorr.utils.pipeline.prefetch. If
+            0, chunks are read as they are corrected. Defaults to 0.
+
+    Yields:
+        The corrected stack of frames of each chunk.
+    """
+    detector = (
+        minimum_pulse_separation,
+        minimum_arrival_separation,
+        base_dark_current,
+        temporal_dark_current,
+        flux_dependant_dark_current,
+        beam_center_pixels,
+        pixel_sizes,
+        sample_detector_separation,
+    )
+    if correction_map is None:
+        correction_map = CorrectionMap.from_parameters(
+            flatfield,
+            beam_center_pixels,
+            pixel_sizes,
+            sample_detector_separation,
+            sensor_absorption_coefficient,
+            sensor_thickness,
+            beam_polarization,
+            sample_thickness,
+            precision,
+        )
+    background = _average_chunks(
+        stream_pauw_instrumental_background_sequence(
+            backgrounds, mask, *detector, precision, prefetch_depth
+        )
+    )
+    dispersant = _average_chunks(
+        correct_displaced_volume(frames, displaced_fraction, precision=precision)
+        for frames in _stream_samples(
+            _prefetched(dispersants, prefetch_depth),
+            background,
+            mask,
+            *detector,
+            correction_map,
+            precision,
+        )
+    )
+    for frames in _stream_samples(
+        _prefetched(chunks, prefetch_depth),
+        background,
+        mask,
+        *detector,
+        correction_map,
+        precision,
+    ):
+        yield subtract_background(frames, dispersant, precision=precision)
@@ -1,3 +1,23 @@
-from . import geometry, typing
+from . import (
+    cache,
+    geometry,
+    pipeline,
+    pixels,
+    precision,
+    shared,
+    special,
+    tiling,
+    typing,
+)
 
-__all__ = ["geometry", "typing"]
+__all__ = [
+    "cache",
+    "geometry",
+    "pipeline",
+    "pixels",
+    "precision",
+    "shared",
+    "special",
+    "tiling",
+    "typing",
+]
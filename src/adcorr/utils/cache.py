@@ -0,0 +1,146 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, NamedTuple, TypeVar
+
+from numpy import ndarray
+
+#: The type of value held in a cache
+CachedValue = TypeVar("CachedValue")
+
+
+class CacheInfo(NamedTuple):
+    """Usage statistics of an ArrayCache."""
+
+    #: The number of lookups which were served from the cache.
+    hits: int
+    #: The number of lookups which required the value to be computed.
+    misses: int
+    #: The number of values currently held in the cache.
+    entries: int
+    #: The number of bytes currently held in the cache.
+    nbytes: int
+    #: The maximum number of bytes which may be held in the cache.
+    max_bytes: int
+
+
+def _freeze_key(key: Any) -> Hashable:
+    if isinstance(key, ndarray):
+        return (key.dtype.str, key.shape, key.tobytes())
+    if isinstance(key, tuple):
+        return tuple(_freeze_key(item) for item in key)
+    return key
+
+
+def _freeze_value(value: Any) -> int:
+    if isinstance(value, ndarray):
+        value.flags.writeable = False
+        return value.nbytes
+    if isinstance(value, tuple):
+        return sum(_freeze_value(item) for item in value)
+    nbytes = getattr(value, "nbytes", 0)
+    return nbytes if isinstance(nbytes, int) else 0
+
+
+class ArrayCache:
+    """A least recently used cache of read-only arrays, bounded by memory footprint.
+
+    Values are computed on first lookup of a key and retained until the total size of
+    held arrays would exceed the memory cap, at which point the least recently used
+    values are evicted. Arrays held in the cache are marked read-only, such that they
+    may be safely shared between callers. Lookups with keys which cannot be hashed are
+    computed without being cached.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        """Constructs an empty cache.
+
+        Args:
+            max_bytes: The maximum number of bytes of array data to retain.
+        """
+        if max_bytes < 0:
+            raise ValueError("Maximum bytes must be non-negative.")
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+
+    def get(self, key: Any, compute: Callable[[], CachedValue]) -> CachedValue:
+        """Retrieves the value associated with a key, computing it if not held.
+
+        Args:
+            key: A key which uniquely identifies the value, arrays within the key are
+                compared by content.
+            compute: A function which computes the value, called on a cache miss.
+
+        Returns:
+            The value associated with the key.
+        """
+        frozen_key = _freeze_key(key)
+        try:
+            hash(frozen_key)
+        except TypeError:
+            with self._lock:
+                self._misses += 1
+            return compute()
+
+        with self._lock:
+            entry = self._entries.get(frozen_key)
+            if entry is not None:
+                self._entries.move_to_end(frozen_key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        value = compute()
+        nbytes = _freeze_value(value)
+        if nbytes > self.max_bytes:
+            return value
+
+        with self._lock:
+            if frozen_key not in self._entries:
+                self._entries[frozen_key] = (value, nbytes)
+                self._nbytes += nbytes
+            self._evict()
+        return value
+
+    def _evict(self) -> None:
+        while self._nbytes > self.max_bytes and self._entries:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self._nbytes -= nbytes
+
+    def resize(self, max_bytes: int) -> None:
+        """Changes the memory cap of the cache, evicting values as required.
+
+        Args:
+            max_bytes: The maximum number of bytes of array data to retain.
+        """
+        if max_bytes < 0:
+            raise ValueError("Maximum bytes must be non-negative.")
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        """Evicts all values from the cache and resets the usage statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> CacheInfo:
+        """Reports the usage statistics of the cache.
+
+        Returns:
+            The hit and miss counts, alongside the current and maximum footprint.
+        """
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                len(self._entries),
+                self._nbytes,
+                self.max_bytes,
+            )
@@ -1,25 +1,69 @@
-from typing import List, Tuple
+from typing import Any, Literal, Tuple
 
-from numpy import arctan, arctan2, dtype, floating, hypot, linspace, meshgrid, ndarray
+from numpy import (
+    arctan,
+    arctan2,
+    dtype,
+    errstate,
+    floating,
+    hypot,
+    linspace,
+    ndarray,
+    sqrt,
+    square,
+    ufunc,
+)
 
+from .cache import ArrayCache
 
-def _relative_position_meshgrid(
+#: The cache of pixel geometry maps, shared by all geometry functions.
+GEOMETRY_CACHE = ArrayCache(max_bytes=512 * 2**20)
+
+
+def _in_place(
+    function: ufunc, values: ndarray[Tuple[int, int], dtype[floating]]
+) -> ndarray[Tuple[int, int], dtype[floating]]:
+    # Quantities do not support the out argument of ufuncs, so are not updated in place
+    if isinstance(values, ndarray):
+        return function(values, out=values)
+    return function(values)
+
+
+def pixel_offsets(
     frame_shape: Tuple[int, int],
     beam_center: Tuple[float, float],
     pixel_sizes: Tuple[float, float],
-) -> List[ndarray]:
-    return meshgrid(
-        linspace(
-            (0.5 - beam_center[1]) * pixel_sizes[1],
-            (frame_shape[1] - 0.5 - beam_center[1]) * pixel_sizes[1],
-            frame_shape[1],
-        ),
-        linspace(
-            (0.5 - beam_center[0]) * pixel_sizes[0],
-            (frame_shape[0] - 0.5 - beam_center[0]) * pixel_sizes[0],
-            frame_shape[0],
-        ),
+) -> Tuple[
+    ndarray[Tuple[int, Literal[1]], dtype[floating]],
+    ndarray[Tuple[Literal[1], int], dtype[floating]],
+]:
+    """Computes the real space offsets of pixel centers from the beam center.
+
+    The offsets are returned as an open grid, a column of row offsets and a row of
+    column offsets, which broadcast against one another to give frame sized maps
+    without the full grid being materialised. The geometry of a sub-window of the
+    frame may be found by slicing the offsets.
+
+    Args:
+        frame_shape: The shape of a frame.
+        beam_center: The center position of the beam in pixels.
+        pixel_sizes: The real space size of a detector pixel.
+
+    Returns:
+        The offsets of each row, with shape (rows, 1), and of each column, with shape
+        (1, columns).
+    """
+    rows = linspace(
+        (0.5 - beam_center[0]) * pixel_sizes[0],
+        (frame_shape[0] - 0.5 - beam_center[0]) * pixel_sizes[0],
+        frame_shape[0],
+    )
+    columns = linspace(
+        (0.5 - beam_center[1]) * pixel_sizes[1],
+        (frame_shape[1] - 0.5 - beam_center[1]) * pixel_sizes[1],
+        frame_shape[1],
     )
+    return rows.reshape(-1, 1), columns.reshape(1, -1)
 
 
 def scattering_angles(
@@ -37,10 +81,19 @@ def scattering_angles(
         distance: The distance between the detector and the sample.
 
     Returns:
-        An array of pixel angles from the sample.
+        An array of pixel angles from the sample. The array is read-only, as it is
+        shared between callers through the geometry cache.
     """
-    yy, xx = _relative_position_meshgrid(frame_shape, beam_center, pixel_sizes)
-    return arctan(hypot(xx, yy) / distance)
+
+    def compute() -> ndarray[Tuple[int, int], dtype[floating]]:
+        return _in_place(
+            arctan,
+            _scattering_tangents(frame_shape, beam_center, pixel_sizes, distance),
+        )
+
+    return GEOMETRY_CACHE.get(
+        ("scattering_angles", frame_shape, beam_center, pixel_sizes, distance), compute
+    )
 
 
 def azimuthal_angles(
@@ -55,7 +108,247 @@ def azimuthal_angles(
         beam_center: The center position of the beam in pixels.
 
     Returns:
-        An array of pixel azimuthal angles from the beam center.
+        An array of pixel azimuthal angles from the beam center. The array is
+        read-only, as it is shared between callers through the geometry cache.
+    """
+
+    def compute() -> ndarray[Tuple[int, int], dtype[floating]]:
+        rows, columns = pixel_offsets(frame_shape, beam_center, pixel_sizes)
+        return arctan2(rows, columns)
+
+    return GEOMETRY_CACHE.get(
+        ("azimuthal_angles", frame_shape, beam_center, pixel_sizes), compute
+    )
+
+
+def offset_tangents(
+    rows: ndarray[Any, dtype[floating]],
+    columns: ndarray[Any, dtype[floating]],
+    distance: float,
+) -> ndarray[Tuple[int, int], dtype[floating]]:
+    """Computes the tangents of the angles from the sample of pixels at given offsets.
+
+    Args:
+        rows: The real space offsets of the pixel rows from the beam center.
+        columns: The real space offsets of the pixel columns from the beam center,
+            which broadcast against the row offsets.
+        distance: The distance between the detector and the sample.
+
+    Returns:
+        The tangents of the angles of the pixels from the sample.
+    """
+    tangents = hypot(rows, columns)
+    tangents /= distance
+    return tangents
+
+
+def offset_secants(
+    rows: ndarray[Any, dtype[floating]],
+    columns: ndarray[Any, dtype[floating]],
+    distance: float,
+) -> ndarray[Tuple[int, int], dtype[floating]]:
+    """Computes the secants of the angles from the sample of pixels at given offsets.
+
+    Args:
+        rows: The real space offsets of the pixel rows from the beam center.
+        columns: The real space offsets of the pixel columns from the beam center,
+            which broadcast against the row offsets.
+        distance: The distance between the detector and the sample.
+
+    Returns:
+        The secants of the angles of the pixels from the sample.
+    """
+    return _in_place(sqrt, square(rows / distance) + (1.0 + square(columns / distance)))
+
+
+def offset_azimuthal_components(
+    rows: ndarray[Any, dtype[floating]], columns: ndarray[Any, dtype[floating]]
+) -> Tuple[
+    ndarray[Tuple[int, int], dtype[floating]], ndarray[Tuple[int, int], dtype[floating]]
+]:
+    """Computes the azimuthal cosines and sines of pixels at given offsets.
+
+    Pixels at the beam center are assigned an azimuthal angle of zero.
+
+    Args:
+        rows: The real space offsets of the pixel rows from the beam center.
+        columns: The real space offsets of the pixel columns from the beam center,
+            which broadcast against the row offsets.
+
+    Returns:
+        The cosines and the sines of the azimuthal angles of the pixels.
+    """
+    radii = hypot(rows, columns)
+    on_axis = radii == 0.0
+    with errstate(divide="ignore", invalid="ignore"):
+        cosines, sines = columns / radii, rows / radii
+    cosines[on_axis] = 1.0
+    sines[on_axis] = 0.0
+    return cosines, sines
+
+
+def _scattering_tangents(
+    frame_shape: Tuple[int, int],
+    beam_center: Tuple[float, float],
+    pixel_sizes: Tuple[float, float],
+    distance: float,
+) -> ndarray[Tuple[int, int], dtype[floating]]:
+    return offset_tangents(
+        *pixel_offsets(frame_shape, beam_center, pixel_sizes), distance
+    )
+
+
+def scattering_secants(
+    frame_shape: Tuple[int, int],
+    beam_center: Tuple[float, float],
+    pixel_sizes: Tuple[float, float],
+    distance: float,
+) -> ndarray[Tuple[int, int], dtype[floating]]:
+    """Computes the secants of the angles of pixels from the sample.
+
+    The secants are computed algebraically from the pixel offsets, without evaluating
+    the angles themselves.
+
+    Args:
+        frame_shape: The shape of a frame.
+        beam_center: The center position of the beam in pixels.
+        pixel_sizes: The real space size of a detector pixel.
+        distance: The distance between the detector and the sample.
+
+    Returns:
+        An array of the secants of pixel angles from the sample. The array is
+        read-only, as it is shared between callers through the geometry cache.
+    """
+
+    def compute() -> ndarray[Tuple[int, int], dtype[floating]]:
+        return offset_secants(
+            *pixel_offsets(frame_shape, beam_center, pixel_sizes), distance
+        )
+
+    return GEOMETRY_CACHE.get(
+        ("scattering_secants", frame_shape, beam_center, pixel_sizes, distance),
+        compute,
+    )
+
+
+def scattering_cosines(
+    frame_shape: Tuple[int, int],
+    beam_center: Tuple[float, float],
+    pixel_sizes: Tuple[float, float],
+    distance: float,
+) -> ndarray[Tuple[int, int], dtype[floating]]:
+    """Computes the cosines of the angles of pixels from the sample.
+
+    The cosines are computed algebraically from the pixel offsets, without evaluating
+    the angles themselves.
+
+    Args:
+        frame_shape: The shape of a frame.
+        beam_center: The center position of the beam in pixels.
+        pixel_sizes: The real space size of a detector pixel.
+        distance: The distance between the detector and the sample.
+
+    Returns:
+        An array of the cosines of pixel angles from the sample. The array is
+        read-only, as it is shared between callers through the geometry cache.
+    """
+
+    def compute() -> ndarray[Tuple[int, int], dtype[floating]]:
+        return 1.0 / scattering_secants(frame_shape, beam_center, pixel_sizes, distance)
+
+    return GEOMETRY_CACHE.get(
+        ("scattering_cosines", frame_shape, beam_center, pixel_sizes, distance),
+        compute,
+    )
+
+
+def scattering_sines(
+    frame_shape: Tuple[int, int],
+    beam_center: Tuple[float, float],
+    pixel_sizes: Tuple[float, float],
+    distance: float,
+) -> ndarray[Tuple[int, int], dtype[floating]]:
+    """Computes the sines of the angles of pixels from the sample.
+
+    The sines are computed algebraically from the pixel offsets, without evaluating
+    the angles themselves.
+
+    Args:
+        frame_shape: The shape of a frame.
+        beam_center: The center position of the beam in pixels.
+        pixel_sizes: The real space size of a detector pixel.
+        distance: The distance between the detector and the sample.
+
+    Returns:
+        An array of the sines of pixel angles from the sample. The array is read-only,
+        as it is shared between callers through the geometry cache.
+    """
+
+    def compute() -> ndarray[Tuple[int, int], dtype[floating]]:
+        sines = _scattering_tangents(frame_shape, beam_center, pixel_sizes, distance)
+        sines *= scattering_cosines(frame_shape, beam_center, pixel_sizes, distance)
+        return sines
+
+    return GEOMETRY_CACHE.get(
+        ("scattering_sines", frame_shape, beam_center, pixel_sizes, distance),
+        compute,
+    )
+
+
+def _azimuthal_components(
+    frame_shape: Tuple[int, int],
+    beam_center: Tuple[float, float],
+    pixel_sizes: Tuple[float, float],
+) -> Tuple[ndarray[Tuple[int, int], dtype[floating]], ...]:
+    def compute() -> Tuple[ndarray[Tuple[int, int], dtype[floating]], ...]:
+        return offset_azimuthal_components(
+            *pixel_offsets(frame_shape, beam_center, pixel_sizes)
+        )
+
+    return GEOMETRY_CACHE.get(
+        ("azimuthal_components", frame_shape, beam_center, pixel_sizes), compute
+    )
+
+
+def azimuthal_cosines(
+    frame_shape: Tuple[int, int],
+    beam_center: Tuple[float, float],
+    pixel_sizes: Tuple[float, float],
+) -> ndarray[Tuple[int, int], dtype[floating]]:
+    """Computes the cosines of the azimuthal angles of pixels from the beam center.
+
+    The cosines are computed algebraically from the pixel offsets, without evaluating
+    the angles themselves. A pixel centered on the beam has an azimuthal angle of zero.
+
+    Args:
+        frame_shape: The shape of the frame.
+        beam_center: The center position of the beam in pixels.
+        pixel_sizes: The real space size of a detector pixel.
+
+    Returns:
+        An array of the cosines of pixel azimuthal angles from the beam center. The
+        array is read-only, as it is shared between callers through the geometry cache.
+    """
+    return _azimuthal_components(frame_shape, beam_center, pixel_sizes)[0]
+
+
+def azimuthal_sines(
+    frame_shape: Tuple[int, int],
+    beam_center: Tuple[float, float],
+    pixel_sizes: Tuple[float, float],
+) -> ndarray[Tuple[int, int], dtype[floating]]:
+    """Computes the sines of the azimuthal angles of pixels from the beam center.
+
+    The sines are computed algebraically from the pixel offsets, without evaluating
+    the angles themselves. A pixel centered on the beam has an azimuthal angle of zero.
+
+    Args:
+        frame_shape: The shape of the frame.
+        beam_center: The center position of the beam in pixels.
+        pixel_sizes: The real space size of a detector pixel.
+
+    Returns:
+        An array of the sines of pixel azimuthal angles from the beam center. The array
+        is read-only, as it is shared between callers through the geometry cache.
     """
-    yy, xx = _relative_position_meshgrid(frame_shape, beam_center, pixel_sizes)
-    return arctan2(xx, yy)
+    return _azimuthal_components(frame_shape, beam_center, pixel_sizes)[1]
@@ -0,0 +1,121 @@
+from queue import Full, Queue
+from threading import Event, Thread
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+#: An item passed between the stages of a pipeline
+Item = TypeVar("Item")
+
+#: The period, in seconds, after which a blocked producer checks for cancellation.
+_CANCELLATION_PERIOD = 0.05
+
+#: Marks the end of the items passed between threads.
+_END = object()
+
+
+def _check_depth(depth: int) -> None:
+    if depth <= 0:
+        raise ValueError("Queue depth must be positive.")
+
+
+def _put_unless_stopped(queue: Queue, entry: Any, stop: Event) -> bool:
+    while not stop.is_set():
+        try:
+            queue.put(entry, timeout=_CANCELLATION_PERIOD)
+            return True
+        except Full:
+            pass
+    return False
+
+
+def prefetch(items: Iterable[Item], depth: int = 1) -> Iterator[Item]:
+    """Iterates an iterable on a background thread, ahead of its consumer.
+
+    Items are produced on a background thread whilst the consumer works on earlier
+    items, such that the latency of producing each item, such as reading a chunk of
+    frames from disk, is hidden behind the work of the consumer. At most depth items
+    are held awaiting the consumer, alongside the item being produced, bounding the
+    memory held by items read ahead. Exceptions raised by the iterable are re-raised
+    to the consumer, and the background thread is stopped if the consumer closes the
+    iterator early.
+
+    Args:
+        items: The iterable to be iterated ahead of its consumer.
+        depth: The maximum number of items held awaiting the consumer. Defaults to 1,
+            in which case one item is read ahead.
+
+    Yields:
+        Each item of the iterable, in order.
+    """
+    _check_depth(depth)
+    queue: Queue[Tuple[Any, Optional[BaseException]]] = Queue(maxsize=depth)
+    stop = Event()
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not _put_unless_stopped(queue, (item, None), stop):
+                    return
+            _put_unless_stopped(queue, (_END, None), stop)
+        except BaseException as error:
+            _put_unless_stopped(queue, (_END, error), stop)
+
+    producer = Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item, error = queue.get()
+            if error is not None:
+                raise error
+            if item is _END:
+                return
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+def write_behind(
+    items: Iterable[Item], write: Callable[[Item], Any], depth: int = 1
+) -> None:
+    """Consumes an iterable, writing each item on a background thread.
+
+    Each item is passed to the writer on a background thread whilst later items are
+    produced, such that the latency of writing each item, such as writing a stack of
+    corrected frames to disk, is hidden behind the work of producing the next. At most
+    depth items are held awaiting the writer, alongside the item being written,
+    bounding the memory held by items awaiting a write. Items are written in order. If
+    the writer raises an exception no further items are produced, and the exception
+    is re-raised once the background thread is complete.
+
+    Args:
+        items: The iterable of items to be written.
+        write: A callable which writes a single item.
+        depth: The maximum number of items held awaiting the writer. Defaults to 1.
+    """
+    _check_depth(depth)
+    queue: Queue[Any] = Queue(maxsize=depth)
+    errors: List[BaseException] = []
+
+    def consume() -> None:
+        while True:
+            item = queue.get()
+            if item is _END:
+                return
+            if not errors:
+                try:
+                    write(item)
+                except BaseException as error:
+                    errors.append(error)
+
+    writer = Thread(target=consume, daemon=True)
+    writer.start()
+    try:
+        for item in items:
+            if errors:
+                break
+            queue.put(item)
+    finally:
+        queue.put(_END)
+        writer.join()
+    if errors:
+        raise errors[0]
@@ -0,0 +1,276 @@
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Literal,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from numpy import (
+    bool_,
+    broadcast_to,
+    dtype,
+    flatnonzero,
+    floating,
+    intp,
+    ndarray,
+    unravel_index,
+    zeros,
+)
+from numpy.ma import MaskedArray, masked_array
+
+from .geometry import offset_azimuthal_components, offset_secants, offset_tangents
+from .typing import Frame, FrameDType, FrameHeight, Frames, FrameWidth, NumFrames
+
+#: The number of valid pixels in a frame.
+NumValid = TypeVar("NumValid", bound=int)
+
+#: A stack of frames, each held as a single row of its valid pixels
+CompactFrames = ndarray[tuple[NumFrames, Literal[1], NumValid], FrameDType]
+
+#: A geometry map of the valid pixels, held as a single row
+ValidMap = ndarray[Tuple[int, int], dtype[floating]]
+
+#: A geometry map of the valid pixels, or a tuple of such maps
+Geometry = TypeVar("Geometry", bound=Union[ndarray, Tuple[ndarray, ...]])
+
+
+@dataclass(frozen=True)
+class ValidPixels:
+    """The unmasked pixels of a detector, used to hold frames in a compact form.
+
+    Frames are gathered into a compact stack of shape (frames, 1, valid pixels), such
+    that corrections which treat each pixel independently may be applied to the valid
+    pixels alone, with the results scattered back into full frames on request. As the
+    compact stack remains a stack of frames, corrections which apply a per-frame
+    scalar or a per-pixel map may be applied to it directly, with per-pixel maps first
+    gathered by gather_map. The geometry of the valid pixels is computed from their
+    positions alone, and is held by the instance such that it is computed once for
+    each detector geometry.
+    """
+
+    #: The boolean mask of the detector, which is True for each masked pixel.
+    mask: Frame[Any, Any, dtype[bool_]]
+    #: The flat indices of each valid pixel within a frame.
+    indices: ndarray[Tuple[int], dtype[intp]]
+    #: The geometry maps of the valid pixels, keyed by their kind and geometry.
+    _geometry: Dict[Hashable, Any] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def from_mask(
+        cls, mask: Frame[FrameWidth, FrameHeight, dtype[bool_]]
+    ) -> "ValidPixels":
+        """Constructs the valid pixels of a detector from its mask.
+
+        Args:
+            mask: The boolean mask of the detector.
+
+        Returns:
+            The pixels which are not masked.
+        """
+        mask = mask.copy()
+        mask.flags.writeable = False
+        indices = flatnonzero(~mask)
+        indices.flags.writeable = False
+        return cls(mask, indices)
+
+    @property
+    def frame_shape(self) -> Tuple[int, int]:
+        """The shape of a full frame."""
+        return cast(Tuple[int, int], self.mask.shape)
+
+    @property
+    def num_valid(self) -> int:
+        """The number of valid pixels in a frame."""
+        return self.indices.size
+
+    def gather(
+        self,
+        frames: Union[
+            Frames[NumFrames, FrameWidth, FrameHeight, FrameDType],
+            Frame[FrameWidth, FrameHeight, FrameDType],
+        ],
+    ) -> CompactFrames[Any, int, FrameDType]:
+        """Gathers the valid pixels of a stack of frames into a compact stack.
+
+        Args:
+            frames: A stack of frames, or a single frame.
+
+        Returns:
+            A stack with a single row of valid pixels for each frame.
+        """
+        if frames.shape[-2:] != self.frame_shape:
+            raise ValueError(
+                f"Frames of shape {frames.shape[-2:]} do not match the mask of shape "
+                f"{self.frame_shape}."
+            )
+        flat = frames.reshape(-1, self.mask.size)
+        return flat[:, self.indices].reshape(flat.shape[0], 1, self.num_valid)
+
+    def gather_map(
+        self, frame: Frame[FrameWidth, FrameHeight, FrameDType]
+    ) -> ndarray[Tuple[Literal[1], int], FrameDType]:
+        """Gathers the valid pixels of a per-pixel map, such as a flatfield.
+
+        Args:
+            frame: A map with a value for each pixel of a frame.
+
+        Returns:
+            A single row of the values of valid pixels.
+        """
+        return self.gather(frame)[0]
+
+    def scatter(
+        self,
+        compact: CompactFrames[NumFrames, NumValid, FrameDType],
+        fill_value: Any = 0,
+    ) -> MaskedArray[Tuple[NumFrames, FrameWidth, FrameHeight], FrameDType]:
+        """Scatters a compact stack back into a stack of masked frames.
+
+        Args:
+            compact: A compact stack produced by gather, or by corrections applied to
+                such a stack.
+            fill_value: The value assigned to the data of masked pixels. Defaults to 0.
+
+        Returns:
+            A masked stack of full frames.
+        """
+        compact = compact.reshape(-1, self.num_valid)
+        frames = zeros((compact.shape[0], self.mask.size), dtype=compact.dtype)
+        frames[...] = fill_value
+        frames[:, self.indices] = compact
+        frames = frames.reshape(compact.shape[0], *self.frame_shape)
+        return masked_array(frames, mask=broadcast_to(self.mask, frames.shape).copy())
+
+    def _memoised(self, key: Hashable, compute: Callable[[], Geometry]) -> Geometry:
+        if key not in self._geometry:
+            values = compute()
+            for array in values if isinstance(values, tuple) else (values,):
+                array.flags.writeable = False
+            self._geometry.setdefault(key, values)
+        return self._geometry[key]
+
+    def _offsets(
+        self, beam_center: Tuple[float, float], pixel_sizes: Tuple[float, float]
+    ) -> Tuple[ValidMap, ValidMap]:
+        def compute() -> Tuple[ValidMap, ValidMap]:
+            rows, columns = unravel_index(self.indices, self.frame_shape)
+            return (
+                ((rows + 0.5 - beam_center[0]) * pixel_sizes[0]).reshape(1, -1),
+                ((columns + 0.5 - beam_center[1]) * pixel_sizes[1]).reshape(1, -1),
+            )
+
+        return self._memoised(("offsets", beam_center, pixel_sizes), compute)
+
+    def scattering_secants(
+        self,
+        beam_center: Tuple[float, float],
+        pixel_sizes: Tuple[float, float],
+        distance: float,
+    ) -> ValidMap:
+        """Computes the secants of the angles of the valid pixels from the sample.
+
+        Args:
+            beam_center: The center position of the beam in pixels.
+            pixel_sizes: The real space size of a detector pixel.
+            distance: The distance between the detector and the sample.
+
+        Returns:
+            A single row of the secants of the angles of valid pixels from the sample.
+        """
+        return self._memoised(
+            ("scattering_secants", beam_center, pixel_sizes, distance),
+            lambda: offset_secants(*self._offsets(beam_center, pixel_sizes), distance),
+        )
+
+    def scattering_cosines(
+        self,
+        beam_center: Tuple[float, float],
+        pixel_sizes: Tuple[float, float],
+        distance: float,
+    ) -> ValidMap:
+        """Computes the cosines of the angles of the valid pixels from the sample.
+
+        Args:
+            beam_center: The center position of the beam in pixels.
+            pixel_sizes: The real space size of a detector pixel.
+            distance: The distance between the detector and the sample.
+
+        Returns:
+            A single row of the cosines of the angles of valid pixels from the sample.
+        """
+        return self._memoised(
+            ("scattering_cosines", beam_center, pixel_sizes, distance),
+            lambda: 1.0 / self.scattering_secants(beam_center, pixel_sizes, distance),
+        )
+
+    def scattering_sines(
+        self,
+        beam_center: Tuple[float, float],
+        pixel_sizes: Tuple[float, float],
+        distance: float,
+    ) -> ValidMap:
+        """Computes the sines of the angles of the valid pixels from the sample.
+
+        Args:
+            beam_center: The center position of the beam in pixels.
+            pixel_sizes: The real space size of a detector pixel.
+            distance: The distance between the detector and the sample.
+
+        Returns:
+            A single row of the sines of the angles of valid pixels from the sample.
+        """
+
+        def compute() -> ValidMap:
+            sines = offset_tangents(*self._offsets(beam_center, pixel_sizes), distance)
+            sines *= self.scattering_cosines(beam_center, pixel_sizes, distance)
+            return sines
+
+        return self._memoised(
+            ("scattering_sines", beam_center, pixel_sizes, distance), compute
+        )
+
+    def _azimuthal_components(
+        self, beam_center: Tuple[float, float], pixel_sizes: Tuple[float, float]
+    ) -> Tuple[ValidMap, ValidMap]:
+        return self._memoised(
+            ("azimuthal_components", beam_center, pixel_sizes),
+            lambda: offset_azimuthal_components(
+                *self._offsets(beam_center, pixel_sizes)
+            ),
+        )
+
+    def azimuthal_cosines(
+        self, beam_center: Tuple[float, float], pixel_sizes: Tuple[float, float]
+    ) -> ValidMap:
+        """Computes the cosines of the azimuthal angles of the valid pixels.
+
+        Args:
+            beam_center: The center position of the beam in pixels.
+            pixel_sizes: The real space size of a detector pixel.
+
+        Returns:
+            A single row of the cosines of the azimuthal angles of valid pixels.
+        """
+        return self._azimuthal_components(beam_center, pixel_sizes)[0]
+
+    def azimuthal_sines(
+        self, beam_center: Tuple[float, float], pixel_sizes: Tuple[float, float]
+    ) -> ValidMap:
+        """Computes the sines of the azimuthal angles of the valid pixels.
+
+        Args:
+            beam_center: The center position of the beam in pixels.
+            pixel_sizes: The real space size of a detector pixel.
+
+        Returns:
+            A single row of the sines of the azimuthal angles of valid pixels.
+        """
+        return self._azimuthal_components(beam_center, pixel_sizes)[1]
@@ -0,0 +1,40 @@
+from typing import Optional, TypeVar, cast
+
+from numpy import dtype, ndarray
+from numpy.typing import DTypeLike
+
+#: The floating point type in which corrections are evaluated, or None to follow the
+#: type promotion rules of numpy.
+Precision = Optional[DTypeLike]
+
+#: The type of a value cast to a working precision
+Value = TypeVar("Value")
+
+
+def as_precision(values: Value, precision: Precision) -> Value:
+    """Casts an array to a working precision, without copying where it already matches.
+
+    Arrays of any numeric type, including masked arrays, are cast such that subsequent
+    arithmetic is performed in the working precision, rather than being promoted to
+    double precision by integer frames or double precision per-frame values. Values
+    which are not numpy arrays, such as python scalars or quantities, are returned
+    unchanged, as python scalars do not promote the arrays they are combined with.
+
+    Args:
+        values: The values to be cast.
+        precision: The floating point type in which corrections are evaluated. If None,
+            the values are returned unchanged.
+
+    Returns:
+        The values in the working precision.
+
+    Raises:
+        ValueError: If the precision is not a floating point type.
+    """
+    if precision is None:
+        return values
+    if dtype(precision).kind != "f":
+        raise ValueError(f"Precision must be a floating point type, got {precision}.")
+    if not isinstance(values, ndarray):
+        return values
+    return cast(Value, values.astype(precision, copy=False))
@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Tuple
+
+from numpy import dtype as DType
+from numpy import ndarray
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    """A handle to a read-only array held in shared memory.
+
+    The handle holds only the name, shape and type of the array, such that it may be
+    sent to worker processes cheaply, with each worker attaching to the shared memory
+    to view the array without copying it. The process which creates the array owns
+    the shared memory, and must release it once all workers are complete. Workers
+    must be started by the creating process, such that they share its resource
+    tracker, which releases the shared memory only once the creating process exits.
+    """
+
+    #: The name of the shared memory block which holds the array.
+    name: str
+    #: The shape of the array.
+    shape: Tuple[int, ...]
+    #: The string representation of the type of the array.
+    dtype: str
+
+    @classmethod
+    def create(cls, values: ndarray) -> Tuple["SharedArray", SharedMemory]:
+        """Copies an array into a new block of shared memory.
+
+        Args:
+            values: The array to be shared.
+
+        Returns:
+            The handle to the shared array, alongside the shared memory block, which
+            should be closed and unlinked by the caller once it is no longer required.
+        """
+        memory = SharedMemory(create=True, size=max(values.nbytes, 1))
+        shared: ndarray[Any, DType[Any]] = ndarray(
+            values.shape, dtype=values.dtype, buffer=memory.buf
+        )
+        shared[...] = values
+        return cls(memory.name, values.shape, values.dtype.str), memory
+
+    def attach(self) -> Tuple[ndarray[Any, DType[Any]], SharedMemory]:
+        """Views the shared array from a process which did not create it.
+
+        Returns:
+            A read-only view of the array, alongside the shared memory block which
+            backs it, which must be retained for as long as the view is in use.
+        """
+        memory = SharedMemory(name=self.name)
+        values: ndarray[Any, DType[Any]] = ndarray(
+            self.shape, dtype=self.dtype, buffer=memory.buf
+        )
+        values.flags.writeable = False
+        return values, memory
@@ -0,0 +1,157 @@
+from math import e
+from typing import Any, Optional, TypeVar, cast
+
+from numpy import (
+    abs,
+    asarray,
+    complexfloating,
+    copyto,
+    dtype,
+    empty_like,
+    errstate,
+    exp,
+    finfo,
+    float64,
+    floating,
+    isfinite,
+    log1p,
+    maximum,
+    ndarray,
+    sqrt,
+    where,
+)
+from scipy.special import lambertw
+
+#: The shape of an array passed through an elementwise function
+Shape = TypeVar("Shape", bound=Any)
+
+#: The maximum number of Halley iterations performed by lambertw_real
+LAMBERTW_MAX_ITERATIONS = 8
+#: The number of values evaluated at once by lambertw_real
+LAMBERTW_BLOCK_SIZE = 2**16
+
+
+def _near_branch_estimate(
+    values: ndarray[Shape, dtype[floating]],
+) -> ndarray[Shape, dtype[floating]]:
+    branch_distance = sqrt(maximum(2.0 * (e * values + 1.0), 0.0))
+    return -1.0 + branch_distance * (
+        1.0
+        + branch_distance
+        * (
+            -1.0 / 3.0
+            + branch_distance
+            * (
+                11.0 / 72.0
+                + branch_distance * (-43.0 / 540.0 + branch_distance * 769.0 / 17280.0)
+            )
+        )
+    )
+
+
+def _near_zero_estimate(
+    values: ndarray[Shape, dtype[floating]],
+) -> ndarray[Shape, dtype[floating]]:
+    return (
+        values
+        * (1.0 + 4.0 / 3.0 * values)
+        / (1.0 + values * (7.0 / 3.0 + 5.0 / 6.0 * values))
+    )
+
+
+def _positive_estimate(
+    values: ndarray[Shape, dtype[floating]],
+) -> ndarray[Shape, dtype[floating]]:
+    logarithmic = log1p(values)
+    return logarithmic * (1.0 - log1p(logarithmic) / (2.0 + logarithmic))
+
+
+def _initial_estimate(
+    values: ndarray[Shape, dtype[floating]],
+) -> ndarray[Shape, dtype[floating]]:
+    near_branch = values < -0.32
+    positive = values >= 0.0
+    if not near_branch.any() and not positive.any():
+        return _near_zero_estimate(values)
+    return where(
+        near_branch,
+        _near_branch_estimate(values),
+        where(positive, _positive_estimate(values), _near_zero_estimate(values)),
+    )
+
+
+def _lambertw_block(
+    values: ndarray[Shape, dtype[floating]],
+) -> ndarray[Shape, dtype[floating]]:
+    # Halley iterations converge cubically, such that a step smaller than the square
+    # root of the tolerance leaves an error far below the tolerance
+    tolerance = sqrt(4 * finfo(values.dtype).eps)
+    estimate = _initial_estimate(values)
+    for _ in range(LAMBERTW_MAX_ITERATIONS):
+        derivative = exp(estimate)
+        step = estimate * derivative
+        step -= values
+        successor = estimate + 1.0
+        derivative *= successor
+        successor *= 2.0
+        curvature = estimate + 2.0
+        curvature *= step
+        curvature /= successor
+        derivative -= curvature
+        step /= derivative
+        copyto(step, 0.0, where=~isfinite(step))
+        estimate -= step
+        if (abs(step) <= tolerance * abs(estimate)).all():
+            break
+    return estimate
+
+
+def lambertw_real(
+    values: ndarray[Shape, dtype[floating]],
+    out: Optional[ndarray[Shape, dtype[floating]]] = None,
+) -> ndarray[Shape, dtype[floating]]:
+    """Evaluates the principal branch of the Lambert W function for real values.
+
+    Evaluates W0 without complex arithmetic, from a series expansion about the branch
+    point, a Padé approximant about zero or a logarithmic estimate, refined by Halley
+    iterations. Values are processed in fixed size blocks, such that temporaries do not
+    scale with the input and the results may be written over the values. Results agree
+    with the real part of scipy.special.lambertw to a relative tolerance of 1e-13 in
+    double precision and 1e-6 in single precision for values more than 1e-2 above
+    -1/e, loosening towards the branch point where the function is ill conditioned.
+    Values below -1/e, for which W0 is complex, are evaluated by scipy and the real
+    part taken. Single precision inputs are evaluated in single precision, other
+    non-floating inputs are promoted to double precision.
+
+    Args:
+        values: The real values at which the function is evaluated.
+        out: An array into which the results are written. If None, a new array is
+            allocated. Defaults to None.
+
+    Returns:
+        The real value of the principal branch of the Lambert W function.
+    """
+    values = asarray(values)
+    if values.dtype.kind != "f":
+        values = values.astype(float64)
+    flat_values = values.reshape(-1)
+    if out is None:
+        out = empty_like(values)
+    contiguous = out.flags.c_contiguous
+    flat_out = out.reshape(-1) if contiguous else empty_like(flat_values)
+
+    with errstate(all="ignore"):
+        for start in range(0, flat_values.size, LAMBERTW_BLOCK_SIZE):
+            block_values = flat_values[start : start + LAMBERTW_BLOCK_SIZE]
+            complex_valued = block_values < -1.0 / e
+            estimate = _lambertw_block(block_values)
+            if complex_valued.any():
+                estimate[complex_valued] = cast(
+                    ndarray[Any, dtype[complexfloating]],
+                    lambertw(block_values[complex_valued]),
+                ).real
+            flat_out[start : start + LAMBERTW_BLOCK_SIZE] = estimate
+
+    if not contiguous:
+        copyto(out, flat_out.reshape(values.shape))
+    return out
@@ -0,0 +1,148 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Deque, Iterator, Optional, TypeVar
+
+from numpy import atleast_1d, concatenate, dtype, empty_like, ndarray, number
+from numpy.ma import MaskedArray
+
+from .typing import (
+    FrameDType,
+    FrameHeight,
+    Frames,
+    FrameWidth,
+    NumFrames,
+    VectorOrSingle,
+)
+
+#: The result of a function applied to a tile of frames
+TileResult = TypeVar("TileResult")
+
+
+def frame_tiles(num_frames: int, tile_size: int) -> Iterator[slice]:
+    """Produces slices which partition a stack of frames into tiles.
+
+    Args:
+        num_frames: The number of frames in the stack.
+        tile_size: The maximum number of frames in each tile.
+
+    Yields:
+        A slice selecting each successive tile of frames.
+    """
+    if tile_size <= 0:
+        raise ValueError("Tile size must be positive.")
+    for start in range(0, num_frames, tile_size):
+        yield slice(start, min(start + tile_size, num_frames))
+
+
+def slice_frame_vector(
+    vector: ndarray[VectorOrSingle[NumFrames], Any], frames: slice
+) -> ndarray[VectorOrSingle[int], Any]:
+    """Selects the entries of a per-frame vector which correspond to a tile of frames.
+
+    Args:
+        vector: A vector with a value for each frame, or a single value which applies
+            to all frames.
+        frames: The slice of frames to be selected.
+
+    Returns:
+        The entries of the vector for the selected frames, or the single value.
+    """
+    values: ndarray[VectorOrSingle[int], Any] = atleast_1d(vector)
+    return values if values.shape[0] == 1 else values[frames]
+
+
+def map_tiles(
+    function: Callable[[slice], TileResult],
+    num_frames: int,
+    tile_size: int,
+    workers: Optional[int] = None,
+) -> Iterator[TileResult]:
+    """Applies a function to each tile of a stack of frames, yielding results in order.
+
+    Where a worker count is given, tiles are evaluated concurrently by a pool of
+    threads, relying upon numpy releasing the global interpreter lock within its
+    kernels. At most one tile per worker is evaluated ahead of the tile being yielded,
+    such that memory usage remains bounded by the tile size. As each tile is evaluated
+    by the same function regardless of the worker count, and results are yielded in
+    order, the results are identical to those of serial evaluation.
+
+    Args:
+        function: A function which evaluates a tile, given the slice of the stack from
+            which it is taken.
+        num_frames: The number of frames in the stack.
+        tile_size: The maximum number of frames in each tile.
+        workers: The number of threads by which tiles are evaluated. If None, tiles
+            are evaluated serially in the calling thread. Defaults to None.
+
+    Yields:
+        The result of the function for each successive tile.
+    """
+    tiles = frame_tiles(num_frames, tile_size)
+    if workers is None:
+        yield from map(function, tiles)
+        return
+    if workers <= 0:
+        raise ValueError("Worker count must be positive.")
+    with ThreadPoolExecutor(workers) as executor:
+        pending: Deque[Future[TileResult]] = deque(
+            executor.submit(function, tile) for tile in islice(tiles, workers)
+        )
+        while pending:
+            result = pending.popleft().result()
+            pending.extend(executor.submit(function, tile) for tile in islice(tiles, 1))
+            yield result
+
+
+def apply_tiled(
+    function: Callable[
+        [Frames[Any, FrameWidth, FrameHeight, dtype[number]], slice],
+        Frames[Any, FrameWidth, FrameHeight, FrameDType],
+    ],
+    frames: Frames[NumFrames, FrameWidth, FrameHeight, dtype[number]],
+    tile_size: int,
+    out: Optional[Frames[NumFrames, FrameWidth, FrameHeight, FrameDType]] = None,
+    workers: Optional[int] = None,
+) -> Frames[NumFrames, FrameWidth, FrameHeight, FrameDType]:
+    """Applies a function to successive tiles of frames, collecting a single output.
+
+    Applies a function to successive tiles of frames, such that the intermediate
+    arrays produced by the function are bounded by the tile size. Results are written
+    into a single output stack which is allocated upon computation of the first tile.
+    Tiles may be evaluated concurrently, as described in map_tiles, in which case the
+    function must not write outside of the tile it is given.
+
+    Args:
+        function: A function which corrects a tile of frames, given the tile and the
+            slice of the stack from which it was taken.
+        frames: A stack of frames to be corrected.
+        tile_size: The maximum number of frames in each tile.
+        out: A stack into which the results are written. If None, a stack is allocated
+            to match the result of the first tile. Defaults to None.
+        workers: The number of threads by which tiles are evaluated. If None, tiles
+            are evaluated serially. Defaults to None.
+
+    Returns:
+        The stack of corrected frames.
+    """
+    if frames.ndim < 3 or frames.shape[0] == 0:
+        return function(frames, slice(None))
+
+    tiles: list[Frames[Any, FrameWidth, FrameHeight, FrameDType]] = []
+    frame_slices = frame_tiles(frames.shape[0], tile_size)
+    results = map_tiles(
+        lambda frame_slice: function(frames[frame_slice], frame_slice),
+        frames.shape[0],
+        tile_size,
+        workers,
+    )
+    for frame_slice, tile in zip(frame_slices, results):
+        if out is None and isinstance(tile, ndarray):
+            out = empty_like(tile, shape=(frames.shape[0], *tile.shape[1:]))
+        if out is not None:
+            if isinstance(tile, MaskedArray) and not isinstance(out, MaskedArray):
+                out = out.view(MaskedArray)
+            out[frame_slice] = tile
+        else:
+            tiles.append(tile)
+    return out if out is not None else concatenate(tiles)
@@ -6,6 +6,8 @@ from numpy.ma import masked_where
 from pytest import raises
 
 from adcorr.corrections import correct_angular_efficiency
+from adcorr.corrections.angular_efficiency import apply_angular_efficiency
+from adcorr.utils.geometry import scattering_secants
 
 from ..inaccessable_mock import AccessedError, inaccessable_mock
 
@@ -75,7 +77,7 @@ def test_correct_angular_efficiency_masked_2x2():
     )
 
 
-def test_correct_angular_efficiency_passes_beam_center_to_scattering_angles_only():
+def test_correct_angular_efficiency_passes_beam_center_to_scattering_secants_only():
     with raises(AccessedError):
         correct_angular_efficiency(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -86,8 +88,8 @@ def test_correct_angular_efficiency_passes_beam_center_to_scattering_angles_only
             0.1,
         )
     with patch(
-        "adcorr.corrections.angular_efficiency.scattering_angles",
-        MagicMock(return_value=array([[0.5, 0.5], [0.5, 0.5]])),
+        "adcorr.corrections.angular_efficiency.scattering_secants",
+        MagicMock(return_value=array([[1.1, 1.1], [1.1, 1.1]])),
     ):
         correct_angular_efficiency(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -99,7 +101,7 @@ def test_correct_angular_efficiency_passes_beam_center_to_scattering_angles_only
         )
 
 
-def test_correct_angular_efficiency_passes_pixel_sizes_to_scattering_angles_only():
+def test_correct_angular_efficiency_passes_pixel_sizes_to_scattering_secants_only():
     with raises(AccessedError):
         correct_angular_efficiency(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -110,8 +112,8 @@ def test_correct_angular_efficiency_passes_pixel_sizes_to_scattering_angles_only
             0.1,
         )
     with patch(
-        "adcorr.corrections.angular_efficiency.scattering_angles",
-        MagicMock(return_value=array([[0.5, 0.5], [0.5, 0.5]])),
+        "adcorr.corrections.angular_efficiency.scattering_secants",
+        MagicMock(return_value=array([[1.1, 1.1], [1.1, 1.1]])),
     ):
         correct_angular_efficiency(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -123,7 +125,7 @@ def test_correct_angular_efficiency_passes_pixel_sizes_to_scattering_angles_only
         )
 
 
-def test_correct_angular_efficiency_passes_distance_to_scattering_angles_only():
+def test_correct_angular_efficiency_passes_distance_to_scattering_secants_only():
     with raises(AccessedError):
         correct_angular_efficiency(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -134,8 +136,8 @@ def test_correct_angular_efficiency_passes_distance_to_scattering_angles_only():
             0.1,
         )
     with patch(
-        "adcorr.corrections.angular_efficiency.scattering_angles",
-        MagicMock(return_value=array([[0.5, 0.5], [0.5, 0.5]])),
+        "adcorr.corrections.angular_efficiency.scattering_secants",
+        MagicMock(return_value=array([[1.1, 1.1], [1.1, 1.1]])),
     ):
         correct_angular_efficiency(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -219,3 +221,25 @@ def test_correct_angular_efficiency_pint():
             0.1 * ureg.meter,
         ),
     )
+
+
+def test_correct_angular_efficiency_in_place():
+    frames = array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]])
+    expected = correct_angular_efficiency(
+        frames, (0.5, 0.5), (0.1, 0.1), 1.0, 0.85, 1e-3
+    )
+    corrected = correct_angular_efficiency(
+        frames, (0.5, 0.5), (0.1, 0.1), 1.0, 0.85, 1e-3, out=frames
+    )
+    assert corrected is frames
+    assert allclose(expected, frames)
+
+
+def test_apply_angular_efficiency_matches_correction():
+    frames = array([[[1.0, 2.0], [3.0, 4.0]]])
+    assert allclose(
+        correct_angular_efficiency(frames, (1.0, 1.0), (0.1, 0.1), 1.0, 0.85, 1e-3),
+        apply_angular_efficiency(
+            frames, scattering_secants((2, 2), (1.0, 1.0), (0.1, 0.1), 1.0), 0.85, 1e-3
+        ),
+    )
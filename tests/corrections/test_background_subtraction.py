@@ -92,3 +92,11 @@ def test_background_subtraction_pint():
             array([[0.1, 0.2], [0.3, 0.4]]) * ureg.count,
         ),
     )
+
+
+def test_subtract_background_in_place():
+    frames = array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]])
+    expected = subtract_background(frames, array([[1.0, 1.0], [2.0, 2.0]]))
+    corrected = subtract_background(frames, array([[1.0, 1.0], [2.0, 2.0]]), out=frames)
+    assert corrected is frames
+    assert allclose(expected, frames)
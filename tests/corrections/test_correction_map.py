@@ -0,0 +1,97 @@
+from numpy import Inf, allclose, array, float32, ones
+from numpy.ma import masked_where
+from pytest import raises
+
+from adcorr.corrections import (
+    CorrectionMap,
+    correct_angular_efficiency,
+    correct_flatfield,
+    correct_polarization,
+    correct_solid_angle,
+    normalize_thickness,
+)
+from adcorr.utils.pixels import ValidPixels
+
+
+def _correction_map(flatfield=ones((2, 2)), polarization=0.25, thickness=0.5):
+    return CorrectionMap.from_parameters(
+        flatfield, (1.0, 1.0), (0.1, 0.1), 1.0, 0.85, 1e-3, polarization, thickness
+    )
+
+
+def test_correction_map_matches_individual_corrections():
+    frames = array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]])
+    flatfield = array([[0.9, 1.0], [1.1, 1.2]])
+    expected = correct_flatfield(frames, flatfield)
+    expected = correct_angular_efficiency(
+        expected, (1.0, 1.0), (0.1, 0.1), 1.0, 0.85, 1e-3
+    )
+    expected = correct_solid_angle(expected, (1.0, 1.0), (0.1, 0.1), 1.0)
+    expected = correct_polarization(expected, (1.0, 1.0), (0.1, 0.1), 1.0, 0.25)
+    expected = normalize_thickness(expected, 0.5)
+    assert allclose(expected, _correction_map(flatfield).apply(frames))
+
+
+def test_correction_map_from_valid_pixels_matches_gathered_map():
+    mask = array([[True, False, False], [False, False, True]])
+    flatfield = array([[0.9, 1.0, 1.1], [1.2, 1.3, 1.4]])
+    valid_pixels = ValidPixels.from_mask(mask)
+    parameters = (flatfield, (1.0, 1.5), (0.1, 0.2), 1.0, 0.85, 1e-3, 0.25, 0.5)
+    compact = CorrectionMap.from_parameters(*parameters, valid_pixels=valid_pixels)
+    assert (1, 4) == compact.factors.shape
+    assert allclose(
+        valid_pixels.gather_map(CorrectionMap.from_parameters(*parameters).factors),
+        compact.factors,
+    )
+
+
+def test_correction_map_factors_shape():
+    assert (2, 2) == _correction_map().factors.shape
+
+
+def test_correction_map_factors_read_only():
+    with raises(ValueError):
+        _correction_map().factors[0, 0] = 1.0
+
+
+def test_correction_map_masked_2x2():
+    correction_map = _correction_map()
+    assert allclose(
+        array([[Inf, 2.0], [3.0, Inf]]) * correction_map.factors,
+        correction_map.apply(
+            masked_where(
+                array([[True, False], [False, True]]),
+                array([[1.0, 2.0], [3.0, 4.0]]),
+            )
+        ).filled(Inf),
+    )
+
+
+def test_correction_map_validates_polarization():
+    with raises(ValueError):
+        _correction_map(polarization=1.1)
+
+
+def test_correction_map_validates_thickness():
+    with raises(ValueError):
+        _correction_map(thickness=0.0)
+
+
+def test_correction_map_apply_in_place():
+    frames = array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]])
+    correction_map = _correction_map()
+    expected = correction_map.apply(frames)
+    assert correction_map.apply(frames, out=frames) is frames
+    assert allclose(expected, frames)
+
+
+def test_correction_map_precision():
+    frames = array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]])
+    correction_map = CorrectionMap.from_parameters(
+        ones((2, 2)), (1.0, 1.0), (0.1, 0.1), 1.0, 0.85, 1e-3, 0.25, 0.5, float32
+    )
+    assert float32 == correction_map.factors.dtype
+    assert not correction_map.factors.flags.writeable
+    computed = correction_map.apply(frames, precision=float32)
+    assert float32 == computed.dtype
+    assert allclose(_correction_map().apply(frames), computed, rtol=1e-6)
@@ -378,3 +378,15 @@ def test_correct_dark_current_pint():
             0.001 * ureg.count / ureg.count,
         ),
     )
+
+
+def test_correct_dark_current_in_place():
+    frames = array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]])
+    expected = correct_dark_current(
+        frames, array([1.0, 2.0]), array([0.5, 0.6]), 0.1, 0.2, 0.3
+    )
+    corrected = correct_dark_current(
+        frames, array([1.0, 2.0]), array([0.5, 0.6]), 0.1, 0.2, 0.3, out=frames
+    )
+    assert corrected is frames
+    assert allclose(expected, frames)
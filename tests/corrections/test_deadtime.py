@@ -1,6 +1,7 @@
 import pytest
-from numpy import Inf, allclose, array
+from numpy import Inf, allclose, array, float32, float64, zeros
 from numpy.ma import masked_where
+from numpy.random import default_rng
 from pytest import raises
 
 from adcorr.corrections import correct_deadtime
@@ -234,3 +235,85 @@ def test_correct_deadtime_pint():
             2.0 * ureg.microsecond,
         ),
     )
+
+
+def test_correct_deadtime_in_place():
+    frames = array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]])
+    expected = correct_deadtime(frames, array([1.0, 2.0]), 0.1, 0.2)
+    corrected = correct_deadtime(frames, array([1.0, 2.0]), 0.1, 0.2, out=frames)
+    assert corrected is frames
+    assert allclose(expected, frames)
+
+
+def test_correct_deadtime_integer_lookup_matches_direct():
+    frames = default_rng(0).integers(0, 50, (4, 8, 8))
+    count_times = array([1.0, 2.0, 1.0, 2.0])
+    assert (
+        correct_deadtime(frames.astype(float), count_times, 0.01, 0.02)
+        == correct_deadtime(frames, count_times, 0.01, 0.02)
+    ).all()
+
+
+def test_correct_deadtime_integer_lookup_masked():
+    frames = masked_where(
+        default_rng(1).integers(0, 2, (3, 8, 8), dtype=bool),
+        default_rng(2).integers(0, 50, (3, 8, 8)),
+    )
+    computed = correct_deadtime(frames, array([1.0]), 0.01, 0.02)
+    expected = correct_deadtime(frames.astype(float), array([1.0]), 0.01, 0.02)
+    assert (computed.mask == frames.mask).all()
+    assert (computed.filled(-1.0) == expected.filled(-1.0)).all()
+
+
+def test_correct_deadtime_integer_lookup_in_place():
+    frames = default_rng(3).integers(0, 50, (2, 8, 8))
+    out = zeros(frames.shape)
+    expected = correct_deadtime(frames, array([1.0, 2.0]), 0.01, 0.02)
+    assert correct_deadtime(frames, array([1.0, 2.0]), 0.01, 0.02, out=out) is out
+    assert (expected == out).all()
+
+
+@pytest.mark.parametrize(
+    ["frames_type", "separations"],
+    [(float, (0.0, 0.0)), (int, (0.01, 0.02)), (float, (0.01, 0.02))],
+)
+def test_correct_deadtime_masked_out(frames_type, separations):
+    frames = masked_where(
+        default_rng(4).integers(0, 2, (2, 8, 8), dtype=bool),
+        default_rng(5).integers(0, 50, (2, 8, 8)).astype(frames_type),
+    )
+    expected = correct_deadtime(frames, array([1.0, 2.0]), *separations)
+    corrected = correct_deadtime(
+        frames, array([1.0, 2.0]), *separations, out=zeros(frames.shape)
+    )
+    assert (corrected.mask == frames.mask).all()
+    assert (corrected.filled(-1.0) == expected.filled(-1.0)).all()
+
+
+def test_correct_deadtime_single_precision():
+    frames = default_rng(4).uniform(0.0, 50.0, (2, 4, 4))
+    computed = correct_deadtime(frames.astype(float32), array([1.0, 2.0]), 0.01, 0.02)
+    assert float32 == computed.dtype
+    assert allclose(
+        correct_deadtime(frames, array([1.0, 2.0]), 0.01, 0.02), computed, rtol=1e-5
+    )
+
+
+def test_correct_deadtime_lookup_precision():
+    frames = default_rng(5).integers(0, 50, (2, 4, 4))
+    computed = correct_deadtime(
+        frames, array([1.0, 2.0]), 0.01, 0.02, precision=float32
+    )
+    assert float32 == computed.dtype
+    assert allclose(
+        correct_deadtime(frames, array([1.0, 2.0]), 0.01, 0.02), computed, rtol=1e-6
+    )
+
+
+def test_correct_deadtime_direct_precision():
+    frames = default_rng(6).uniform(0.0, 50.0, (2, 4, 4))
+    computed = correct_deadtime(
+        frames, array([1.0, 2.0]), 0.01, 0.02, precision=float32
+    )
+    assert float32 == computed.dtype
+    assert float64 == frames.dtype
@@ -115,3 +115,11 @@ def test_correct_displaced_volume_pint():
         array([[0.5, 1.0], [1.5, 2.0]]) * ureg.count,
         correct_displaced_volume(array([[1.0, 2.0], [3.0, 4.0]]) * ureg.count, 0.5),
     )
+
+
+def test_correct_displaced_volume_in_place():
+    frames = array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]])
+    expected = correct_displaced_volume(frames, 0.2)
+    corrected = correct_displaced_volume(frames, 0.2, out=frames)
+    assert corrected is frames
+    assert allclose(expected, frames)
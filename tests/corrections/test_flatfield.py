@@ -102,3 +102,11 @@ def test_correct_flatfield_pint():
             array([[1.0, 2.0], [3.0, 4.0]]) * ureg.count,
         ),
     )
+
+
+def test_correct_flatfield_in_place():
+    frames = array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]])
+    expected = correct_flatfield(frames, array([[1.0, 2.0], [3.0, 4.0]]))
+    corrected = correct_flatfield(frames, array([[1.0, 2.0], [3.0, 4.0]]), out=frames)
+    assert corrected is frames
+    assert allclose(expected, frames)
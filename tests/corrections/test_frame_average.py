@@ -1,8 +1,12 @@
+import tracemalloc
+
 import pytest
-from numpy import Inf, allclose, array
+from numpy import Inf, allclose, array, float32, load, save, zeros
 from numpy.ma import masked_where
+from numpy.random import default_rng
+from pytest import raises
 
-from adcorr.corrections import average_all_frames
+from adcorr.corrections import FrameAccumulator, average_all_frames
 
 
 def test_average_all_frames_typical_2x2():
@@ -118,3 +122,95 @@ def test_average_all_frames_pint():
         array([[1.0, 2.0], [3.0, 4.0]]) * ureg.count,
         average_all_frames(array([[1.0, 2.0], [3.0, 4.0]]) * ureg.count),
     )
+
+
+def test_average_all_frames_into_out():
+    out = zeros((2, 2))
+    averaged = average_all_frames(
+        array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]]), out=out
+    )
+    assert averaged is out
+    assert allclose(array([[3.0, 4.0], [5.0, 6.0]]), out)
+
+
+def test_frame_accumulator_matches_mean_and_variance():
+    frames = default_rng(0).normal(10.0, 2.0, (7, 3, 4))
+    accumulator = FrameAccumulator((3, 4))
+    for start in range(0, 7, 3):
+        accumulator.update(frames[start : start + 3])
+    assert (accumulator.count == 7).all()
+    assert allclose(frames.mean(0), accumulator.mean)
+    assert allclose(frames.var(0), accumulator.variance())
+    assert allclose(frames.var(0, ddof=1), accumulator.variance(ddof=1))
+
+
+def test_frame_accumulator_single_frames():
+    frames = default_rng(1).normal(10.0, 2.0, (4, 2, 2))
+    accumulator = FrameAccumulator((2, 2))
+    for frame in frames:
+        accumulator.update(frame)
+    assert allclose(frames.mean(0), accumulator.mean)
+    assert allclose(frames.var(0), accumulator.variance())
+
+
+def test_frame_accumulator_merge():
+    frames = default_rng(2).normal(10.0, 2.0, (9, 2, 3))
+    accumulator = FrameAccumulator.from_frames(frames[:2])
+    accumulator.merge(FrameAccumulator.from_frames(frames[2:]))
+    assert allclose(frames.mean(0), accumulator.mean)
+    assert allclose(frames.var(0), accumulator.variance())
+
+
+def test_frame_accumulator_merge_empty():
+    frames = default_rng(3).normal(10.0, 2.0, (3, 2, 2))
+    accumulator = FrameAccumulator((2, 2))
+    accumulator.merge(FrameAccumulator.from_frames(frames))
+    accumulator.merge(FrameAccumulator((2, 2)))
+    assert allclose(frames.mean(0), accumulator.mean)
+    assert allclose(frames.var(0), accumulator.variance())
+
+
+def test_frame_accumulator_masked():
+    mask = array([[True, False], [False, False]])
+    frames = array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]])
+    masked = masked_where(array([mask, [[False, False], [False, True]]]), frames)
+    accumulator = FrameAccumulator.from_frames(masked)
+    assert (array([[1, 2], [2, 1]]) == accumulator.count).all()
+    assert allclose(array([[5.0, 4.0], [5.0, 4.0]]), accumulator.mean.filled(Inf))
+    assert allclose(
+        array([[Inf, 8.0], [8.0, Inf]]), accumulator.variance(ddof=1).filled(Inf)
+    )
+
+
+def test_frame_accumulator_never_valid_masked():
+    accumulator = FrameAccumulator.from_frames(
+        masked_where(array([[True, False]]), array([[1.0, 2.0]]))
+    )
+    assert accumulator.mean.mask[0, 0]
+    assert not accumulator.mean.mask[0, 1]
+
+
+def test_frame_accumulator_mismatched_shape_raises():
+    with raises(ValueError):
+        FrameAccumulator((2, 2)).update(zeros((1, 3, 3)))
+
+
+def test_average_all_frames_precision_accumulates_in_double():
+    frames = array([2.0**24, 1.0, 1.0], dtype=float32).reshape(3, 1, 1)
+    computed = average_all_frames(frames, precision=float32)
+    assert float32 == computed.dtype
+    assert float32((2.0**24 + 2.0) / 3.0) == computed[0, 0]
+
+
+def test_average_all_frames_strided_memmap_not_copied(tmp_path):
+    frames = default_rng(0).random((4, 32, 64, 64))
+    save(tmp_path / "frames.npy", frames)
+    strided = load(tmp_path / "frames.npy", mmap_mode="r")[:, :16]
+    tracemalloc.start()
+    try:
+        computed = average_all_frames(strided)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert allclose(frames[:, :16].mean((0, 1)), computed)
+    assert peak < strided.nbytes // 4
@@ -170,3 +170,11 @@ def test_normalize_frame_time_pint():
             array([[1.0, 2.0], [3.0, 4.0]]) * ureg.count, array([0.1]) * ureg.second
         ),
     )
+
+
+def test_normalize_frame_time_in_place():
+    frames = array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]])
+    expected = normalize_frame_time(frames, array([1.0, 2.0]))
+    corrected = normalize_frame_time(frames, array([1.0, 2.0]), out=frames)
+    assert corrected is frames
+    assert allclose(expected, frames)
@@ -1,8 +1,9 @@
 import pytest
-from numpy import Inf, array
+from numpy import Inf, array, load, ndarray, save, shares_memory, zeros
+from numpy.ma import MaskedArray, masked_where
 from pytest import raises
 
-from adcorr.corrections.masking import mask_frames
+from adcorr.corrections.masking import fill_masked_pixels, mask_frames
 
 
 def test_masking_typical_3x3():
@@ -68,3 +69,60 @@ def test_masking_pint():
         ).filled(Inf)
         * ureg.count
     ).all()
+
+
+def test_masking_into_out():
+    out = zeros((2, 2, 2))
+    masked = mask_frames(
+        array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]]),
+        array([[True, False], [False, True]]),
+        out=out,
+    )
+    assert shares_memory(masked, out)
+    assert (out == array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]])).all()
+    assert (masked.mask[:, 0, 0] & masked.mask[:, 1, 1]).all()
+
+
+def test_fill_masked_pixels_typical_2x2x2():
+    filled = fill_masked_pixels(
+        array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]]),
+        array([[True, False], [False, True]]),
+    )
+    assert not isinstance(filled, MaskedArray)
+    assert (array([[[0.0, 2.0], [3.0, 0.0]], [[0.0, 6.0], [7.0, 0.0]]]) == filled).all()
+
+
+def test_fill_masked_pixels_combines_frame_masks():
+    frames = masked_where(
+        array([[[False, True], [False, False]], [[False, False], [True, False]]]),
+        array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]]),
+    )
+    assert (
+        array([[[-1.0, -1.0], [3.0, 4.0]], [[-1.0, 6.0], [-1.0, 8.0]]])
+        == fill_masked_pixels(frames, array([[True, False], [False, False]]), -1.0)
+    ).all()
+
+
+def test_fill_masked_pixels_in_place():
+    frames = array([[[1.0, 2.0], [3.0, 4.0]]])
+    assert (
+        fill_masked_pixels(frames, array([[True, False], [False, False]]), out=frames)
+        is frames
+    )
+    assert 0.0 == frames[0, 0, 0]
+
+
+def test_masking_memmap_copied_to_memory(tmp_path):
+    save(tmp_path / "frames.npy", array([[[1.0, 2.0], [3.0, 4.0]]]))
+    frames = load(tmp_path / "frames.npy", mmap_mode="r")
+    masked = mask_frames(frames, array([[True, False], [False, False]]))
+    assert type(masked.data) is ndarray
+    assert (masked.data == frames).all()
+
+
+def test_fill_masked_pixels_memmap_copied_to_memory(tmp_path):
+    save(tmp_path / "frames.npy", array([[[1.0, 2.0], [3.0, 4.0]]]))
+    frames = load(tmp_path / "frames.npy", mmap_mode="r")
+    filled = fill_masked_pixels(frames, array([[True, False], [False, False]]))
+    assert type(filled) is ndarray
+    assert (array([[[0.0, 2.0], [3.0, 4.0]]]) == filled).all()
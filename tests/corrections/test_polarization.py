@@ -1,11 +1,12 @@
 from unittest.mock import MagicMock, patch
 
 import pytest
-from numpy import Inf, allclose, array, pi
+from numpy import Inf, allclose, array, float32
 from numpy.ma import masked_where
 from pytest import raises
 
-from adcorr.corrections import correct_polarization
+from adcorr.corrections import PolarizationModel, correct_polarization
+from adcorr.utils.geometry import GEOMETRY_CACHE
 
 from ..inaccessable_mock import AccessedError, inaccessable_mock
 
@@ -72,7 +73,7 @@ def test_correct_polarization_masked_2x2():
     )
 
 
-def test_correct_polarization_passes_beam_center_to_scattering_angles_only():
+def test_correct_polarization_passes_beam_center_to_geometry_utils_only():
     with raises(AccessedError):
         correct_polarization(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -81,12 +82,23 @@ def test_correct_polarization_passes_beam_center_to_scattering_angles_only():
             1.0,
             0.25,
         )
-    with patch(
-        "adcorr.corrections.polarization.scattering_angles",
-        MagicMock(return_value=array([[0.5, 0.5], [0.5, 0.5]])),
-    ), patch(
-        "adcorr.corrections.polarization.azimuthal_angles",
-        MagicMock(return_value=array([[pi / 4, -pi / 4], [-pi / 4, pi / 4]])),
+    with (
+        patch(
+            "adcorr.corrections.polarization.scattering_sines",
+            MagicMock(return_value=array([[0.5, 0.5], [0.5, 0.5]])),
+        ),
+        patch(
+            "adcorr.corrections.polarization.azimuthal_cosines",
+            MagicMock(return_value=array([[0.6, 0.6], [-0.6, -0.6]])),
+        ),
+        patch(
+            "adcorr.corrections.polarization.azimuthal_sines",
+            MagicMock(return_value=array([[0.8, -0.8], [0.8, -0.8]])),
+        ),
+        patch(
+            "adcorr.corrections.polarization.GEOMETRY_CACHE",
+            MagicMock(get=lambda _, compute: compute()),
+        ),
     ):
         correct_polarization(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -97,7 +109,7 @@ def test_correct_polarization_passes_beam_center_to_scattering_angles_only():
         )
 
 
-def test_correct_polarization_passes_pixel_sizes_to_scattering_angles_only():
+def test_correct_polarization_passes_pixel_sizes_to_geometry_utils_only():
     with raises(AccessedError):
         correct_polarization(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -106,12 +118,23 @@ def test_correct_polarization_passes_pixel_sizes_to_scattering_angles_only():
             1.0,
             0.25,
         )
-    with patch(
-        "adcorr.corrections.polarization.scattering_angles",
-        MagicMock(return_value=array([[0.5, 0.5], [0.5, 0.5]])),
-    ), patch(
-        "adcorr.corrections.polarization.azimuthal_angles",
-        MagicMock(return_value=array([[pi / 4, -pi / 4], [-pi / 4, pi / 4]])),
+    with (
+        patch(
+            "adcorr.corrections.polarization.scattering_sines",
+            MagicMock(return_value=array([[0.5, 0.5], [0.5, 0.5]])),
+        ),
+        patch(
+            "adcorr.corrections.polarization.azimuthal_cosines",
+            MagicMock(return_value=array([[0.6, 0.6], [-0.6, -0.6]])),
+        ),
+        patch(
+            "adcorr.corrections.polarization.azimuthal_sines",
+            MagicMock(return_value=array([[0.8, -0.8], [0.8, -0.8]])),
+        ),
+        patch(
+            "adcorr.corrections.polarization.GEOMETRY_CACHE",
+            MagicMock(get=lambda _, compute: compute()),
+        ),
     ):
         correct_polarization(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -131,12 +154,23 @@ def test_correct_polarization_passes_distance_to_geometry_utils_only():
             inaccessable_mock(float),
             0.25,
         )
-    with patch(
-        "adcorr.corrections.polarization.scattering_angles",
-        MagicMock(return_value=array([[0.5, 0.5], [0.5, 0.5]])),
-    ), patch(
-        "adcorr.corrections.polarization.azimuthal_angles",
-        MagicMock(return_value=array([[pi / 4, -pi / 4], [-pi / 4, pi / 4]])),
+    with (
+        patch(
+            "adcorr.corrections.polarization.scattering_sines",
+            MagicMock(return_value=array([[0.5, 0.5], [0.5, 0.5]])),
+        ),
+        patch(
+            "adcorr.corrections.polarization.azimuthal_cosines",
+            MagicMock(return_value=array([[0.6, 0.6], [-0.6, -0.6]])),
+        ),
+        patch(
+            "adcorr.corrections.polarization.azimuthal_sines",
+            MagicMock(return_value=array([[0.8, -0.8], [0.8, -0.8]])),
+        ),
+        patch(
+            "adcorr.corrections.polarization.GEOMETRY_CACHE",
+            MagicMock(get=lambda _, compute: compute()),
+        ),
     ):
         correct_polarization(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -262,3 +296,59 @@ def test_correct_polarization_pint():
             0.25,
         ),
     )
+
+
+def test_correct_polarization_in_place():
+    frames = array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]])
+    expected = correct_polarization(frames, (0.5, 0.5), (0.1, 0.1), 1.0, 0.3)
+    corrected = correct_polarization(
+        frames, (0.5, 0.5), (0.1, 0.1), 1.0, 0.3, out=frames
+    )
+    assert corrected is frames
+    assert allclose(expected, frames)
+
+
+def test_polarization_model_matches_correct_polarization():
+    frames = array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0], [7.0, 8.0, 9.0]])
+    model = PolarizationModel.from_geometry((3, 3), (1.5, 1.5), (0.1, 0.1), 1.0)
+    for horizontal_polarization in (0.0, 0.25, 0.5, 1.0):
+        assert allclose(
+            correct_polarization(
+                frames, (1.5, 1.5), (0.1, 0.1), 1.0, horizontal_polarization
+            ),
+            model.apply(frames, horizontal_polarization),
+        )
+
+
+def test_polarization_model_from_geometry_is_cached():
+    first = PolarizationModel.from_geometry((4, 5), (1.5, 2.0), (0.1, 0.1), 1.0)
+    second = PolarizationModel.from_geometry((4, 5), (1.5, 2.0), (0.1, 0.1), 1.0)
+    assert first.vertical is second.vertical
+    assert first.horizontal_difference is second.horizontal_difference
+
+
+def test_polarization_model_from_geometry_caches_only_basis_maps():
+    model = PolarizationModel.from_geometry((4, 6), (1.5, 2.0), (0.1, 0.1), 1.0)
+    cached = GEOMETRY_CACHE.get(
+        ("polarization_basis", (4, 6), (1.5, 2.0), (0.1, 0.1), 1.0), lambda: None
+    )
+    assert len(cached) == 2
+    assert cached[0] is model.vertical
+    assert cached[1] is model.horizontal_difference
+
+
+def test_polarization_model_factors_invalid_polarization():
+    model = PolarizationModel.from_geometry((2, 2), (1.0, 1.0), (0.1, 0.1), 1.0)
+    with raises(ValueError):
+        model.factors(1.1)
+
+
+def test_correct_polarization_precision():
+    frames = array([[[1, 2], [3, 4]], [[5, 6], [7, 8]]])
+    computed = correct_polarization(
+        frames, (1.0, 1.0), (0.1, 0.1), 1.0, precision=float32
+    )
+    assert float32 == computed.dtype
+    assert allclose(
+        correct_polarization(frames, (1.0, 1.0), (0.1, 0.1), 1.0), computed, rtol=1e-6
+    )
@@ -1,11 +1,11 @@
 from unittest.mock import MagicMock, patch
 
 import pytest
-from numpy import Inf, allclose, array
+from numpy import Inf, allclose, arange, array, float32, ones, stack
 from numpy.ma import masked_where
 from pytest import raises
 
-from adcorr.corrections import correct_self_absorption
+from adcorr.corrections import SelfAbsorptionTable, correct_self_absorption
 
 from ..inaccessable_mock import AccessedError, inaccessable_mock
 
@@ -80,7 +80,7 @@ def test_correct_self_absorption_masked_2x2():
     )
 
 
-def test_correct_self_absorption_passes_beam_center_to_scattering_angles_only():
+def test_correct_self_absorption_passes_beam_center_to_scattering_secants_only():
     with raises(AccessedError):
         correct_self_absorption(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -91,8 +91,8 @@ def test_correct_self_absorption_passes_beam_center_to_scattering_angles_only():
             1.0,
         )
     with patch(
-        "adcorr.corrections.self_absorption.scattering_angles",
-        MagicMock(return_value=array([[0.5, 0.5], [0.5, 0.5]])),
+        "adcorr.corrections.self_absorption.scattering_secants",
+        MagicMock(return_value=array([[1.1, 1.1], [1.1, 1.1]])),
     ):
         correct_self_absorption(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -104,7 +104,7 @@ def test_correct_self_absorption_passes_beam_center_to_scattering_angles_only():
         )
 
 
-def test_correct_self_absorption_passes_pixel_sizes_to_scattering_angles_only():
+def test_correct_self_absorption_passes_pixel_sizes_to_scattering_secants_only():
     with raises(AccessedError):
         correct_self_absorption(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -115,8 +115,8 @@ def test_correct_self_absorption_passes_pixel_sizes_to_scattering_angles_only():
             1.0,
         )
     with patch(
-        "adcorr.corrections.self_absorption.scattering_angles",
-        MagicMock(return_value=array([[0.5, 0.5], [0.5, 0.5]])),
+        "adcorr.corrections.self_absorption.scattering_secants",
+        MagicMock(return_value=array([[1.1, 1.1], [1.1, 1.1]])),
     ):
         correct_self_absorption(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -128,7 +128,7 @@ def test_correct_self_absorption_passes_pixel_sizes_to_scattering_angles_only():
         )
 
 
-def test_correct_self_absorption_passes_distance_to_scattering_angles_only():
+def test_correct_self_absorption_passes_distance_to_scattering_secants_only():
     with raises(AccessedError):
         correct_self_absorption(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -139,8 +139,8 @@ def test_correct_self_absorption_passes_distance_to_scattering_angles_only():
             inaccessable_mock(float),
         )
     with patch(
-        "adcorr.corrections.self_absorption.scattering_angles",
-        MagicMock(return_value=array([[0.5, 0.5], [0.5, 0.5]])),
+        "adcorr.corrections.self_absorption.scattering_secants",
+        MagicMock(return_value=array([[1.1, 1.1], [1.1, 1.1]])),
     ):
         correct_self_absorption(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -200,3 +200,155 @@ def test_correct_self_absorption_pint():
             1.0 * ureg.meter,
         ),
     )
+
+
+def test_correct_self_absorption_in_place():
+    frames = array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]])
+    expected = correct_self_absorption(
+        frames, array([1.0, 2.0]), array([0.5, 0.6]), (0.5, 0.5), (0.1, 0.1), 1.0
+    )
+    corrected = correct_self_absorption(
+        frames,
+        array([1.0, 2.0]),
+        array([0.5, 0.6]),
+        (0.5, 0.5),
+        (0.1, 0.1),
+        1.0,
+        out=frames,
+    )
+    assert corrected is frames
+    assert allclose(expected, frames)
+
+
+def test_correct_self_absorption_grouped_matches_per_frame():
+    frames = arange(24.0).reshape(6, 2, 2)
+    incident = array([1.0, 1.0, 2.0, 2.0, 1.0, 4.0])
+    transmitted = array([0.5, 0.5, 1.2, 1.2, 0.5, 2.0])
+    expected = stack(
+        [
+            correct_self_absorption(
+                frame,
+                incident[[index]],
+                transmitted[[index]],
+                (0.5, 0.5),
+                (0.1, 0.1),
+                1.0,
+            )
+            for index, frame in enumerate(frames)
+        ]
+    )
+    assert allclose(
+        expected,
+        correct_self_absorption(
+            frames, incident, transmitted, (0.5, 0.5), (0.1, 0.1), 1.0
+        ),
+    )
+
+
+def test_correct_self_absorption_tolerance_merges_transmissibilities():
+    frames = ones((2, 2, 2))
+    corrected = correct_self_absorption(
+        frames,
+        array([1.0, 1.0]),
+        array([0.501, 0.499]),
+        (0.5, 0.5),
+        (0.1, 0.1),
+        1.0,
+        transmissibility_tolerance=0.01,
+    )
+    assert (corrected[0] == corrected[1]).all()
+    assert allclose(
+        correct_self_absorption(
+            frames, array([1.0]), array([0.5]), (0.5, 0.5), (0.1, 0.1), 1.0
+        ),
+        corrected,
+    )
+
+
+def test_correct_self_absorption_negative_tolerance_raises():
+    with raises(ValueError):
+        correct_self_absorption(
+            ones((2, 2, 2)),
+            array([1.0, 1.0]),
+            array([0.5, 0.6]),
+            (0.5, 0.5),
+            (0.1, 0.1),
+            1.0,
+            transmissibility_tolerance=-0.1,
+        )
+
+
+def test_self_absorption_table_within_error_bound():
+    table = SelfAbsorptionTable.from_geometry(
+        (8, 6), (3.0, 2.5), (0.1, 0.1), 1.0, 0.2, error_bound=1e-6
+    )
+    frames = arange(96.0).reshape(2, 8, 6) + 1.0
+    incident = array([1.0, 2.0])
+    transmitted = array([0.35, 1.7])
+    exact = correct_self_absorption(
+        frames, incident, transmitted, (3.0, 2.5), (0.1, 0.1), 1.0
+    )
+    interpolated = correct_self_absorption(
+        frames, incident, transmitted, (3.0, 2.5), (0.1, 0.1), 1.0, table=table
+    )
+    assert (abs(interpolated / frames - exact / frames) <= 1e-6).all()
+
+
+def test_self_absorption_table_single_transmissibility():
+    table = SelfAbsorptionTable.from_geometry((2, 2), (1.0, 1.0), (0.1, 0.1), 1.0, 0.2)
+    assert table.factor_maps(array([0.5])).shape == (2, 2)
+    assert allclose(
+        array([[0.999135, 1.99827], [2.99741, 3.99654]]),
+        correct_self_absorption(
+            array([[1.0, 2.0], [3.0, 4.0]]),
+            array([1.0]),
+            array([0.5]),
+            (1.0, 1.0),
+            (0.1, 0.1),
+            1.0,
+            table=table,
+        ),
+    )
+
+
+def test_self_absorption_table_retains_most_recently_used_maps():
+    table = SelfAbsorptionTable.from_geometry((2, 2), (1.0, 1.0), (0.1, 0.1), 1.0, 0.2)
+    first = table._pixel_map(0)
+    table._pixel_map(1)
+    assert table._pixel_map(0) is first
+    table._pixel_map(2)
+    assert list(table._pixel_maps) == [0, 2]
+
+
+def test_self_absorption_table_outside_range_raises():
+    table = SelfAbsorptionTable.from_geometry((2, 2), (1.0, 1.0), (0.1, 0.1), 1.0, 0.5)
+    with raises(ValueError):
+        table.factor_maps(array([0.4, 0.6]))
+
+
+def test_self_absorption_table_invalid_range_raises():
+    with raises(ValueError):
+        SelfAbsorptionTable.from_geometry((2, 2), (1.0, 1.0), (0.1, 0.1), 1.0, 0.0)
+
+
+def test_correct_self_absorption_table_shape_mismatch_raises():
+    table = SelfAbsorptionTable.from_geometry((2, 2), (1.0, 1.0), (0.1, 0.1), 1.0, 0.2)
+    with raises(ValueError):
+        correct_self_absorption(
+            ones((3, 3)),
+            array([1.0]),
+            array([0.5]),
+            (1.0, 1.0),
+            (0.1, 0.1),
+            1.0,
+            table=table,
+        )
+
+
+@pytest.mark.parametrize("transmitted_flux", [array([0.5]), array([0.5, 0.6, 0.5])])
+def test_correct_self_absorption_precision(transmitted_flux):
+    frames = arange(3 * 2 * 2).reshape(3, 2, 2)
+    args = (array([1.0]), transmitted_flux, (1.0, 1.0), (0.1, 0.1), 1.0)
+    computed = correct_self_absorption(frames, *args, precision=float32)
+    assert float32 == computed.dtype
+    assert allclose(correct_self_absorption(frames, *args), computed, rtol=1e-6)
@@ -6,6 +6,8 @@ from numpy.ma import masked_where
 from pytest import raises
 
 from adcorr.corrections import correct_solid_angle
+from adcorr.corrections.solid_angle import apply_solid_angle
+from adcorr.utils.geometry import scattering_cosines
 
 from ..inaccessable_mock import AccessedError, inaccessable_mock
 
@@ -69,7 +71,7 @@ def test_correct_solid_angle_masked_2x2():
     )
 
 
-def test_correct_solid_angle_passes_beam_center_to_scattering_angles_only():
+def test_correct_solid_angle_passes_beam_center_to_scattering_cosines_only():
     with raises(AccessedError):
         correct_solid_angle(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -78,8 +80,8 @@ def test_correct_solid_angle_passes_beam_center_to_scattering_angles_only():
             1.0,
         )
     with patch(
-        "adcorr.corrections.solid_angle.scattering_angles",
-        MagicMock(return_value=array([[0.5, 0.5], [0.5, 0.5]])),
+        "adcorr.corrections.solid_angle.scattering_cosines",
+        MagicMock(return_value=array([[0.9, 0.9], [0.9, 0.9]])),
     ):
         correct_solid_angle(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -89,7 +91,7 @@ def test_correct_solid_angle_passes_beam_center_to_scattering_angles_only():
         )
 
 
-def test_correct_solid_angle_passes_pixel_sizes_to_scattering_angles_only():
+def test_correct_solid_angle_passes_pixel_sizes_to_scattering_cosines_only():
     with raises(AccessedError):
         correct_solid_angle(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -98,8 +100,8 @@ def test_correct_solid_angle_passes_pixel_sizes_to_scattering_angles_only():
             1.0,
         )
     with patch(
-        "adcorr.corrections.solid_angle.scattering_angles",
-        MagicMock(return_value=array([[0.5, 0.5], [0.5, 0.5]])),
+        "adcorr.corrections.solid_angle.scattering_cosines",
+        MagicMock(return_value=array([[0.9, 0.9], [0.9, 0.9]])),
     ):
         correct_solid_angle(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -109,7 +111,7 @@ def test_correct_solid_angle_passes_pixel_sizes_to_scattering_angles_only():
         )
 
 
-def test_correct_solid_angle_passes_distance_to_scattering_angles_only():
+def test_correct_solid_angle_passes_distance_to_scattering_cosines_only():
     with raises(AccessedError):
         correct_solid_angle(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -118,8 +120,8 @@ def test_correct_solid_angle_passes_distance_to_scattering_angles_only():
             inaccessable_mock(float),
         )
     with patch(
-        "adcorr.corrections.solid_angle.scattering_angles",
-        MagicMock(return_value=array([[0.5, 0.5], [0.5, 0.5]])),
+        "adcorr.corrections.solid_angle.scattering_cosines",
+        MagicMock(return_value=array([[0.9, 0.9], [0.9, 0.9]])),
     ):
         correct_solid_angle(
             array([[1.0, 2.0], [3.0, 4.0]]),
@@ -171,3 +173,21 @@ def test_correct_solid_angle_pint():
             1.0 * ureg.meter,
         ),
     )
+
+
+def test_correct_solid_angle_in_place():
+    frames = array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]])
+    expected = correct_solid_angle(frames, (0.5, 0.5), (0.1, 0.1), 1.0)
+    corrected = correct_solid_angle(frames, (0.5, 0.5), (0.1, 0.1), 1.0, out=frames)
+    assert corrected is frames
+    assert allclose(expected, frames)
+
+
+def test_apply_solid_angle_matches_correction():
+    frames = array([[[1.0, 2.0], [3.0, 4.0]]])
+    assert allclose(
+        correct_solid_angle(frames, (1.0, 1.0), (0.1, 0.1), 1.0),
+        apply_solid_angle(
+            frames, scattering_cosines((2, 2), (1.0, 1.0), (0.1, 0.1), 1.0)
+        ),
+    )
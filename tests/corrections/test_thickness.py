@@ -105,3 +105,11 @@ def test_normalize_thickness_pint():
             array([[1.0, 2.0], [3.0, 4.0]]) * ureg.count, 2.0 * ureg.meter
         ),
     )
+
+
+def test_normalize_thickness_in_place():
+    frames = array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]])
+    expected = normalize_thickness(frames, 0.5)
+    corrected = normalize_thickness(frames, 0.5, out=frames)
+    assert corrected is frames
+    assert allclose(expected, frames)
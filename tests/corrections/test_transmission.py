@@ -82,3 +82,11 @@ def test_normalize_transmitted_flux_pint():
             array([10.0]) * ureg.count / ureg.second,
         ),
     )
+
+
+def test_normalize_transmitted_flux_in_place():
+    frames = array([[[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]])
+    expected = normalize_transmitted_flux(frames, array([0.5, 0.6]))
+    corrected = normalize_transmitted_flux(frames, array([0.5, 0.6]), out=frames)
+    assert corrected is frames
+    assert allclose(expected, frames)
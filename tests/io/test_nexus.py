@@ -0,0 +1,318 @@
+from math import prod
+
+import h5py
+import pytest
+from numpy import allclose, arange, array, array_equal, concatenate, zeros
+from numpy.ma import concatenate as masked_concatenate
+from numpy.ma import masked_where
+from pytest import raises
+
+from adcorr.io.nexus import (
+    NexusFrameSink,
+    NexusFrameSource,
+    NexusLayout,
+    read_nexus_detector,
+    read_nexus_frames,
+)
+from adcorr.sequences import (
+    pauw_instrumental_background_sequence,
+    stream_pauw_instrumental_background_sequence,
+)
+from adcorr.utils.pipeline import write_behind
+
+from ..sequences.test_pauw import DETECTOR, MASK, SAMPLE, _frames
+
+pytestmark = pytest.mark.h5py
+
+
+def write_nexus(
+    path,
+    frames,
+    count_times,
+    incident_flux,
+    transmitted_flux,
+    layout=NexusLayout(),
+    chunks=None,
+    sample_thickness=SAMPLE["sample_thickness"],
+):
+    """Writes frames and the detector setup of the sequence tests to a NeXus file."""
+    with h5py.File(path, "w") as file:
+        file.create_dataset(layout.frames, data=frames, chunks=chunks)
+        file[layout.count_times] = count_times
+        file[layout.incident_flux] = incident_flux / layout.incident_flux_scale
+        file[layout.transmitted_flux] = transmitted_flux / layout.transmitted_flux_scale
+        file[layout.mask] = MASK.astype(int)
+        file[layout.beam_center_y] = DETECTOR["beam_center_pixels"][0]
+        file[layout.beam_center_x] = DETECTOR["beam_center_pixels"][1]
+        file[layout.x_pixel_size] = DETECTOR["pixel_sizes"][0]
+        file[layout.y_pixel_size] = DETECTOR["pixel_sizes"][1]
+        file[layout.distance] = DETECTOR["sample_detector_separation"]
+        file[layout.sample_thickness] = sample_thickness / layout.sample_thickness_scale
+    return path
+
+
+def test_read_nexus_frames_flattens_scan_dimensions(tmp_path):
+    frames = _frames(6)
+    path = write_nexus(
+        tmp_path / "scan.nxs",
+        frames.reshape(2, 3, *frames.shape[1:]),
+        array([[0.1, 0.2, 0.1], [0.2, 0.1, 0.2]]),
+        array([[1.0, 1.1, 1.2], [1.3, 1.4, 1.5]]),
+        array([[0.5, 0.6, 0.5], [0.6, 0.5, 0.6]]),
+    )
+    chunk = read_nexus_frames(path)
+    assert array_equal(chunk.frames, frames)
+    assert allclose(chunk.count_times, [0.1, 0.2, 0.1, 0.2, 0.1, 0.2])
+    assert allclose(chunk.incident_flux, [1.0, 1.1, 1.2, 1.3, 1.4, 1.5])
+    assert allclose(chunk.transmitted_flux, [0.5, 0.6, 0.5, 0.6, 0.5, 0.6])
+
+
+def test_read_nexus_frames_follows_layout(tmp_path):
+    layout = NexusLayout(
+        frames="entry/data/data", incident_flux_scale=1.0, transmitted_flux_scale=1.0
+    )
+    frames = _frames(2)
+    path = write_nexus(
+        tmp_path / "scan.nxs",
+        frames,
+        array([0.1]),
+        array([1.0, 2.0]),
+        array([0.5, 0.6]),
+        layout,
+    )
+    chunk = read_nexus_frames(path, layout)
+    assert array_equal(chunk.frames, frames)
+    assert allclose(chunk.incident_flux, [1.0, 2.0])
+
+
+def test_read_nexus_detector(tmp_path):
+    path = write_nexus(
+        tmp_path / "scan.nxs", zeros((1, *MASK.shape)), *([array([1.0])] * 3)
+    )
+    detector = read_nexus_detector(path)
+    assert array_equal(detector.mask, MASK)
+    assert detector.beam_center_pixels == DETECTOR["beam_center_pixels"]
+    assert detector.pixel_sizes == DETECTOR["pixel_sizes"]
+    assert detector.sample_detector_separation == DETECTOR["sample_detector_separation"]
+    assert allclose(detector.sample_thickness, SAMPLE["sample_thickness"])
+
+
+def _scan(tmp_path, scan_shape=(2, 6), chunks=(1, 2, *MASK.shape), **kwargs):
+    num_frames = prod(scan_shape)
+    frames = _frames(num_frames)
+    path = write_nexus(
+        tmp_path / "scan.nxs",
+        frames.reshape(*scan_shape, *MASK.shape),
+        (0.1 + arange(num_frames) / 100).reshape(scan_shape),
+        array([1.0]),
+        (0.5 + arange(num_frames) / 100).reshape(scan_shape),
+        chunks=chunks,
+        **kwargs,
+    )
+    return path, read_nexus_frames(path)
+
+
+def _concatenate(chunks):
+    chunks = list(chunks)
+    return (
+        concatenate([chunk.frames for chunk in chunks]),
+        concatenate([chunk.count_times for chunk in chunks]),
+        concatenate([chunk.transmitted_flux for chunk in chunks]),
+    )
+
+
+def test_nexus_frame_source_matches_read(tmp_path):
+    path, expected = _scan(tmp_path)
+    frames, count_times, transmitted_flux = _concatenate(NexusFrameSource(path))
+    assert array_equal(frames, expected.frames)
+    assert allclose(count_times, expected.count_times)
+    assert allclose(transmitted_flux, expected.transmitted_flux)
+
+
+def test_nexus_frame_source_aligns_to_dataset_chunks(tmp_path):
+    path, _ = _scan(tmp_path)
+    chunks = list(NexusFrameSource(path, frames_per_chunk=3))
+    assert [len(chunk.frames) for chunk in chunks] == [4, 2, 4, 2]
+    assert all(len(chunk.count_times) == len(chunk.frames) for chunk in chunks)
+    assert all(len(chunk.incident_flux) == 1 for chunk in chunks)
+
+
+def test_nexus_frame_source_defaults_to_single_dataset_chunk(tmp_path):
+    path, _ = _scan(tmp_path, chunks=(1, 3, *MASK.shape))
+    assert [len(chunk.frames) for chunk in NexusFrameSource(path)] == [3] * 4
+
+
+def test_nexus_frame_source_reads_contiguous_dataset(tmp_path):
+    path, expected = _scan(tmp_path, chunks=None)
+    chunks = list(NexusFrameSource(path, frames_per_chunk=5))
+    assert [len(chunk.frames) for chunk in chunks] == [5, 1, 5, 1]
+    assert array_equal(_concatenate(chunks)[0], expected.frames)
+
+
+def test_nexus_frame_source_reads_dataset_chunks_spanning_scan_indices(tmp_path):
+    path, expected = _scan(tmp_path, chunks=(2, 4, 2, 5))
+    assert array_equal(_concatenate(NexusFrameSource(path))[0], expected.frames)
+
+
+def test_nexus_frame_source_reads_single_frame(tmp_path):
+    frame = _frames(1)[0]
+    path = write_nexus(tmp_path / "frame.nxs", frame, *([array([1.0])] * 3))
+    (chunk,) = NexusFrameSource(path)
+    assert array_equal(chunk.frames, frame[None])
+
+
+def test_nexus_frame_source_iterates_repeatedly(tmp_path):
+    path, _ = _scan(tmp_path)
+    source = NexusFrameSource(path)
+    assert array_equal(_concatenate(source)[0], _concatenate(source)[0])
+
+
+def test_nexus_frame_source_describes_frames(tmp_path):
+    path, _ = _scan(tmp_path)
+    source = NexusFrameSource(path)
+    assert source.num_frames == 12
+    assert source.frame_shape == MASK.shape
+
+
+def test_nexus_frame_source_rejects_mismatched_measurement(tmp_path):
+    path = write_nexus(
+        tmp_path / "scan.nxs", _frames(3), array([0.1, 0.2]), *([array([1.0])] * 2)
+    )
+    with raises(ValueError):
+        next(iter(NexusFrameSource(path)))
+
+
+def test_nexus_frame_source_rejects_non_positive_frames_per_chunk(tmp_path):
+    with raises(ValueError):
+        NexusFrameSource(tmp_path / "scan.nxs", frames_per_chunk=0)
+
+
+def test_nexus_frame_source_rejects_negative_cache_size(tmp_path):
+    with raises(ValueError):
+        NexusFrameSource(tmp_path / "scan.nxs", cache_bytes=-1)
+
+
+def test_nexus_frame_source_feeds_streaming_sequence(tmp_path):
+    path, expected = _scan(tmp_path)
+    streamed = concatenate(
+        list(
+            stream_pauw_instrumental_background_sequence(
+                NexusFrameSource(path, frames_per_chunk=4), MASK, *DETECTOR.values()
+            )
+        )
+    )
+    assert allclose(
+        streamed,
+        pauw_instrumental_background_sequence(
+            expected.frames, MASK, *expected[1:], *DETECTOR.values()
+        ),
+    )
+
+
+def _masked_frames(num_frames):
+    frames = _frames(num_frames)
+    return masked_where(frames < 200, frames)
+
+
+def _read_sink(path, data="entry/data/data", mask="entry/data/mask"):
+    with h5py.File(path, "r") as file:
+        return file[data][()], file[mask][()]
+
+
+def test_nexus_frame_sink_writes_frames_and_masks(tmp_path):
+    stacks = [_masked_frames(2), _masked_frames(3)]
+    with NexusFrameSink(tmp_path / "out.nxs") as sink:
+        for frames in stacks:
+            sink.write(frames)
+        assert sink.num_frames == 5
+    data, mask = _read_sink(tmp_path / "out.nxs")
+    expected = masked_concatenate(stacks)
+    assert array_equal(data, expected.filled(0))
+    assert array_equal(mask, expected.mask)
+
+
+@pytest.mark.parametrize("compression_threads", [1, 3])
+def test_nexus_frame_sink_compresses_partial_chunks(tmp_path, compression_threads):
+    stacks = [_masked_frames(3), _masked_frames(1), _masked_frames(4)]
+    with NexusFrameSink(
+        tmp_path / "out.nxs",
+        chunks=(3, 3, 2),
+        compression_level=4,
+        compression_threads=compression_threads,
+    ) as sink:
+        for frames in stacks:
+            sink.write(frames)
+    data, mask = _read_sink(tmp_path / "out.nxs")
+    expected = masked_concatenate(stacks)
+    assert array_equal(data, expected.filled(0))
+    assert array_equal(mask, expected.mask)
+    with h5py.File(tmp_path / "out.nxs", "r") as file:
+        assert file["entry/data/data"].chunks == (3, 3, 2)
+        assert file["entry/data/data"].compression == "gzip"
+        assert file["entry/data/data"].shuffle
+
+
+def test_nexus_frame_sink_compresses_without_shuffle(tmp_path):
+    frames = _frames(3)
+    with NexusFrameSink(
+        tmp_path / "out.nxs", mask=None, compression_level=1, shuffle=False
+    ) as sink:
+        sink.write(frames)
+    with h5py.File(tmp_path / "out.nxs", "r") as file:
+        assert array_equal(file["entry/data/data"][()], frames)
+        assert not file["entry/data/data"].shuffle
+        assert "entry/data/mask" not in file
+
+
+def test_nexus_frame_sink_readable_whilst_writing_swmr(tmp_path):
+    frames = _frames(4)
+    with NexusFrameSink(
+        tmp_path / "out.nxs", chunks=(2, *MASK.shape), compression_level=4, swmr=True
+    ) as sink:
+        sink.write(frames[:3])
+        with h5py.File(tmp_path / "out.nxs", "r", libver="latest", swmr=True) as file:
+            dataset = file["entry/data/data"]
+            assert array_equal(dataset[()], frames[:2])
+            sink.write(frames[3:])
+            dataset.refresh()
+            assert array_equal(dataset[()], frames)
+
+
+def test_nexus_frame_sink_written_behind_stream(tmp_path):
+    path, expected = _scan(tmp_path)
+    with NexusFrameSink(tmp_path / "out.nxs", compression_level=4) as sink:
+        write_behind(
+            stream_pauw_instrumental_background_sequence(
+                NexusFrameSource(path), MASK, *DETECTOR.values(), prefetch_depth=1
+            ),
+            sink.write,
+        )
+    corrected = pauw_instrumental_background_sequence(
+        expected.frames, MASK, *expected[1:], *DETECTOR.values()
+    )
+    data, mask = _read_sink(tmp_path / "out.nxs")
+    assert allclose(data, corrected.filled(0))
+    assert array_equal(mask, corrected.mask)
+
+
+def test_nexus_frame_sink_rejects_mismatched_frames(tmp_path):
+    with NexusFrameSink(tmp_path / "out.nxs") as sink:
+        sink.write(_frames(1))
+        with raises(ValueError):
+            sink.write(zeros((1, 2, 2)))
+        with raises(ValueError):
+            sink.write(zeros(MASK.shape))
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        dict(chunks=(1, 0, 1)),
+        dict(chunks=(1, 1)),
+        dict(compression_level=10),
+        dict(compression_threads=0),
+    ],
+)
+def test_nexus_frame_sink_rejects_invalid_options(tmp_path, options):
+    with raises(ValueError):
+        NexusFrameSink(tmp_path / "out.nxs", **options)
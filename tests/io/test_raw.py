@@ -0,0 +1,60 @@
+from numpy import arange, array_equal, memmap, save, zeros
+from pytest import raises
+
+from adcorr.io.raw import open_npy_frames, open_raw_frames
+
+FRAMES = arange(3 * 4 * 5, dtype="<u4").reshape(3, 4, 5)
+
+
+def _write_raw(path, header=b"", frame_header=b""):
+    with open(path, "wb") as file:
+        file.write(header)
+        for frame in FRAMES:
+            file.write(frame_header)
+            file.write(frame.tobytes())
+    return path
+
+
+def test_open_npy_frames(tmp_path):
+    save(tmp_path / "frames.npy", FRAMES)
+    frames = open_npy_frames(tmp_path / "frames.npy")
+    assert isinstance(frames, memmap)
+    assert not frames.flags.writeable
+    assert array_equal(frames, FRAMES)
+
+
+def test_open_npy_frames_rejects_vector(tmp_path):
+    save(tmp_path / "vector.npy", zeros(3))
+    with raises(ValueError):
+        open_npy_frames(tmp_path / "vector.npy")
+
+
+def test_open_raw_frames(tmp_path):
+    frames = open_raw_frames(_write_raw(tmp_path / "frames.raw"), (4, 5), "<u4")
+    assert isinstance(frames, memmap)
+    assert array_equal(frames, FRAMES)
+
+
+def test_open_raw_frames_with_headers(tmp_path):
+    path = _write_raw(tmp_path / "frames.raw", b"header", b"frame")
+    frames = open_raw_frames(path, (4, 5), "<u4", 6, 5)
+    assert isinstance(frames, memmap)
+    assert array_equal(frames, FRAMES)
+
+
+def test_open_raw_frames_with_num_frames(tmp_path):
+    path = _write_raw(tmp_path / "frames.raw", frame_header=b"frame")
+    frames = open_raw_frames(path, (4, 5), "<u4", frame_header_bytes=5, num_frames=2)
+    assert array_equal(frames, FRAMES[:2])
+
+
+def test_open_raw_frames_rejects_partial_frame(tmp_path):
+    path = _write_raw(tmp_path / "frames.raw", b"header")
+    with raises(ValueError):
+        open_raw_frames(path, (4, 5), "<u4")
+
+
+def test_open_raw_frames_rejects_negative_header(tmp_path):
+    path = _write_raw(tmp_path / "frames.raw")
+    with raises(ValueError):
+        open_raw_frames(path, (4, 5), "<u4", -1)
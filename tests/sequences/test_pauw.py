@@ -0,0 +1,477 @@
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+from numpy import (
+    allclose,
+    array,
+    empty,
+    float32,
+    int64,
+    linspace,
+    shares_memory,
+    uint32,
+    zeros,
+)
+from numpy.ma import masked_where
+from numpy.random import default_rng
+
+from adcorr.corrections import (
+    CorrectionMap,
+    average_all_frames,
+    correct_dark_current,
+    correct_deadtime,
+    correct_self_absorption,
+    mask_frames,
+    normalize_frame_time,
+    normalize_transmitted_flux,
+)
+from adcorr.sequences import (
+    pauw_averaged_background_sequence,
+    pauw_background_subtracted_sample_sequence,
+    pauw_dispersed_sample_sequence,
+    pauw_instrumental_background_sequence,
+    pauw_simple_sample_sequence,
+)
+from adcorr.utils.pixels import ValidPixels
+
+RNG = default_rng(42)
+SHAPE = (4, 5)
+MASK = zeros(SHAPE, dtype=bool)
+MASK[0, 0] = True
+FLATFIELD = linspace(0.9, 1.1, 20).reshape(SHAPE)
+DETECTOR = dict(
+    minimum_pulse_separation=3e-6,
+    minimum_arrival_separation=2e-6,
+    base_dark_current=0.1,
+    temporal_dark_current=0.2,
+    flux_dependant_dark_current=0.01,
+    beam_center_pixels=(1.5, 2.0),
+    pixel_sizes=(0.1, 0.1),
+    sample_detector_separation=1.0,
+)
+SAMPLE = dict(
+    sensor_absorption_coefficient=0.85,
+    sample_thickness=1e-3,
+    sensor_thickness=1e-3,
+    beam_polarization=0.5,
+)
+
+
+def _frames(num_frames: int):
+    return RNG.integers(100, 1000, (num_frames, *SHAPE)).astype(float)
+
+
+def _single_precision_close(expected, computed):
+    return allclose(expected, computed, rtol=0, atol=1e-5 * abs(expected).max())
+
+
+def _instrumental(frames, count_times, incident_flux, transmitted_flux, **kwargs):
+    return pauw_instrumental_background_sequence(
+        frames,
+        MASK,
+        count_times,
+        incident_flux,
+        transmitted_flux,
+        *DETECTOR.values(),
+        **kwargs,
+    )
+
+
+def _simple(frames, backgrounds, **kwargs):
+    return pauw_simple_sample_sequence(
+        frames,
+        backgrounds,
+        MASK,
+        FLATFIELD,
+        array([0.1, 0.2, 0.1, 0.2, 0.1]),
+        array([0.1]),
+        array([1.0, 1.1, 1.2, 1.3, 1.4]),
+        array([0.5, 0.6, 0.5, 0.6, 0.5]),
+        array([1.0, 1.0, 1.0]),
+        array([0.7, 0.8, 0.7]),
+        *DETECTOR.values(),
+        *SAMPLE.values(),
+        **kwargs,
+    )
+
+
+def _dispersed(frames, dispersants, backgrounds, sample=SAMPLE, **kwargs):
+    return pauw_dispersed_sample_sequence(
+        frames,
+        dispersants,
+        backgrounds,
+        MASK,
+        FLATFIELD,
+        array([0.1, 0.2, 0.1, 0.2, 0.1]),
+        array([0.2]),
+        array([0.1]),
+        array([1.0, 1.1, 1.2, 1.3, 1.4]),
+        array([0.5, 0.6, 0.5, 0.6, 0.5]),
+        array([1.0, 1.0]),
+        array([0.6, 0.6]),
+        array([1.0, 1.0, 1.0]),
+        array([0.7, 0.8, 0.7]),
+        *DETECTOR.values(),
+        *sample.values(),
+        0.2,
+        **kwargs,
+    )
+
+
+def test_pauw_instrumental_background_sequence_masks_frames():
+    corrected = _instrumental(_frames(2), array([0.1]), array([1.0]), array([0.5]))
+    assert corrected.mask[:, 0, 0].all()
+    assert not corrected.mask[:, 1:, 1:].any()
+
+
+def test_pauw_instrumental_background_sequence_matches_corrections():
+    frames = _frames(5)
+    count_times = array([0.1, 0.2, 0.1, 0.2, 0.1])
+    incident_flux = array([1.0])
+    transmitted_flux = array([0.5, 0.6, 0.5, 0.6, 0.5])
+    expected = mask_frames(frames, MASK)
+    expected = correct_deadtime(expected, count_times, 3e-6, 2e-6)
+    expected = correct_dark_current(
+        expected, count_times, transmitted_flux, 0.1, 0.2, 0.01
+    )
+    expected = normalize_frame_time(expected, count_times)
+    expected = normalize_transmitted_flux(expected, transmitted_flux)
+    expected = correct_self_absorption(
+        expected, incident_flux, transmitted_flux, (1.5, 2.0), (0.1, 0.1), 1.0
+    )
+    assert allclose(
+        expected,
+        _instrumental(frames, count_times, incident_flux, transmitted_flux),
+    )
+
+
+def test_pauw_instrumental_background_sequence_tiled():
+    frames = _frames(5)
+    count_times = array([0.1, 0.2, 0.1, 0.2, 0.1])
+    incident_flux = array([1.0])
+    transmitted_flux = array([0.5, 0.6, 0.5, 0.6, 0.5])
+    expected = _instrumental(frames, count_times, incident_flux, transmitted_flux)
+    computed = _instrumental(
+        frames, count_times, incident_flux, transmitted_flux, tile_size=2
+    )
+    assert allclose(expected, computed)
+    assert (expected.mask == computed.mask).all()
+
+
+def test_pauw_simple_sample_sequence_tiled():
+    frames, backgrounds = _frames(5), _frames(3)
+    assert allclose(
+        _simple(frames, backgrounds), _simple(frames, backgrounds, tile_size=2)
+    )
+
+
+def test_pauw_dispersed_sample_sequence_tiled():
+    frames, dispersants, backgrounds = _frames(5), _frames(2), _frames(3)
+    assert allclose(
+        _dispersed(frames, dispersants, backgrounds),
+        _dispersed(frames, dispersants, backgrounds, tile_size=3),
+    )
+
+
+def test_pauw_simple_sample_sequence_reuses_correction_map():
+    frames, backgrounds = _frames(5), _frames(3)
+    correction_map = CorrectionMap.from_parameters(
+        FLATFIELD,
+        DETECTOR["beam_center_pixels"],
+        DETECTOR["pixel_sizes"],
+        DETECTOR["sample_detector_separation"],
+        SAMPLE["sensor_absorption_coefficient"],
+        SAMPLE["sensor_thickness"],
+        SAMPLE["beam_polarization"],
+        SAMPLE["sample_thickness"],
+    )
+    assert allclose(
+        _simple(frames, backgrounds),
+        _simple(frames, backgrounds, correction_map=correction_map),
+    )
+
+
+def test_pauw_instrumental_background_sequence_into_out():
+    frames = _frames(5)
+    count_times = array([0.1, 0.2, 0.1, 0.2, 0.1])
+    out = empty(frames.shape)
+    expected = _instrumental(frames, count_times, array([1.0]), array([0.5]))
+    computed = _instrumental(frames, count_times, array([1.0]), array([0.5]), out=out)
+    assert shares_memory(computed, out)
+    assert allclose(expected, computed)
+    assert (expected.mask == computed.mask).all()
+
+
+def test_pauw_simple_sample_sequence_in_place():
+    frames, backgrounds = _frames(5), _frames(3)
+    expected = _simple(frames, backgrounds)
+    computed = _simple(frames, backgrounds, out=frames)
+    assert shares_memory(computed, frames)
+    assert allclose(expected, computed)
+
+
+def test_pauw_simple_sample_sequence_tiled_into_out():
+    frames, backgrounds = _frames(5), _frames(3)
+    out = empty(frames.shape)
+    expected = _simple(frames, backgrounds)
+    computed = _simple(frames, backgrounds, tile_size=2, out=out)
+    assert shares_memory(computed, out)
+    assert allclose(expected, computed)
+
+
+def test_pauw_dispersed_sample_sequence_in_place():
+    frames, dispersants, backgrounds = _frames(5), _frames(2), _frames(3)
+    expected = _dispersed(frames, dispersants, backgrounds)
+    computed = _dispersed(frames, dispersants, backgrounds, out=frames)
+    assert shares_memory(computed, frames)
+    assert allclose(expected, computed)
+
+
+def test_pauw_averaged_background_sequence_tiled():
+    backgrounds = _frames(5)
+    args = (array([0.1]), array([1.0]), array([0.5, 0.6, 0.5, 0.6, 0.5]))
+    assert allclose(
+        pauw_averaged_background_sequence(backgrounds, MASK, *args, *DETECTOR.values()),
+        pauw_averaged_background_sequence(
+            backgrounds, MASK, *args, *DETECTOR.values(), tile_size=2
+        ),
+    )
+
+
+def test_pauw_background_subtracted_sample_sequence_matches_simple():
+    frames, backgrounds = _frames(5), _frames(3)
+    background = pauw_averaged_background_sequence(
+        backgrounds,
+        MASK,
+        array([0.1]),
+        array([1.0, 1.0, 1.0]),
+        array([0.7, 0.8, 0.7]),
+        *DETECTOR.values(),
+    )
+    assert allclose(
+        _simple(frames, backgrounds),
+        pauw_background_subtracted_sample_sequence(
+            frames,
+            background,
+            MASK,
+            FLATFIELD,
+            array([0.1, 0.2, 0.1, 0.2, 0.1]),
+            array([1.0, 1.1, 1.2, 1.3, 1.4]),
+            array([0.5, 0.6, 0.5, 0.6, 0.5]),
+            *DETECTOR.values(),
+            *SAMPLE.values(),
+        ),
+    )
+
+
+def test_pauw_dispersed_sample_sequence_processes_backgrounds_once():
+    frames, dispersants, backgrounds = _frames(5), _frames(2), _frames(3)
+    with patch(
+        "adcorr.sequences.pauw.pauw_averaged_background_sequence",
+        wraps=pauw_averaged_background_sequence,
+    ) as averaged_background:
+        _dispersed(frames, dispersants, backgrounds)
+    averaged_background.assert_called_once()
+
+
+def test_pauw_averaged_background_sequence_matches_corrected_average():
+    backgrounds = _frames(6)
+    args = (
+        array([0.1, 0.2, 0.1, 0.2, 0.1, 0.3]),
+        array([1.0, 1.0, 1.2, 1.0, 1.2, 1.0]),
+        array([0.5, 0.6, 0.6, 0.5, 0.6, 0.5]),
+    )
+    assert allclose(
+        average_all_frames(_instrumental(backgrounds, *args)),
+        pauw_averaged_background_sequence(backgrounds, MASK, *args, *DETECTOR.values()),
+    )
+    assert pauw_averaged_background_sequence(
+        backgrounds, MASK, *args, *DETECTOR.values()
+    ).mask[0, 0]
+
+
+def test_pauw_instrumental_background_sequence_keeps_frame_masks():
+    frames = _frames(2)
+    frames = masked_where(frames < 200, frames)
+    corrected = _instrumental(frames, array([0.1]), array([1.0]), array([0.5]))
+    assert (corrected.mask == (frames.mask | MASK)).all()
+
+
+def test_pauw_instrumental_background_sequence_valid_pixels():
+    frames = _frames(3)
+    valid_pixels = ValidPixels.from_mask(MASK)
+    args = (array([0.1]), array([1.0]), array([0.5, 0.6, 0.7]))
+    assert allclose(
+        valid_pixels.gather(_instrumental(frames, *args)),
+        _instrumental(valid_pixels.gather(frames), *args, valid_pixels=valid_pixels),
+    )
+
+
+def test_pauw_simple_sample_sequence_valid_pixels():
+    frames, backgrounds = _frames(5), _frames(3)
+    valid_pixels = ValidPixels.from_mask(MASK)
+    compact = _simple(
+        valid_pixels.gather(frames),
+        valid_pixels.gather(backgrounds),
+        valid_pixels=valid_pixels,
+    )
+    assert (5, 1, valid_pixels.num_valid) == compact.shape
+    expected = _simple(frames, backgrounds)
+    scattered = valid_pixels.scatter(compact)
+    assert allclose(expected, scattered)
+    assert (expected.mask == scattered.mask).all()
+
+
+def test_pauw_dispersed_sample_sequence_valid_pixels():
+    frames, dispersants, backgrounds = _frames(5), _frames(2), _frames(3)
+    valid_pixels = ValidPixels.from_mask(MASK)
+    assert allclose(
+        valid_pixels.gather(_dispersed(frames, dispersants, backgrounds)),
+        _dispersed(
+            valid_pixels.gather(frames),
+            valid_pixels.gather(dispersants),
+            valid_pixels.gather(backgrounds),
+            valid_pixels=valid_pixels,
+            tile_size=2,
+        ),
+    )
+
+
+@pytest.mark.parametrize("dtype", [float, int64])
+def test_pauw_simple_sample_sequence_precision(dtype):
+    frames, backgrounds = _frames(5).astype(dtype), _frames(3).astype(dtype)
+    computed = _simple(frames, backgrounds, precision=float32)
+    assert float32 == computed.dtype
+    assert _single_precision_close(_simple(frames, backgrounds), computed)
+
+
+def test_pauw_dispersed_sample_sequence_precision():
+    frames, dispersants, backgrounds = _frames(5), _frames(2), _frames(3)
+    computed = _dispersed(
+        frames, dispersants, backgrounds, tile_size=2, precision=float32
+    )
+    assert float32 == computed.dtype
+    assert _single_precision_close(
+        _dispersed(frames, dispersants, backgrounds), computed
+    )
+
+
+def test_pauw_averaged_background_sequence_precision():
+    backgrounds = _frames(5)
+    args = (array([0.1]), array([1.0]), array([0.5, 0.6, 0.5, 0.6, 0.5]))
+    computed = pauw_averaged_background_sequence(
+        backgrounds, MASK, *args, *DETECTOR.values(), precision=float32
+    )
+    assert float32 == computed.dtype
+    assert allclose(
+        pauw_averaged_background_sequence(backgrounds, MASK, *args, *DETECTOR.values()),
+        computed,
+        rtol=1e-5,
+    )
+
+
+def test_pauw_instrumental_background_sequence_workers():
+    frames = _frames(5)
+    args = (
+        array([0.1, 0.2, 0.1, 0.2, 0.1]),
+        array([1.0]),
+        array([0.5, 0.6, 0.5, 0.6, 0.5]),
+    )
+    expected = _instrumental(frames, *args, tile_size=2)
+    computed = _instrumental(frames, *args, tile_size=2, workers=3)
+    assert (expected.data == computed.data).all()
+    assert (expected.mask == computed.mask).all()
+
+
+def test_pauw_simple_sample_sequence_workers():
+    frames, backgrounds = _frames(5), _frames(3)
+    expected = _simple(frames, backgrounds, tile_size=1)
+    computed = _simple(frames, backgrounds, tile_size=1, workers=4)
+    assert (expected.data == computed.data).all()
+
+
+def test_pauw_dispersed_sample_sequence_workers():
+    frames, dispersants, backgrounds = _frames(5), _frames(2), _frames(3)
+    expected = _dispersed(frames, dispersants, backgrounds, tile_size=2)
+    computed = _dispersed(frames, dispersants, backgrounds, tile_size=2, workers=2)
+    assert (expected.data == computed.data).all()
+
+
+NO_DEADTIME = dict(
+    DETECTOR, minimum_pulse_separation=0.0, minimum_arrival_separation=0.0
+)
+
+
+@pytest.mark.parametrize("tile_size", [None, 2])
+def test_pauw_instrumental_background_sequence_integer_frames_no_deadtime(tile_size):
+    frames = _frames(5)
+    args = (MASK, array([0.1]), array([1.0]), array([0.5, 0.6, 0.5, 0.6, 0.5]))
+    expected = pauw_instrumental_background_sequence(
+        frames, *args, *NO_DEADTIME.values()
+    )
+    computed = pauw_instrumental_background_sequence(
+        frames.astype(uint32), *args, *NO_DEADTIME.values(), tile_size=tile_size
+    )
+    assert computed.dtype.kind == "f"
+    assert allclose(expected, computed)
+
+
+@pytest.mark.parametrize("tile_size", [None, 2])
+def test_pauw_simple_sample_sequence_integer_frames_no_deadtime(tile_size):
+    frames, backgrounds = _frames(5), _frames(3)
+    args = (
+        MASK,
+        FLATFIELD,
+        array([0.1, 0.2, 0.1, 0.2, 0.1]),
+        array([0.1]),
+        array([1.0, 1.1, 1.2, 1.3, 1.4]),
+        array([0.5, 0.6, 0.5, 0.6, 0.5]),
+        array([1.0, 1.0, 1.0]),
+        array([0.7, 0.8, 0.7]),
+        *NO_DEADTIME.values(),
+        *SAMPLE.values(),
+    )
+    expected = pauw_simple_sample_sequence(frames, backgrounds, *args)
+    computed = pauw_simple_sample_sequence(
+        frames.astype(uint32), backgrounds.astype(uint32), *args, tile_size=tile_size
+    )
+    assert computed.dtype.kind == "f"
+    assert allclose(expected, computed)
+
+
+@pytest.mark.parametrize("precision", [None, float32])
+def test_pauw_averaged_background_sequence_integer_frames_no_deadtime(precision):
+    backgrounds = _frames(6)
+    args = (
+        MASK,
+        array([0.1, 0.2, 0.1, 0.2, 0.1, 0.3]),
+        array([1.0, 1.0, 1.2, 1.0, 1.2, 1.0]),
+        array([0.5, 0.6, 0.6, 0.5, 0.6, 0.5]),
+        *NO_DEADTIME.values(),
+    )
+    expected = pauw_averaged_background_sequence(backgrounds, *args)
+    computed = pauw_averaged_background_sequence(
+        backgrounds.astype(uint32), *args, tile_size=4, precision=precision
+    )
+    assert _single_precision_close(expected, computed)
+
+
+def test_pauw_averaged_background_sequence_tiled_memory_bounded():
+    backgrounds = RNG.integers(100, 1000, (256, 64, 64)).astype(uint32)
+    args = (
+        zeros((64, 64), dtype=bool),
+        array([0.1]),
+        array([1.0]),
+        linspace(0.5, 0.7, 256),
+        *DETECTOR.values(),
+    )
+    expected = pauw_averaged_background_sequence(backgrounds, *args)
+    tracemalloc.start()
+    try:
+        computed = pauw_averaged_background_sequence(backgrounds, *args, tile_size=4)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert allclose(expected, computed)
+    assert peak < backgrounds.size * 8 // 2
@@ -0,0 +1,268 @@
+from numpy import (
+    allclose,
+    arange,
+    array,
+    concatenate,
+    float32,
+    ndarray,
+    save,
+    shares_memory,
+)
+from numpy.ma import concatenate as masked_concatenate
+from pytest import raises
+
+from adcorr.io.raw import open_npy_frames
+from adcorr.sequences import (
+    FrameChunk,
+    chunk_frames,
+    stream_pauw_dispersed_sample_sequence,
+    stream_pauw_instrumental_background_sequence,
+    stream_pauw_simple_sample_sequence,
+)
+from adcorr.utils.pipeline import write_behind
+
+from .test_pauw import (
+    DETECTOR,
+    FLATFIELD,
+    MASK,
+    SAMPLE,
+    _dispersed,
+    _frames,
+    _instrumental,
+    _simple,
+    _single_precision_close,
+)
+
+FRAMES_COUNT_TIMES = array([0.1, 0.2, 0.1, 0.2, 0.1])
+FRAMES_INCIDENT_FLUX = array([1.0, 1.1, 1.2, 1.3, 1.4])
+FRAMES_TRANSMITTED_FLUX = array([0.5, 0.6, 0.5, 0.6, 0.5])
+
+
+def _chunks(frames, count_times, incident_flux, transmitted_flux, chunk_size):
+    for start in range(0, len(frames), chunk_size):
+        select = slice(start, start + chunk_size)
+        yield FrameChunk(
+            frames[select],
+            count_times if len(count_times) == 1 else count_times[select],
+            incident_flux if len(incident_flux) == 1 else incident_flux[select],
+            (
+                transmitted_flux
+                if len(transmitted_flux) == 1
+                else transmitted_flux[select]
+            ),
+        )
+
+
+def _frame_chunks(frames, chunk_size=2):
+    return _chunks(
+        frames,
+        FRAMES_COUNT_TIMES,
+        FRAMES_INCIDENT_FLUX,
+        FRAMES_TRANSMITTED_FLUX,
+        chunk_size,
+    )
+
+
+def _background_chunks(backgrounds, chunk_size=2):
+    return _chunks(
+        backgrounds,
+        array([0.1]),
+        array([1.0, 1.0, 1.0]),
+        array([0.7, 0.8, 0.7]),
+        chunk_size,
+    )
+
+
+def _dispersant_chunks(dispersants, chunk_size=1):
+    return _chunks(
+        dispersants, array([0.2]), array([1.0, 1.0]), array([0.6, 0.6]), chunk_size
+    )
+
+
+def test_stream_pauw_instrumental_background_sequence_matches_whole():
+    frames = _frames(5)
+    expected = _instrumental(
+        frames, FRAMES_COUNT_TIMES, FRAMES_INCIDENT_FLUX, FRAMES_TRANSMITTED_FLUX
+    )
+    computed = masked_concatenate(
+        list(
+            stream_pauw_instrumental_background_sequence(
+                _frame_chunks(frames), MASK, *DETECTOR.values()
+            )
+        )
+    )
+    assert allclose(expected, computed)
+    assert (expected.mask == computed.mask).all()
+
+
+def test_stream_pauw_simple_sample_sequence_matches_whole():
+    frames, backgrounds = _frames(5), _frames(3)
+    computed = stream_pauw_simple_sample_sequence(
+        _frame_chunks(frames),
+        _background_chunks(backgrounds),
+        MASK,
+        FLATFIELD,
+        *DETECTOR.values(),
+        *SAMPLE.values(),
+    )
+    assert allclose(_simple(frames, backgrounds), concatenate(list(computed)))
+
+
+def test_stream_pauw_simple_sample_sequence_yields_chunks():
+    frames, backgrounds = _frames(5), _frames(3)
+    computed = stream_pauw_simple_sample_sequence(
+        _frame_chunks(frames, 3),
+        _background_chunks(backgrounds),
+        MASK,
+        FLATFIELD,
+        *DETECTOR.values(),
+        *SAMPLE.values(),
+    )
+    assert [3, 2] == [len(chunk) for chunk in computed]
+
+
+def test_stream_pauw_simple_sample_sequence_no_backgrounds():
+    with raises(ValueError):
+        next(
+            stream_pauw_simple_sample_sequence(
+                _frame_chunks(_frames(5)),
+                iter(()),
+                MASK,
+                FLATFIELD,
+                *DETECTOR.values(),
+                *SAMPLE.values(),
+            )
+        )
+
+
+def test_stream_pauw_dispersed_sample_sequence_matches_whole():
+    frames, dispersants, backgrounds = _frames(5), _frames(2), _frames(3)
+    computed = stream_pauw_dispersed_sample_sequence(
+        _frame_chunks(frames),
+        _dispersant_chunks(dispersants),
+        _background_chunks(backgrounds),
+        MASK,
+        FLATFIELD,
+        *DETECTOR.values(),
+        *SAMPLE.values(),
+        0.2,
+    )
+    assert allclose(
+        _dispersed(frames, dispersants, backgrounds), concatenate(list(computed))
+    )
+
+
+def test_stream_pauw_simple_sample_sequence_precision():
+    frames, backgrounds = _frames(5), _frames(3)
+    computed = list(
+        stream_pauw_simple_sample_sequence(
+            _frame_chunks(frames),
+            _background_chunks(backgrounds),
+            MASK,
+            FLATFIELD,
+            *DETECTOR.values(),
+            *SAMPLE.values(),
+            precision=float32,
+        )
+    )
+    assert all(float32 == chunk.dtype for chunk in computed)
+    assert _single_precision_close(_simple(frames, backgrounds), concatenate(computed))
+
+
+def test_stream_pauw_dispersed_sample_sequence_prefetch_matches_serial():
+    frames, dispersants, backgrounds = _frames(5), _frames(2), _frames(3)
+
+    def stream(prefetch_depth):
+        return concatenate(
+            list(
+                stream_pauw_dispersed_sample_sequence(
+                    _frame_chunks(frames),
+                    _dispersant_chunks(dispersants),
+                    _background_chunks(backgrounds),
+                    MASK,
+                    FLATFIELD,
+                    *DETECTOR.values(),
+                    *SAMPLE.values(),
+                    0.2,
+                    prefetch_depth=prefetch_depth,
+                )
+            )
+        )
+
+    assert (stream(0) == stream(2)).all()
+
+
+def test_stream_pauw_instrumental_background_sequence_written_behind():
+    frames = _frames(5)
+    written = []
+    write_behind(
+        stream_pauw_instrumental_background_sequence(
+            _frame_chunks(frames), MASK, *DETECTOR.values(), prefetch_depth=1
+        ),
+        written.append,
+    )
+    assert allclose(
+        _instrumental(
+            frames, FRAMES_COUNT_TIMES, FRAMES_INCIDENT_FLUX, FRAMES_TRANSMITTED_FLUX
+        ),
+        masked_concatenate(written),
+    )
+
+
+def test_stream_pauw_instrumental_background_sequence_negative_prefetch():
+    with raises(ValueError):
+        next(
+            stream_pauw_instrumental_background_sequence(
+                _frame_chunks(_frames(1)), MASK, *DETECTOR.values(), prefetch_depth=-1
+            )
+        )
+
+
+def test_chunk_frames_views_scan():
+    frames = _frames(6).reshape(2, 3, *MASK.shape)
+    chunks = list(
+        chunk_frames(
+            frames, FRAMES_COUNT_TIMES[:1], array([1.0]), arange(6.0), chunk_size=2
+        )
+    )
+    assert [len(chunk.frames) for chunk in chunks] == [2, 1, 2, 1]
+    assert all(shares_memory(chunk.frames, frames) for chunk in chunks)
+    assert (
+        concatenate([chunk.frames for chunk in chunks])
+        == frames.reshape(6, *MASK.shape)
+    ).all()
+    assert (
+        concatenate([chunk.transmitted_flux for chunk in chunks]) == arange(6.0)
+    ).all()
+    assert all(len(chunk.count_times) == 1 for chunk in chunks)
+
+
+def test_chunk_frames_single_frame():
+    frame = _frames(1)[0]
+    (chunk,) = chunk_frames(frame, array([0.1]), array([1.0]), array([0.5]), 2)
+    assert (chunk.frames == frame[None]).all()
+
+
+def test_stream_pauw_instrumental_background_sequence_memmap(tmp_path):
+    frames = _frames(5)
+    save(tmp_path / "frames.npy", frames)
+    computed = masked_concatenate(
+        list(
+            stream_pauw_instrumental_background_sequence(
+                chunk_frames(
+                    open_npy_frames(tmp_path / "frames.npy"),
+                    FRAMES_COUNT_TIMES,
+                    FRAMES_INCIDENT_FLUX,
+                    FRAMES_TRANSMITTED_FLUX,
+                    2,
+                ),
+                MASK,
+                *DETECTOR.values(),
+            )
+        )
+    )
+    expected = _instrumental(
+        frames, FRAMES_COUNT_TIMES, FRAMES_INCIDENT_FLUX, FRAMES_TRANSMITTED_FLUX
+    )
+    assert type(computed.data) is ndarray
+    assert allclose(expected, computed)
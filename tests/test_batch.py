@@ -0,0 +1,217 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from numpy import allclose, array
+from pytest import raises
+
+from adcorr.batch import batch_pauw_dispersed_sample_sequence
+
+from .io.test_nexus import write_nexus
+from .sequences.test_pauw import DETECTOR, FLATFIELD, MASK, SAMPLE, _dispersed, _frames
+
+pytestmark = pytest.mark.h5py
+
+COUNT_TIMES = array([0.1, 0.2, 0.1, 0.2, 0.1])
+INCIDENT_FLUX = array([1.0, 1.1, 1.2, 1.3, 1.4])
+TRANSMITTED_FLUX = array([0.5, 0.6, 0.5, 0.6, 0.5])
+
+
+def _write_scans(
+    directory,
+    num_samples,
+    sample_thicknesses=None,
+    dispersant_thickness=SAMPLE["sample_thickness"],
+):
+    samples = [_frames(5) for _ in range(num_samples)]
+    sample_thicknesses = (
+        sample_thicknesses or [SAMPLE["sample_thickness"]] * num_samples
+    )
+    dispersants, backgrounds = _frames(2), _frames(3)
+    sample_paths = [
+        write_nexus(
+            directory / f"sample_{index}.nxs",
+            frames,
+            COUNT_TIMES,
+            INCIDENT_FLUX,
+            TRANSMITTED_FLUX,
+            sample_thickness=thickness,
+        )
+        for index, (frames, thickness) in enumerate(zip(samples, sample_thicknesses))
+    ]
+    dispersant_path = write_nexus(
+        directory / "dispersant.nxs",
+        dispersants,
+        array([0.2]),
+        array([1.0, 1.0]),
+        array([0.6, 0.6]),
+        sample_thickness=dispersant_thickness,
+    )
+    background_path = write_nexus(
+        directory / "background.nxs",
+        backgrounds,
+        array([0.1]),
+        array([1.0, 1.0, 1.0]),
+        array([0.7, 0.8, 0.7]),
+    )
+    return (
+        samples,
+        dispersants,
+        backgrounds,
+        sample_paths,
+        dispersant_path,
+        background_path,
+    )
+
+
+def _batch(sample_paths, dispersant_path, background_path, sample=SAMPLE, **kwargs):
+    return batch_pauw_dispersed_sample_sequence(
+        sample_paths,
+        dispersant_path,
+        background_path,
+        MASK,
+        FLATFIELD,
+        *DETECTOR.values(),
+        *sample.values(),
+        0.2,
+        **kwargs,
+    )
+
+
+def test_batch_pauw_dispersed_sample_sequence_matches_sequence(tmp_path):
+    samples, dispersants, backgrounds, *paths = _write_scans(tmp_path, 3)
+    corrected = list(_batch(*paths, processes=2))
+    assert len(corrected) == len(samples)
+    for frames, computed in zip(samples, corrected):
+        expected = _dispersed(frames, dispersants, backgrounds)
+        assert allclose(expected, computed)
+        assert (expected.mask == computed.mask).all()
+
+
+def test_batch_pauw_dispersed_sample_sequence_preserves_order(tmp_path):
+    samples, dispersants, backgrounds, *paths = _write_scans(tmp_path, 4)
+    sample_paths, dispersant_path, background_path = paths
+    reordered = list(_batch(sample_paths[::-1], dispersant_path, background_path))
+    for frames, computed in zip(samples[::-1], reordered):
+        assert allclose(_dispersed(frames, dispersants, backgrounds), computed)
+
+
+def test_batch_pauw_dispersed_sample_sequence_reads_each_sample_thickness(tmp_path):
+    thicknesses = [1e-3, 2e-3, 3e-3]
+    samples, dispersants, backgrounds, *paths = _write_scans(
+        tmp_path, 3, sample_thicknesses=thicknesses, dispersant_thickness=2e-3
+    )
+    corrected = _batch(*paths, sample=dict(SAMPLE, sample_thickness=None))
+    for frames, thickness, computed in zip(samples, thicknesses, corrected):
+        sample = dict(SAMPLE, sample_thickness=thickness)
+        expected = _dispersed(frames, dispersants, backgrounds, sample=sample)
+        assert allclose(expected, computed)
+        assert (expected.mask == computed.mask).all()
+
+
+def test_batch_pauw_dispersed_sample_sequence_applies_given_thickness(tmp_path):
+    samples, dispersants, backgrounds, *paths = _write_scans(
+        tmp_path, 2, sample_thicknesses=[1e-3, 2e-3], dispersant_thickness=2e-3
+    )
+    for frames, computed in zip(samples, _batch(*paths)):
+        assert allclose(_dispersed(frames, dispersants, backgrounds), computed)
+
+
+def test_batch_pauw_dispersed_sample_sequence_writes_nothing_to_stderr(tmp_path):
+    script = (
+        "from pathlib import Path\n"
+        "from tests.test_batch import _batch, _write_scans\n"
+        f"paths = _write_scans(Path({str(tmp_path)!r}), 2)[3:]\n"
+        "list(_batch(*paths, processes=2))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).parents[1],
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stderr == ""
+
+
+def test_batch_pauw_dispersed_sample_sequence_rejects_no_processes(tmp_path):
+    *_, sample_paths, dispersant_path, background_path = _write_scans(tmp_path, 1)
+    with raises(ValueError):
+        next(_batch(sample_paths, dispersant_path, background_path, processes=0))
+
+
+def test_cli_batch_writes_corrected_frames(tmp_path):
+    from click.testing import CliRunner
+    from numpy import load, save
+
+    from adcorr.cli import main
+
+    samples, dispersants, backgrounds, *paths = _write_scans(tmp_path, 2)
+    sample_paths, dispersant_path, background_path = paths
+    flatfield_path = tmp_path / "flatfield.npy"
+    save(flatfield_path, FLATFIELD)
+    result = CliRunner().invoke(
+        main,
+        [
+            "batch",
+            *map(str, sample_paths),
+            "--dispersant",
+            str(dispersant_path),
+            "--background",
+            str(background_path),
+            "--output",
+            str(tmp_path / "corrected"),
+            "--flatfield",
+            str(flatfield_path),
+            "--processes",
+            "1",
+            "--displaced-fraction",
+            "0.2",
+            "--minimum-pulse-separation",
+            "3e-6",
+            "--minimum-arrival-separation",
+            "2e-6",
+            "--base-dark-current",
+            "0.1",
+            "--temporal-dark-current",
+            "0.2",
+            "--flux-dependant-dark-current",
+            "0.01",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    for frames, path in zip(samples, sample_paths):
+        with load(tmp_path / "corrected" / f"{path.stem}.npz") as written:
+            expected = _dispersed(frames, dispersants, backgrounds)
+            assert allclose(expected.filled(0), written["data"])
+            assert (expected.mask == written["mask"]).all()
+
+
+def test_cli_batch_rejects_samples_sharing_a_stem(tmp_path):
+    from click.testing import CliRunner
+
+    from adcorr.cli import main
+
+    *_, sample_paths, dispersant_path, background_path = _write_scans(tmp_path, 1)
+    (tmp_path / "other").mkdir()
+    duplicate = tmp_path / "other" / sample_paths[0].name
+    duplicate.write_bytes(sample_paths[0].read_bytes())
+    result = CliRunner().invoke(
+        main,
+        [
+            "batch",
+            str(sample_paths[0]),
+            str(duplicate),
+            "--dispersant",
+            str(dispersant_path),
+            "--background",
+            str(background_path),
+            "--output",
+            str(tmp_path / "corrected"),
+        ],
+    )
+    assert result.exit_code != 0
+    assert sample_paths[0].stem in result.output
+    assert not (tmp_path / "corrected").exists()
@@ -0,0 +1,96 @@
+from unittest.mock import MagicMock
+
+from numpy import array, ones
+from pytest import raises
+
+from adcorr.utils.cache import ArrayCache
+
+
+def test_array_cache_computes_on_miss():
+    cache = ArrayCache(1024)
+    compute = MagicMock(return_value=ones(4))
+    assert (ones(4) == cache.get("key", compute)).all()
+    compute.assert_called_once()
+    assert (0, 1) == cache.info()[:2]
+
+
+def test_array_cache_reuses_on_hit():
+    cache = ArrayCache(1024)
+    compute = MagicMock(return_value=ones(4))
+    first = cache.get("key", compute)
+    second = cache.get("key", compute)
+    compute.assert_called_once()
+    assert first is second
+    assert (1, 1) == cache.info()[:2]
+
+
+def test_array_cache_values_read_only():
+    cache = ArrayCache(1024)
+    value = cache.get("key", lambda: ones(4))
+    with raises(ValueError):
+        value[0] = 2.0
+
+
+def test_array_cache_array_keys_compared_by_content():
+    cache = ArrayCache(1024)
+    compute = MagicMock(return_value=ones(4))
+    cache.get(("key", array(1.0)), compute)
+    cache.get(("key", array(1.0)), compute)
+    compute.assert_called_once()
+
+
+def test_array_cache_unhashable_keys_not_cached():
+    cache = ArrayCache(1024)
+    compute = MagicMock(return_value=ones(4))
+    cache.get(["key"], compute)
+    cache.get(["key"], compute)
+    assert 2 == compute.call_count
+    assert 0 == cache.info().entries
+
+
+def test_array_cache_evicts_least_recently_used():
+    cache = ArrayCache(64)
+    cache.get("first", lambda: ones(4))
+    cache.get("second", lambda: ones(4))
+    cache.get("first", lambda: ones(4))
+    cache.get("third", lambda: ones(4))
+    compute = MagicMock(return_value=ones(4))
+    cache.get("first", compute)
+    compute.assert_not_called()
+    cache.get("second", compute)
+    compute.assert_called_once()
+
+
+def test_array_cache_respects_memory_cap():
+    cache = ArrayCache(64)
+    for key in range(8):
+        cache.get(key, lambda: ones(4))
+    assert 64 >= cache.info().nbytes
+    assert 2 == cache.info().entries
+
+
+def test_array_cache_oversized_values_not_cached():
+    cache = ArrayCache(16)
+    cache.get("key", lambda: ones(4))
+    assert 0 == cache.info().entries
+
+
+def test_array_cache_resize_evicts():
+    cache = ArrayCache(64)
+    cache.get("first", lambda: ones(4))
+    cache.get("second", lambda: ones(4))
+    cache.resize(32)
+    assert 1 == cache.info().entries
+
+
+def test_array_cache_clear():
+    cache = ArrayCache(64)
+    cache.get("key", lambda: ones(4))
+    cache.get("key", lambda: ones(4))
+    cache.clear()
+    assert (0, 0, 0, 0, 64) == cache.info()
+
+
+def test_array_cache_max_bytes_negative():
+    with raises(ValueError):
+        ArrayCache(-1)
@@ -1,6 +1,18 @@
-from numpy import allclose, array
-
-from adcorr.utils.geometry import azimuthal_angles, scattering_angles
+import pytest
+from numpy import allclose, array, cos, sin
+from pytest import raises
+
+from adcorr.utils.geometry import (
+    GEOMETRY_CACHE,
+    azimuthal_angles,
+    azimuthal_cosines,
+    azimuthal_sines,
+    pixel_offsets,
+    scattering_angles,
+    scattering_cosines,
+    scattering_secants,
+    scattering_sines,
+)
 
 
 def test_scattering_angles_typical_2x2():
@@ -160,3 +172,79 @@ def test_azimuthal_angles_pixels_rectangular():
         array([[-2.67794504, -0.46364761], [2.67794504, 0.46364761]]),
         azimuthal_angles((2, 2), (1.0, 1.0), (0.1, 0.2)),
     )
+
+
+def test_scattering_angles_cached():
+    GEOMETRY_CACHE.clear()
+    first = scattering_angles((2, 2), (1.0, 1.0), (0.1, 0.1), 1.0)
+    second = scattering_angles((2, 2), (1.0, 1.0), (0.1, 0.1), 1.0)
+    assert first is second
+    assert (1, 1) == GEOMETRY_CACHE.info()[:2]
+
+
+def test_scattering_angles_cache_distinguishes_distance():
+    GEOMETRY_CACHE.clear()
+    scattering_angles((2, 2), (1.0, 1.0), (0.1, 0.1), 1.0)
+    assert allclose(
+        array([[0.0353406187, 0.0353406187], [0.0353406187, 0.0353406187]]),
+        scattering_angles((2, 2), (1.0, 1.0), (0.1, 0.1), 2.0),
+    )
+
+
+def test_scattering_angles_read_only():
+    angles = scattering_angles((2, 2), (1.0, 1.0), (0.1, 0.1), 1.0)
+    with raises(ValueError):
+        angles[0, 0] = 0.0
+
+
+def test_azimuthal_angles_cached():
+    GEOMETRY_CACHE.clear()
+    first = azimuthal_angles((2, 2), (1.0, 1.0), (0.1, 0.1))
+    second = azimuthal_angles((2, 2), (1.0, 1.0), (0.1, 0.1))
+    assert first is second
+    assert (1, 1) == GEOMETRY_CACHE.info()[:2]
+
+
+@pytest.mark.parametrize("distance", [1.0, 1e-3, -1.0])
+def test_scattering_components_match_angles(distance: float):
+    angles = scattering_angles((3, 4), (1.2, 1.7), (0.1, 0.2), distance)
+    assert allclose(
+        cos(angles), scattering_cosines((3, 4), (1.2, 1.7), (0.1, 0.2), distance)
+    )
+    assert allclose(
+        sin(angles), scattering_sines((3, 4), (1.2, 1.7), (0.1, 0.2), distance)
+    )
+    assert allclose(
+        1 / cos(angles), scattering_secants((3, 4), (1.2, 1.7), (0.1, 0.2), distance)
+    )
+
+
+@pytest.mark.parametrize("beam_center", [(1.2, 1.7), (1.5, 1.5), (-0.5, 4.0)])
+def test_azimuthal_components_match_angles(beam_center: tuple[float, float]):
+    angles = azimuthal_angles((3, 3), beam_center, (0.1, 0.2))
+    assert allclose(cos(angles), azimuthal_cosines((3, 3), beam_center, (0.1, 0.2)))
+    assert allclose(sin(angles), azimuthal_sines((3, 3), beam_center, (0.1, 0.2)))
+
+
+def test_scattering_secants_cached():
+    GEOMETRY_CACHE.clear()
+    first = scattering_secants((2, 2), (1.0, 1.0), (0.1, 0.1), 1.0)
+    second = scattering_secants((2, 2), (1.0, 1.0), (0.1, 0.1), 1.0)
+    assert first is second
+    with raises(ValueError):
+        first[0, 0] = 0.0
+
+
+def test_pixel_offsets_open_grid():
+    rows, columns = pixel_offsets((2, 3), (1.0, 1.5), (0.1, 0.2))
+    assert (2, 1) == rows.shape
+    assert (1, 3) == columns.shape
+    assert allclose(array([[-0.05], [0.05]]), rows)
+    assert allclose(array([[-0.2, 0.0, 0.2]]), columns)
+
+
+def test_pixel_offsets_window_matches_shifted_beam_center():
+    rows, columns = pixel_offsets((6, 8), (2.5, 3.0), (0.1, 0.2))
+    window_rows, window_columns = pixel_offsets((3, 4), (0.5, 1.0), (0.1, 0.2))
+    assert allclose(rows[2:5], window_rows)
+    assert allclose(columns[:, 2:6], window_columns)
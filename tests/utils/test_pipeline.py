@@ -0,0 +1,117 @@
+from threading import Barrier, Event
+
+from pytest import raises
+
+from adcorr.utils.pipeline import prefetch, write_behind
+
+
+def _failing(count):
+    yield from range(count)
+    raise RuntimeError("Failed to read.")
+
+
+def test_prefetch_in_order():
+    assert list(prefetch(range(10))) == list(range(10))
+
+
+def test_prefetch_empty():
+    assert list(prefetch([])) == []
+
+
+def test_prefetch_reads_ahead_concurrently():
+    barrier = Barrier(2, timeout=10)
+
+    def items():
+        yield 0
+        barrier.wait()
+        yield 1
+
+    iterator = prefetch(items())
+    assert next(iterator) == 0
+    barrier.wait()
+    assert list(iterator) == [1]
+
+
+def test_prefetch_bounded_by_depth():
+    produced = []
+    blocked = Event()
+
+    def items():
+        for item in range(10):
+            produced.append(item)
+            if len(produced) == 4:
+                blocked.set()
+            yield item
+
+    iterator = prefetch(items(), depth=2)
+    assert next(iterator) == 0
+    assert blocked.wait(10)
+    assert len(produced) == 4
+    iterator.close()
+
+
+def test_prefetch_raises_source_error():
+    iterator = prefetch(_failing(2))
+    assert [next(iterator), next(iterator)] == [0, 1]
+    with raises(RuntimeError):
+        next(iterator)
+
+
+def test_prefetch_stops_on_close():
+    produced = []
+
+    def items():
+        for item in range(100):
+            produced.append(item)
+            yield item
+
+    iterator = prefetch(items())
+    next(iterator)
+    iterator.close()
+    assert len(produced) < 100
+
+
+def test_prefetch_depth_zero():
+    with raises(ValueError):
+        next(prefetch(range(2), depth=0))
+
+
+def test_write_behind_in_order():
+    written = []
+    write_behind(range(10), written.append, depth=3)
+    assert written == list(range(10))
+
+
+def test_write_behind_writes_concurrently():
+    barrier = Barrier(2, timeout=10)
+
+    def items():
+        yield 0
+        barrier.wait()
+
+    write_behind(items(), lambda item: barrier.wait())
+
+
+def test_write_behind_raises_write_error():
+    written = []
+
+    def write(item):
+        if item == 2:
+            raise RuntimeError("Failed to write.")
+        written.append(item)
+
+    with raises(RuntimeError):
+        write_behind(range(100), write)
+    assert written == [0, 1]
+
+
+def test_write_behind_raises_source_error():
+    written = []
+    with raises(RuntimeError):
+        write_behind(_failing(3), written.append)
+    assert written == [0, 1, 2]
+
+
+def test_write_behind_depth_zero():
+    with raises(ValueError):
+        write_behind(range(2), print, depth=0)
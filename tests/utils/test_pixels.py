@@ -0,0 +1,104 @@
+from numpy import allclose, arange, array, zeros
+from pytest import raises
+
+from adcorr.utils.geometry import (
+    azimuthal_cosines,
+    azimuthal_sines,
+    scattering_cosines,
+    scattering_secants,
+    scattering_sines,
+)
+from adcorr.utils.pixels import ValidPixels
+
+MASK = array([[True, False, False], [False, False, True]])
+
+
+def test_valid_pixels_from_mask():
+    valid_pixels = ValidPixels.from_mask(MASK)
+    assert 4 == valid_pixels.num_valid
+    assert (2, 3) == valid_pixels.frame_shape
+    assert (array([1, 2, 3, 4]) == valid_pixels.indices).all()
+
+
+def test_valid_pixels_mask_copied():
+    mask = MASK.copy()
+    valid_pixels = ValidPixels.from_mask(mask)
+    mask[0, 0] = False
+    assert valid_pixels.mask[0, 0]
+
+
+def test_valid_pixels_gather():
+    frames = arange(12.0).reshape(2, 2, 3)
+    assert (
+        array([[[1.0, 2.0, 3.0, 4.0]], [[7.0, 8.0, 9.0, 10.0]]])
+        == ValidPixels.from_mask(MASK).gather(frames)
+    ).all()
+
+
+def test_valid_pixels_gather_map():
+    assert (
+        array([[1.0, 2.0, 3.0, 4.0]])
+        == ValidPixels.from_mask(MASK).gather_map(arange(6.0).reshape(2, 3))
+    ).all()
+
+
+def test_valid_pixels_gather_mismatched_shape_raises():
+    with raises(ValueError):
+        ValidPixels.from_mask(MASK).gather(zeros((1, 3, 3)))
+
+
+def test_valid_pixels_scatter_round_trip():
+    frames = arange(12.0).reshape(2, 2, 3)
+    valid_pixels = ValidPixels.from_mask(MASK)
+    scattered = valid_pixels.scatter(valid_pixels.gather(frames), fill_value=-1.0)
+    assert (scattered.mask == array([MASK, MASK])).all()
+    assert (scattered.filled(-1.0) == scattered.data).all()
+    assert (frames[~scattered.mask] == scattered.data[~scattered.mask]).all()
+
+
+def test_valid_pixels_scattering_secants():
+    valid_pixels = ValidPixels.from_mask(MASK)
+    assert allclose(
+        valid_pixels.gather_map(
+            scattering_secants((2, 3), (1.0, 1.5), (0.1, 0.2), 1.0)
+        ),
+        valid_pixels.scattering_secants((1.0, 1.5), (0.1, 0.2), 1.0),
+    )
+
+
+def test_valid_pixels_scattering_cosines():
+    valid_pixels = ValidPixels.from_mask(MASK)
+    assert allclose(
+        valid_pixels.gather_map(
+            scattering_cosines((2, 3), (1.0, 1.5), (0.1, 0.2), 1.0)
+        ),
+        valid_pixels.scattering_cosines((1.0, 1.5), (0.1, 0.2), 1.0),
+    )
+
+
+def test_valid_pixels_scattering_sines():
+    valid_pixels = ValidPixels.from_mask(MASK)
+    assert allclose(
+        valid_pixels.gather_map(scattering_sines((2, 3), (1.0, 1.5), (0.1, 0.2), 1.0)),
+        valid_pixels.scattering_sines((1.0, 1.5), (0.1, 0.2), 1.0),
+    )
+
+
+def test_valid_pixels_azimuthal_components():
+    valid_pixels = ValidPixels.from_mask(MASK)
+    assert allclose(
+        valid_pixels.gather_map(azimuthal_cosines((2, 3), (0.5, 1.5), (0.1, 0.2))),
+        valid_pixels.azimuthal_cosines((0.5, 1.5), (0.1, 0.2)),
+    )
+    assert allclose(
+        valid_pixels.gather_map(azimuthal_sines((2, 3), (0.5, 1.5), (0.1, 0.2))),
+        valid_pixels.azimuthal_sines((0.5, 1.5), (0.1, 0.2)),
+    )
+
+
+def test_valid_pixels_geometry_is_memoised():
+    valid_pixels = ValidPixels.from_mask(MASK)
+    first = valid_pixels.scattering_secants((1.0, 1.5), (0.1, 0.2), 1.0)
+    assert first is valid_pixels.scattering_secants((1.0, 1.5), (0.1, 0.2), 1.0)
+    assert first is not valid_pixels.scattering_secants((1.0, 1.5), (0.1, 0.2), 2.0)
+    assert not first.flags.writeable
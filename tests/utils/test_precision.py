@@ -0,0 +1,37 @@
+from numpy import array, float32, float64, int32
+from numpy.ma import is_masked, masked_where
+from pytest import raises
+
+from adcorr.utils.precision import as_precision
+
+
+def test_as_precision_none_unchanged():
+    values = array([1, 2, 3])
+    assert as_precision(values, None) is values
+
+
+def test_as_precision_casts_integers():
+    cast = as_precision(array([1, 2, 3]), float32)
+    assert float32 == cast.dtype
+    assert (array([1.0, 2.0, 3.0]) == cast).all()
+
+
+def test_as_precision_matching_not_copied():
+    values = array([1.0, 2.0], dtype=float32)
+    assert as_precision(values, float32) is values
+
+
+def test_as_precision_keeps_mask():
+    values = masked_where([True, False], array([1.0, 2.0], dtype=float64))
+    cast = as_precision(values, float32)
+    assert float32 == cast.dtype
+    assert is_masked(cast[0])
+
+
+def test_as_precision_scalar_unchanged():
+    assert 0.5 == as_precision(0.5, float32)
+
+
+def test_as_precision_integer_precision_raises():
+    with raises(ValueError):
+        as_precision(array([1.0]), int32)
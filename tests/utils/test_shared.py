@@ -0,0 +1,45 @@
+from numpy import arange, array_equal
+from pytest import raises
+
+from adcorr.utils.shared import SharedArray
+
+
+def test_shared_array_round_trips():
+    values = arange(12.0).reshape(3, 4)
+    handle, memory = SharedArray.create(values)
+    try:
+        attached, attached_memory = handle.attach()
+        assert array_equal(attached, values)
+        assert attached.dtype == values.dtype
+        del attached
+        attached_memory.close()
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def test_shared_array_copies_values():
+    values = arange(4)
+    handle, memory = SharedArray.create(values)
+    try:
+        values[0] = 10
+        attached, attached_memory = handle.attach()
+        assert attached[0] == 0
+        del attached
+        attached_memory.close()
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def test_shared_array_attaches_read_only():
+    handle, memory = SharedArray.create(arange(4))
+    try:
+        attached, attached_memory = handle.attach()
+        with raises(ValueError):
+            attached[0] = 1
+        del attached
+        attached_memory.close()
+    finally:
+        memory.close()
+        memory.unlink()
@@ -0,0 +1,55 @@
+from math import e
+
+from numpy import allclose, array, float32, linspace, logspace
+from scipy.special import lambertw
+
+from adcorr.utils.special import lambertw_real
+
+
+def test_lambertw_real_matches_scipy_negative():
+    values = linspace(-1 / e + 1e-2, 0.0, 1001)
+    assert allclose(lambertw(values).real, lambertw_real(values), rtol=1e-13, atol=0)
+
+
+def test_lambertw_real_matches_scipy_near_branch():
+    values = -1 / e + logspace(-12, -2, 101)
+    assert allclose(lambertw(values).real, lambertw_real(values), rtol=1e-6, atol=0)
+
+
+def test_lambertw_real_matches_scipy_positive():
+    values = logspace(-10, 10, 201)
+    assert allclose(lambertw(values).real, lambertw_real(values), rtol=1e-13, atol=0)
+
+
+def test_lambertw_real_branch_point():
+    assert allclose(-1.0, lambertw_real(array([-1 / e])))
+
+
+def test_lambertw_real_below_branch_point():
+    values = array([-1.0, -0.5])
+    assert allclose(lambertw(values).real, lambertw_real(values))
+
+
+def test_lambertw_real_single_precision():
+    values = linspace(-1 / e + 1e-2, 0.0, 1001).astype(float32)
+    computed = lambertw_real(values)
+    assert float32 == computed.dtype
+    assert allclose(lambertw(values).real, computed, rtol=1e-6, atol=0)
+
+
+def test_lambertw_real_integer_promoted():
+    assert allclose(lambertw(array([0, 1, 2])).real, lambertw_real(array([0, 1, 2])))
+
+
+def test_lambertw_real_into_out():
+    values = linspace(-0.3, 0.0, 12).reshape(3, 4)
+    out = values.copy()
+    assert lambertw_real(values, out=out) is out
+    assert allclose(lambertw(values).real, out)
+
+
+def test_lambertw_real_into_non_contiguous_out():
+    values = linspace(-0.3, 0.0, 12).reshape(3, 4)
+    out = values.copy().T
+    lambertw_real(values.T, out=out)
+    assert allclose(lambertw(values.T).real, out)
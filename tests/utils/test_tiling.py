@@ -0,0 +1,95 @@
+from threading import Barrier
+
+from numpy import arange, array, ones
+from numpy.ma import masked_where
+from pytest import raises
+
+from adcorr.utils.tiling import (
+    apply_tiled,
+    frame_tiles,
+    map_tiles,
+    slice_frame_vector,
+)
+
+
+def test_frame_tiles_partition():
+    assert [slice(0, 2), slice(2, 4), slice(4, 5)] == list(frame_tiles(5, 2))
+
+
+def test_frame_tiles_larger_than_stack():
+    assert [slice(0, 3)] == list(frame_tiles(3, 8))
+
+
+def test_frame_tiles_size_zero():
+    with raises(ValueError):
+        list(frame_tiles(3, 0))
+
+
+def test_slice_frame_vector_vector():
+    assert (array([2.0, 3.0]) == slice_frame_vector(arange(5.0), slice(2, 4))).all()
+
+
+def test_slice_frame_vector_single():
+    assert (array([2.0]) == slice_frame_vector(array([2.0]), slice(2, 4))).all()
+
+
+def test_apply_tiled_typical_3x2x2():
+    frames = arange(12.0).reshape(3, 2, 2)
+    tiles = []
+
+    def double(tile, frame_slice):
+        tiles.append(frame_slice)
+        return tile * 2.0
+
+    assert (frames * 2.0 == apply_tiled(double, frames, 2)).all()
+    assert [slice(0, 2), slice(2, 3)] == tiles
+
+
+def test_apply_tiled_masked_3x2x2():
+    frames = masked_where(
+        array([[True, False], [False, True]]) & ones((3, 2, 2), dtype=bool),
+        arange(12.0).reshape(3, 2, 2),
+    )
+    computed = apply_tiled(lambda tile, _: tile * 2.0, frames, 2)
+    assert (frames.mask == computed.mask).all()
+    assert (frames * 2.0 == computed).all()
+
+
+def test_apply_tiled_single_frame():
+    frames = arange(4.0).reshape(2, 2)
+    assert (frames * 2.0 == apply_tiled(lambda tile, _: tile * 2.0, frames, 2)).all()
+
+
+def test_apply_tiled_into_out():
+    frames = arange(12.0).reshape(3, 2, 2)
+    out = ones((3, 2, 2))
+    assert out is apply_tiled(lambda tile, _: tile * 2.0, frames, 2, out)
+    assert (frames * 2.0 == out).all()
+
+
+def test_map_tiles_serial():
+    assert [slice(0, 2), slice(2, 4), slice(4, 5)] == list(
+        map_tiles(lambda tile: tile, 5, 2)
+    )
+
+
+def test_map_tiles_workers_in_order():
+    assert [0, 2, 4, 6, 8] == list(map_tiles(lambda tile: tile.start, 10, 2, 3))
+
+
+def test_map_tiles_workers_concurrent():
+    barrier = Barrier(2, timeout=10)
+    assert [0, 1] == list(map_tiles(lambda tile: barrier.wait(), 2, 1, 2))
+
+
+def test_map_tiles_workers_zero():
+    with raises(ValueError):
+        list(map_tiles(lambda tile: tile, 3, 1, 0))
+
+
+def test_apply_tiled_workers_matches_serial():
+    frames = arange(60.0).reshape(5, 3, 4)
+    expected = apply_tiled(lambda tile, _: tile**0.5, frames, 2)
+    assert (
+        expected == apply_tiled(lambda tile, _: tile**0.5, frames, 2, workers=4)
+    ).all()